@@ -0,0 +1,67 @@
+"""
+game2 비동기(ASGI) 진입점
+
+uvicorn 이벤트 루프가 연결을 받고, uvicorn 의 WSGIMiddleware 가 game2 의
+Flask 앱을 제한된 크기의 스레드 풀(ASGI_MAX_THREADS)에서 실행한다.
+- 대기 중인(느린) 연결은 스레드를 차지하지 않고 이벤트 루프에만 남는다
+- SQLite 접근은 풀 스레드에서만 일어난다 (스레드마다 커넥션 하나, db.py)
+- 처리 중인 요청이 ASGI_MAX_PENDING 개를 넘으면 기다리게 하지 않고 바로 503
+
+실행:
+    SERVER_MODE=asgi gunicorn -c gunicorn.conf.py
+    uvicorn asgi:application          # 개발용
+"""
+
+import asyncio
+import os
+
+from uvicorn.middleware.wsgi import WSGIMiddleware
+
+import game2
+
+MAX_THREADS = int(os.environ.get("ASGI_MAX_THREADS", 4))
+MAX_PENDING = int(os.environ.get("ASGI_MAX_PENDING", 1000))
+RETRY_AFTER = b"1"  # 503 응답의 Retry-After (초)
+
+
+class Game2ASGI:
+    """WSGIMiddleware 앞에서 lifespan(종료 시 저장)과 과부하 503 을 처리"""
+
+    def __init__(self, wsgi_app, max_threads=MAX_THREADS, max_pending=MAX_PENDING):
+        self.wsgi = WSGIMiddleware(wsgi_app, workers=max_threads)
+        self.max_pending = max_pending
+        self.pending = 0  # 이벤트 루프 스레드에서만 바뀐다
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self.lifespan(receive, send)
+        elif scope["type"] == "http":
+            await self.http(scope, receive, send)
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                # write-behind 캐시/리더보드에 남은 변경을 기록
+                if game2.player_cache is not None:
+                    await asyncio.to_thread(game2.player_cache.close)
+                await asyncio.to_thread(game2.leaderboard.close)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def http(self, scope, receive, send):
+        if self.pending >= self.max_pending:
+            await send({"type": "http.response.start", "status": 503,
+                        "headers": [(b"content-type", b"text/plain"), (b"retry-after", RETRY_AFTER)]})
+            await send({"type": "http.response.body", "body": b"Service Unavailable"})
+            return
+        self.pending += 1
+        try:
+            await self.wsgi(scope, receive, send)
+        finally:
+            self.pending -= 1
+
+
+application = Game2ASGI(game2.application)
@@ -0,0 +1,186 @@
+"""
+정적 파일(CSS/JS) 서빙
+
+static/ 아래 파일을 시작할 때 읽어서 내용 해시를 붙인 이름으로 서빙한다.
+(예: css/game2.css -> /assets/css/game2.1a2b3c4d5e.css)
+내용이 바뀌면 URL 도 바뀌므로 브라우저가 1년 동안 캐시해도 안전하다.
+gzip(과 brotli 가 있으면 br) 압축본도 미리 만들어 둔다.
+
+Bootstrap/jQuery 는 static/vendor/ 에 받아 두고 쓴다 (배포 때는 bin/post_compile 이 받는다):
+    python assets.py vendor
+받아 둔 파일이 없으면 시작할 때 오류를 낸다. 개발 중 네트워크 없이 CDN 주소를
+그대로 쓰려면 ASSETS_ALLOW_CDN=1 (시작할 때 경고를 출력한다).
+"""
+
+import base64
+import gzip
+import hashlib
+import mimetypes
+import os
+import sys
+import urllib.request
+
+from flask import Response, abort, request
+
+try:
+    import brotli  # 선택 사항
+except ImportError:
+    brotli = None
+
+# static/vendor/ 에 받아 둘 라이브러리 (로컬 경로 -> (원본 CDN 주소, 배포처가 공개한 SRI 해시))
+# 받은 내용이 해시와 다르면 저장하지 않는다 (CDN 이 돌려준 아무 내용이나 우리 자산으로 서빙하지 않도록)
+VENDOR = {
+    "vendor/bootstrap-5.3.2.min.css": (
+        "https://cdn.jsdelivr.net/npm/bootstrap@5.3.2/dist/css/bootstrap.min.css",
+        "sha384-T3c6CoIi6uLrA9TneNEoa7RxnatzjcDSCmG1MXxSR1GAsXEV/Dwwykc2MPK8M2HN",
+    ),
+    "vendor/bootstrap-5.3.2.bundle.min.js": (
+        "https://cdn.jsdelivr.net/npm/bootstrap@5.3.2/dist/js/bootstrap.bundle.min.js",
+        "sha384-C6RzsynM9kWDrMNeT87bh95OGNyZPhcTNXj1NW7RuBCsyN/o0jlpcV8Qyq46cDfL",
+    ),
+    "vendor/jquery-3.6.4.min.js": (
+        "https://code.jquery.com/jquery-3.6.4.min.js",
+        "sha256-oP6HI9z1XaZNBrJURtCoUT5SUnxFr8s3BzRl+cbzUq8=",
+    ),
+}
+
+COMPRESSIBLE = (".html", ".css", ".js", ".svg", ".json", ".txt")
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+class Asset:
+    __slots__ = ("url_path", "mimetype", "etag", "variants")
+
+    def __init__(self, url_path, mimetype, etag, variants):
+        self.url_path = url_path
+        self.mimetype = mimetype
+        self.etag = etag
+        self.variants = variants  # encoding -> bytes
+
+
+def make_asset(rel, body):
+    """내용 해시를 붙인 경로와 압축본으로 Asset 생성"""
+    digest = hashlib.sha256(body).hexdigest()[:10]
+    base, ext = os.path.splitext(rel)
+
+    variants = {"identity": body}
+    if ext in COMPRESSIBLE:
+        variants["gzip"] = gzip.compress(body, 9, mtime=0)
+        if brotli is not None:
+            variants["br"] = brotli.compress(body)
+
+    mimetype = mimetypes.guess_type(rel)[0] or "application/octet-stream"
+    return Asset(f"{base}.{digest}{ext}", mimetype, digest, variants)
+
+
+class AssetManifest:
+    def __init__(self, static_dir, url_prefix="/assets"):
+        self.static_dir = static_dir
+        self.url_prefix = url_prefix
+        self.urls = {}      # 원래 경로 -> 해시 붙은 URL
+        self.assets = {}    # 해시 붙은 경로 -> Asset
+        self.allow_cdn = os.environ.get("ASSETS_ALLOW_CDN") == "1"
+
+    def build(self):
+        """static/ 아래 파일을 전부 읽어 해시/압축본 생성"""
+        self.urls.clear()
+        self.assets.clear()
+        if not os.path.isdir(self.static_dir):
+            return
+        for root, _, files in os.walk(self.static_dir):
+            for name in files:
+                full = os.path.join(root, name)
+                rel = os.path.relpath(full, self.static_dir).replace(os.sep, "/")
+                with open(full, "rb") as f:
+                    self.add(rel, f.read())
+
+    def add(self, rel, body):
+        asset = make_asset(rel, body)
+        self.assets[asset.url_path] = asset
+        self.urls[rel] = f"{self.url_prefix}/{asset.url_path}"
+
+    def missing_vendor(self):
+        """static/vendor/ 에 아직 받지 않은 VENDOR 파일들"""
+        return [rel for rel in VENDOR if rel not in self.urls]
+
+    def url(self, rel):
+        """템플릿용: 해시 붙은 URL (ASSETS_ALLOW_CDN=1 이면 받지 않은 vendor 파일은 CDN 주소)"""
+        if rel in self.urls:
+            return self.urls[rel]
+        if rel in VENDOR and self.allow_cdn:
+            return VENDOR[rel][0]
+        raise KeyError(f"정적 파일 없음: {rel}")
+
+    def serve(self, filename):
+        asset = self.assets.get(filename)
+        if asset is None:
+            abort(404)
+        return self.respond(asset)
+
+    def respond(self, asset, cache_control=IMMUTABLE):
+        """Accept-Encoding 에 맞는 압축본으로 응답 (ETag 는 압축 방식마다 따로)"""
+        encoding = "identity"
+        for candidate in ("br", "gzip"):
+            if candidate in asset.variants and candidate in request.accept_encodings:
+                encoding = candidate
+                break
+
+        resp = Response(asset.variants[encoding], mimetype=asset.mimetype)
+        resp.set_etag(asset.etag if encoding == "identity" else f"{asset.etag}-{encoding}")
+        resp.headers["Cache-Control"] = cache_control
+        if len(asset.variants) > 1:
+            resp.vary.add("Accept-Encoding")
+        if encoding != "identity":
+            resp.headers["Content-Encoding"] = encoding
+        return resp.make_conditional(request)
+
+
+def init_app(app, vendor=True):
+    """vendor: VENDOR 라이브러리를 쓰는 앱이면 True (받아 둔 파일이 없으면 오류)"""
+    manifest = AssetManifest(app.static_folder)
+    manifest.build()
+    missing = manifest.missing_vendor() if vendor else []
+    if missing:
+        if not manifest.allow_cdn:
+            raise RuntimeError(f"static/vendor/ 에 파일이 없습니다: {', '.join(missing)} "
+                               "(python assets.py vendor 로 받거나, 개발 중이면 ASSETS_ALLOW_CDN=1)")
+        print(f"[assets] 경고: vendor 파일 없음, CDN 주소 사용: {', '.join(missing)}", file=sys.stderr)
+    app.add_url_rule(f"{manifest.url_prefix}/<path:filename>", "assets", manifest.serve)
+    app.jinja_env.globals["asset_url"] = manifest.url
+    app.extensions["assets"] = manifest
+    return manifest
+
+
+def check_integrity(rel, body, integrity):
+    """SRI 형식("sha384-<base64>") 해시와 비교. 다르면 ValueError"""
+    algorithm, expected = integrity.split("-", 1)
+    actual = base64.b64encode(hashlib.new(algorithm, body).digest()).decode("ascii")
+    if actual != expected:
+        raise ValueError(f"{rel}: 해시가 다릅니다 ({algorithm}-{actual}, 기대값 {integrity})")
+
+
+def vendor(static_dir):
+    """VENDOR 목록의 라이브러리를 static/vendor/ 에 내려받는다 (해시가 맞을 때만)"""
+    for rel, (url, integrity) in VENDOR.items():
+        dest = os.path.join(static_dir, rel)
+        if os.path.exists(dest):
+            with open(dest, "rb") as f:
+                check_integrity(rel, f.read(), integrity)
+            print(f"있음: {rel}")
+            continue
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        with urllib.request.urlopen(url, timeout=30) as resp:
+            body = resp.read()
+        check_integrity(rel, body, integrity)
+        # 받다가 끊겨도 반쪽 파일이 남지 않도록 임시 파일에 쓰고 rename
+        with open(f"{dest}.tmp", "wb") as f:
+            f.write(body)
+        os.replace(f"{dest}.tmp", dest)
+        print(f"받음: {rel} ({len(body)} bytes)")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["vendor"]:
+        vendor(os.path.join(os.path.dirname(os.path.abspath(__file__)), "static"))
+    else:
+        print("사용법: python assets.py vendor")
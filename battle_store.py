@@ -0,0 +1,112 @@
+"""
+전투 상태 저장소
+
+진행 중인 전투(몬스터 상태)를 서버에 보관하고, 세션 쿠키에는
+짧은 battle_id 만 넣는다. 매 턴 몬스터 dict 전체를 서명해서
+쿠키로 주고받을 필요가 없다.
+
+- MemoryBattleStore: 프로세스 메모리 (LRU + TTL). 워커 1개일 때
+- SQLiteBattleStore: battles 테이블. 워커가 여러 개여도 상태 공유
+
+BATTLE_STORE 환경변수(memory / sqlite)로 고른다.
+"""
+
+import json
+import secrets
+import threading
+import time
+from collections import OrderedDict
+
+import db
+
+DEFAULT_TTL = 30 * 60  # 30분 동안 아무 행동이 없으면 전투 만료
+
+
+def new_battle_id():
+    return secrets.token_urlsafe(12)
+
+
+class MemoryBattleStore:
+    def __init__(self, max_battles=10000, ttl=DEFAULT_TTL):
+        self.max_battles = max_battles
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._battles = OrderedDict()  # battle_id -> (username, state, expires_at)
+
+    def create(self, username, state):
+        battle_id = new_battle_id()
+        self.save(battle_id, username, state)
+        return battle_id
+
+    def get(self, battle_id, username):
+        """battle_id 의 전투 상태 (다른 유저 것이거나 만료됐으면 None)"""
+        with self._lock:
+            entry = self._battles.get(battle_id)
+            if entry is None:
+                return None
+            owner, state, expires_at = entry
+            if expires_at < time.time():
+                del self._battles[battle_id]
+                return None
+            if owner != username:
+                return None
+            self._battles.move_to_end(battle_id)
+            return dict(state)
+
+    def save(self, battle_id, username, state):
+        now = time.time()
+        with self._lock:
+            self._battles[battle_id] = (username, dict(state), now + self.ttl)
+            self._battles.move_to_end(battle_id)
+            # 가장 오래 안 쓴 것부터: 만료됐거나 개수 초과면 버린다
+            while self._battles:
+                oldest_id, (_, _, expires_at) = next(iter(self._battles.items()))
+                if expires_at >= now and len(self._battles) <= self.max_battles:
+                    break
+                del self._battles[oldest_id]
+
+    def delete(self, battle_id):
+        """지웠으면 True (이미 없으면 False)"""
+        with self._lock:
+            return self._battles.pop(battle_id, None) is not None
+
+
+class SQLiteBattleStore:
+    PURGE_EVERY = 100  # create() 몇 번마다 만료된 전투를 지울지
+
+    def __init__(self, path, ttl=DEFAULT_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._creates = 0
+
+    def create(self, username, state):
+        battle_id = new_battle_id()
+        self.save(battle_id, username, state)
+
+        self._creates += 1
+        if self._creates % self.PURGE_EVERY == 0:
+            db.get_db(self.path).execute("DELETE FROM battles WHERE expires_at < ?", (time.time(),))
+        return battle_id
+
+    def get(self, battle_id, username):
+        row = db.get_db(self.path).execute(
+            "SELECT state FROM battles WHERE id=? AND username=? AND expires_at >= ?",
+            (battle_id, username, time.time())).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save(self, battle_id, username, state):
+        db.get_db(self.path).execute(
+            "INSERT OR REPLACE INTO battles (id, username, state, expires_at) VALUES (?, ?, ?, ?)",
+            (battle_id, username, json.dumps(state, ensure_ascii=False), time.time() + self.ttl))
+
+    def delete(self, battle_id):
+        """지웠으면 True (이미 없으면 False)"""
+        return db.get_db(self.path).execute("DELETE FROM battles WHERE id=?", (battle_id,)).rowcount > 0
+
+
+def create_battle_store(kind, path):
+    if kind == "sqlite":
+        return SQLiteBattleStore(path)  # battles 테이블은 migrations.py 에서 만든다
+    if kind == "memory":
+        return MemoryBattleStore()
+    raise ValueError(f"알 수 없는 BATTLE_STORE: {kind}")
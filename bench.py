@@ -0,0 +1,356 @@
+"""
+game2 부하 테스트 / 지연 시간 벤치마크
+
+가상 플레이어가 login -> (start_battle -> attack 반복 -> heal) 반복 -> enhance -> shop
+순서로 요청을 보내고, 라우트별 p50/p95/p99 지연 시간과 초당 요청 수,
+요청당 SQLite 커밋 수를 잰다. 항상 임시 DB 를 쓰므로 오프라인에서 돌릴 수 있다.
+속도 제한(ratelimit.py)은 따로 주지 않으면 끈다 (RATE_LIMIT_BACKEND=off).
+2xx/3xx 가 아닌 응답은 모두 오류로 센다.
+
+    python bench.py                              # 같은 프로세스 안에서 game2 실행
+    python bench.py --server gunicorn            # 현재 gunicorn.conf.py 로 실행
+    python bench.py --users 50 --concurrency 8 --output after.json --compare before.json
+"""
+
+import argparse
+import http.client
+import json
+import logging
+import os
+import random
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+WRITE_STATEMENTS = ("INSERT", "UPDATE", "DELETE", "REPLACE")
+
+# 커밋 수 세기 (서버 쪽 프로세스 안에서)
+_commits = 0
+_commits_lock = threading.Lock()
+
+
+def install_commit_counter():
+    """db.py 가 여는 커넥션마다 실행되는 SQL 을 지켜보며 커밋 수를 센다
+
+    BEGIN ... COMMIT 은 한 번, 트랜잭션 밖의 쓰기 문장(자동 커밋)도 한 번으로 센다.
+    """
+    import db
+
+    # 이미 다른 계측 커넥션(metrics.py)이 끼워져 있으면 그 위에 덧붙인다
+    class CountingConnection(db.connection_factory):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self._bench_in_txn = False
+            self.set_trace_callback(self._bench_trace)
+
+        def _bench_trace(self, sql):
+            global _commits
+            word = sql.lstrip().split(None, 1)[0].upper() if sql.strip() else ""
+            if word == "BEGIN":
+                self._bench_in_txn = True
+            elif word in ("COMMIT", "END"):
+                self._bench_in_txn = False
+                with _commits_lock:
+                    _commits += 1
+            elif word == "ROLLBACK":
+                self._bench_in_txn = False
+            elif word in WRITE_STATEMENTS and not self._bench_in_txn:
+                with _commits_lock:
+                    _commits += 1
+
+    db.connection_factory = CountingConnection
+
+
+def dump_commit_count(directory):
+    with open(os.path.join(directory, f"commits.{os.getpid()}"), "w") as f:
+        f.write(str(_commits))
+
+
+# 서버 실행
+class InProcessServer:
+    def __init__(self, tmp):
+        self.tmp = tmp
+
+    def __enter__(self):
+        from werkzeug.serving import make_server
+
+        logging.getLogger("werkzeug").setLevel(logging.ERROR)  # 요청마다 찍히는 로그 끄기
+        os.environ["DB_PATH"] = os.path.join(self.tmp, "bench.db")
+        os.environ.setdefault("RATE_LIMIT_BACKEND", "off")  # 가상 플레이어는 연타하므로
+        import game2
+
+        install_commit_counter()
+
+        self.server = make_server("127.0.0.1", 0, game2.application, threaded=True)
+        self.port = self.server.server_port
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        # 임시 디렉터리가 지워지기 전에 남은 변경 기록 (atexit 까지 미루면 DB 가 이미 없다)
+        import db
+        import game2
+
+        if game2.player_cache is not None:
+            game2.player_cache.close()
+        game2.leaderboard.close()
+        db.close_db()
+
+    def commits(self):
+        return _commits
+
+
+# gunicorn 워커 안에서 커밋 수를 세도록 원래 설정에 훅만 덧붙인 설정 파일
+GUNICORN_WRAPPER = """
+import sys
+sys.path.insert(0, {here!r})
+exec(compile(open({conf!r}).read(), {conf!r}, "exec"))
+bind = "127.0.0.1:{port}"
+_bench_worker_exit = worker_exit
+_bench_post_worker_init = post_worker_init
+
+
+def post_worker_init(worker):
+    _bench_post_worker_init(worker)
+    import bench
+    bench.install_commit_counter()
+
+
+def worker_exit(server, worker):
+    _bench_worker_exit(server, worker)
+    import bench
+    bench.dump_commit_count({tmp!r})
+"""
+
+
+class GunicornServer:
+    def __init__(self, tmp):
+        self.tmp = tmp
+
+    def __enter__(self):
+        self.port = free_port()
+        conf = os.path.join(self.tmp, "gunicorn_bench.conf.py")
+        with open(conf, "w") as f:
+            f.write(GUNICORN_WRAPPER.format(
+                here=HERE, conf=os.path.join(HERE, "gunicorn.conf.py"), port=self.port, tmp=self.tmp,
+            ))
+        env = dict(os.environ, DB_PATH=os.path.join(self.tmp, "bench.db"),
+                   RATE_LIMIT_BACKEND=os.environ.get("RATE_LIMIT_BACKEND", "off"),
+                   PYTHONPATH=os.pathsep.join(filter(None, [HERE, os.environ.get("PYTHONPATH")])))
+        self.proc = subprocess.Popen(
+            [sys.executable, "-m", "gunicorn", "-c", conf], cwd=HERE, env=env,
+            stdout=subprocess.DEVNULL, stderr=open(os.path.join(self.tmp, "gunicorn.log"), "w"),
+        )
+        wait_for_port(self.port, self.proc)
+        return self
+
+    def __exit__(self, *exc):
+        if self.proc.poll() is None:
+            self.proc.send_signal(signal.SIGTERM)
+            self.proc.wait(timeout=30)
+
+    def commits(self):
+        # 워커가 종료할 때 남긴 파일을 합친다 (그래서 서버를 먼저 멈춘 뒤 호출)
+        self.__exit__()
+        total = 0
+        for name in os.listdir(self.tmp):
+            if name.startswith("commits."):
+                with open(os.path.join(self.tmp, name)) as f:
+                    total += int(f.read() or 0)
+        return total
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_for_port(port, proc, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError("gunicorn 이 시작하지 못했습니다 (gunicorn.log 확인)")
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.5).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("gunicorn 시작 대기 시간 초과")
+
+
+# 가상 플레이어
+class Session:
+    def __init__(self, port, samples):
+        self.conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        self.cookie = None
+        self.samples = samples
+        self.version = -1
+
+    def request(self, method, path, form=None):
+        headers = {"Accept-Encoding": "gzip"}
+        body = None
+        if form is not None:
+            body = "&".join(f"{k}={v}" for k, v in form.items())
+            headers["Content-Type"] = "application/x-www-form-urlencoded"
+        if self.cookie:
+            headers["Cookie"] = self.cookie
+
+        start = time.perf_counter()
+        self.conn.request(method, path, body=body, headers=headers)
+        resp = self.conn.getresponse()
+        data = resp.read()
+        elapsed = time.perf_counter() - start
+
+        self.samples.append((path, elapsed, resp.status))
+        cookie = resp.getheader("Set-Cookie")
+        if cookie:
+            self.cookie = cookie.split(";", 1)[0]
+        if resp.getheader("Content-Type", "").startswith("application/json"):
+            payload = json.loads(data)
+            player = payload.get("player")
+            if player:
+                self.version = player["version"]
+            return payload
+        return None
+
+    def post(self, path, **form):
+        form["since"] = self.version
+        return self.request("POST", path, form)
+
+    def play(self, name, rounds, attacks, rng):
+        self.request("POST", "/login", {"username": name})
+        self.request("GET", "/")
+        for _ in range(rounds):
+            self.post("/start_battle")
+            for _ in range(attacks):
+                result = self.post("/attack")
+                if not result or result.get("status") != "ok" or result.get("monster_dead"):
+                    break
+            self.post("/heal")
+        self.post("/enhance", type=rng.choice(("weapon", "armor")))
+        self.post("/shop", item="potion")
+        self.conn.close()
+
+
+# 통계
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, round(p / 100 * len(sorted_values) + 0.5) - 1))
+    return sorted_values[index]
+
+
+def summarize(samples, wall):
+    routes = {}
+    for path, elapsed, status in samples:
+        routes.setdefault(path, []).append((elapsed, status))
+
+    summary = {}
+    for path, rows in sorted(routes.items()):
+        latencies = sorted(e for e, _ in rows)
+        summary[path] = {
+            "requests": len(rows),
+            "errors": sum(1 for _, s in rows if not 200 <= s < 400),  # 429 등도 오류
+            "rps": len(rows) / wall,
+            "p50_ms": percentile(latencies, 50) * 1000,
+            "p95_ms": percentile(latencies, 95) * 1000,
+            "p99_ms": percentile(latencies, 99) * 1000,
+        }
+    return summary
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=HERE,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        server_class = GunicornServer if args.server == "gunicorn" else InProcessServer
+        with server_class(tmp) as server:
+            samples = []
+            rng = random.Random(args.seed)
+            sessions = [(f"bench_{i}", random.Random(rng.random())) for i in range(args.users)]
+
+            def play(item):
+                name, session_rng = item
+                Session(server.port, samples).play(name, args.rounds, args.attacks, session_rng)
+
+            start = time.perf_counter()
+            with ThreadPoolExecutor(args.concurrency) as pool:
+                list(pool.map(play, sessions))
+            wall = time.perf_counter() - start
+            commits = server.commits()
+
+    return {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "options": vars(args) | {"output": None, "compare": None},
+        "wall_seconds": wall,
+        "requests": len(samples),
+        "rps": len(samples) / wall,
+        "commits": commits,
+        "commits_per_request": commits / len(samples) if samples else None,
+        "routes": summarize(samples, wall),
+    }
+
+
+def print_report(result):
+    print(f"커밋 {result['commit']}  요청 {result['requests']}개  {result['wall_seconds']:.2f}초  "
+          f"{result['rps']:.1f} req/s  요청당 커밋 {result['commits_per_request']:.2f}")
+    print(f"{'route':<16}{'count':>7}{'err':>5}{'rps':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for path, r in result["routes"].items():
+        print(f"{path:<16}{r['requests']:>7}{r['errors']:>5}{r['rps']:>9.1f}"
+              f"{r['p50_ms']:>9.2f}{r['p95_ms']:>9.2f}{r['p99_ms']:>9.2f}")
+
+
+def print_comparison(before, after):
+    """이전 결과와 라우트별 p95 / rps 비교"""
+    print(f"\n비교: {before.get('commit')} -> {after.get('commit')}")
+    print(f"{'route':<16}{'p95 전':>10}{'p95 후':>10}{'변화':>9}{'rps 변화':>10}")
+    for path, r in after["routes"].items():
+        old = before["routes"].get(path)
+        if old is None:
+            continue
+        p95 = (r["p95_ms"] - old["p95_ms"]) / old["p95_ms"] * 100 if old["p95_ms"] else 0.0
+        rps = (r["rps"] - old["rps"]) / old["rps"] * 100 if old["rps"] else 0.0
+        print(f"{path:<16}{old['p95_ms']:>10.2f}{r['p95_ms']:>10.2f}{p95:>+8.1f}%{rps:>+9.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="game2 부하 테스트")
+    parser.add_argument("--server", choices=("inprocess", "gunicorn"), default="inprocess")
+    parser.add_argument("--users", type=int, default=20, help="가상 플레이어 수")
+    parser.add_argument("--concurrency", type=int, default=4, help="동시에 플레이하는 수")
+    parser.add_argument("--rounds", type=int, default=5, help="플레이어당 전투 수")
+    parser.add_argument("--attacks", type=int, default=5, help="전투당 최대 공격 수")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON")
+    args = parser.parse_args()
+
+    result = run(args)
+    print_report(result)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+    if args.compare:
+        with open(args.compare) as f:
+            print_comparison(json.load(f), result)
+
+
+if __name__ == "__main__":
+    main()
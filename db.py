@@ -0,0 +1,108 @@
+"""
+SQLite 커넥션 관리
+
+워커 스레드마다 커넥션 하나를 열어 두고 계속 재사용한다.
+요청마다 sqlite3.connect() 를 새로 호출하지 않으므로 connect 비용과
+PRAGMA 설정 비용은 스레드당 한 번만 든다.
+
+사용법:
+    db.init_app(app)          # 앱 생성 직후 한 번
+    conn = db.get_db()        # 요청 처리 중 어디서든
+"""
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from flask import current_app, g, has_app_context
+
+BUSY_TIMEOUT_MS = 5000       # 다른 워커가 쓰기 잠금을 잡고 있을 때 기다릴 시간
+CACHED_STATEMENTS = 256      # 커넥션별 prepared statement 캐시 크기
+
+_local = threading.local()
+
+# 커넥션 클래스 (계측이 필요하면 sqlite3.Connection 하위 클래스로 바꿔 끼운다)
+connection_factory = sqlite3.Connection
+
+
+def connect(path):
+    """새 커넥션을 열고 기본 PRAGMA 설정"""
+    conn = sqlite3.connect(
+        path,
+        timeout=BUSY_TIMEOUT_MS / 1000,
+        cached_statements=CACHED_STATEMENTS,
+        factory=connection_factory,
+        isolation_level=None,  # 트랜잭션은 직접 BEGIN/COMMIT 으로 관리
+    )
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+    return conn
+
+
+def get_db(path=None):
+    """현재 워커 스레드의 커넥션 반환 (없으면 새로 연다)"""
+    if path is None:
+        path = current_app.config["DATABASE"]
+
+    conns = getattr(_local, "conns", None)
+    # fork 이전(preload)에 열린 커넥션은 자식 프로세스에서 쓰면 안 된다
+    if conns is None or _local.pid != os.getpid():
+        conns = _local.conns = {}
+        _local.pid = os.getpid()
+
+    conn = conns.get(path)
+    if conn is None:
+        conn = conns[path] = connect(path)
+
+    if has_app_context():
+        g._db_conn = conn
+    return conn
+
+
+@contextmanager
+def transaction(path=None):
+    """BEGIN IMMEDIATE ... COMMIT 로 묶기 (예외 시 ROLLBACK)
+
+    IMMEDIATE 로 시작하므로 블록 안에서 읽은 값은 커밋 전까지
+    다른 요청이 바꿀 수 없다 (읽기-수정-쓰기 경쟁 방지).
+    이미 트랜잭션 안이면 바깥 트랜잭션에 그대로 합류한다.
+    """
+    conn = get_db(path)
+    if conn.in_transaction:
+        yield conn
+        return
+
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.rollback()
+        raise
+    conn.commit()
+
+
+def close_db(path=None):
+    """현재 스레드의 커넥션 닫기 (테스트/종료용)"""
+    conns = getattr(_local, "conns", None)
+    if not conns:
+        return
+    paths = list(conns) if path is None else [path]
+    for p in paths:
+        conn = conns.pop(p, None)
+        if conn is not None:
+            conn.close()
+
+
+def _teardown(exc):
+    # 커넥션은 닫지 않고 스레드에 남겨 둔다.
+    # 다만 요청이 예외로 끝나 트랜잭션이 열린 채 남았다면 되돌린다.
+    conn = g.pop("_db_conn", None)
+    if conn is not None and conn.in_transaction:
+        conn.rollback()
+
+
+def init_app(app):
+    app.config.setdefault("DATABASE", "rpg_game.db")
+    app.teardown_appcontext(_teardown)
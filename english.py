@@ -1,12 +1,17 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
-import json
+from tkinter import ttk, messagebox, filedialog
 import random
 import os
 from datetime import datetime
 import subprocess
 import sys
 
+from progress_store import ProgressStore
+from quiz import QuizEngine
+from scheduler import Scheduler
+from word_list import ListboxRows, PagedList, PrefixView, TreeviewRows, WordIndex
+from vocab_store import VocabularyStore, word_key
+
 # TTS 기능 확인
 TTS_AVAILABLE = False
 try:
@@ -23,7 +28,8 @@ class EnglishVocabApp:
         self.root.configure(bg='#f0f0f0')
         
         # 데이터 파일 경로
-        self.data_file = "vocabulary.json"
+        self.data_file = "vocabulary.json"  # 예전 단어장 (처음 실행할 때 DB 로 가져온다)
+        self.vocab_db_file = "vocabulary.db"
         self.progress_file = "progress.json"
         
         # TTS 엔진 초기화
@@ -47,21 +53,34 @@ class EnglishVocabApp:
             self.tts_engine = None
         
         # 데이터 초기화
-        self.vocabulary = self.load_vocabulary()
+        self.vocab_store = VocabularyStore(self.vocab_db_file)
+        vocabulary = self.load_vocabulary()
+        self.quiz = QuizEngine(vocabulary)
+        # 학습 탭은 퀴즈 배열을 그대로 쓴다 (단어 -> 위치 맵이 있어 삭제가 O(1),
+        # 삭제하면 마지막 단어가 그 자리로 온다)
+        self.vocabulary = self.quiz.entries
+        self.scheduler = Scheduler([w["word"] for w in vocabulary], self.vocab_store)
+        self.word_index = WordIndex(vocabulary)  # 단어 관리 목록용 알파벳순 인덱스
+        self.progress_store = ProgressStore(self.progress_file)
         self.progress = self.load_progress()
         self.current_word_index = 0
         self.game_score = 0
         self.game_total = 0
+        self.current_question = None
+        self.reviewing = False
         
         # GUI 생성
         self.create_widgets()
         
     def load_vocabulary(self):
         """단어장 데이터 로드"""
+        if self.vocab_store.count() > 0:
+            return self.vocab_store.all()
+        
         if os.path.exists(self.data_file):
             try:
-                with open(self.data_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                self.vocab_store.import_json(self.data_file)
+                return self.vocab_store.all()
             except:
                 pass
         
@@ -78,30 +97,45 @@ class EnglishVocabApp:
             {"word": "internet", "meaning": "인터넷", "pronunciation": "ˈɪntərnet"},
             {"word": "journey", "meaning": "여행", "pronunciation": "ˈʤɜːrni"}
         ]
-        self.save_vocabulary(default_vocab)
+        self.vocab_store.add_many(default_vocab)
         return default_vocab
     
-    def save_vocabulary(self, vocab=None):
-        """단어장 저장"""
-        if vocab is None:
-            vocab = self.vocabulary
-        with open(self.data_file, 'w', encoding='utf-8') as f:
-            json.dump(vocab, f, ensure_ascii=False, indent=2)
+    def import_vocabulary(self):
+        """JSON 단어장 가져오기 (이미 있는 단어는 건너뜀)"""
+        path = filedialog.askopenfilename(filetypes=[("JSON", "*.json")])
+        if not path:
+            return
+        try:
+            added = self.vocab_store.import_json(path)
+        except Exception as e:
+            messagebox.showerror("오류", f"가져오기 실패: {e}")
+            return
+        vocabulary = self.vocab_store.all()
+        self.quiz = QuizEngine(vocabulary)
+        self.vocabulary = self.quiz.entries
+        self.scheduler = Scheduler([w["word"] for w in vocabulary], self.vocab_store)
+        self.word_index = WordIndex(vocabulary)
+        self.update_word_list()
+        self.show_current_word()
+        messagebox.showinfo("알림", f"{added}개 단어를 가져왔습니다.")
+    
+    def export_vocabulary(self):
+        """JSON 단어장 내보내기"""
+        path = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON", "*.json")])
+        if not path:
+            return
+        self.vocab_store.export_json(path)
+        messagebox.showinfo("알림", f"{len(self.vocabulary)}개 단어를 내보냈습니다.")
     
     def load_progress(self):
-        """학습 진도 로드"""
-        if os.path.exists(self.progress_file):
-            try:
-                with open(self.progress_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except:
-                pass
-        return {"learned_words": [], "scores": []}
+        """학습 진도 로드 (스냅샷 + 저널)"""
+        return self.progress_store.load()
     
-    def save_progress(self):
-        """학습 진도 저장"""
-        with open(self.progress_file, 'w', encoding='utf-8') as f:
-            json.dump(self.progress, f, ensure_ascii=False, indent=2)
+    def close(self):
+        """종료 시 저널을 스냅샷으로 합치고 단어장 DB 를 닫음"""
+        self.progress_store.close()
+        self.vocab_store.close()
+        self.root.destroy()
     
     def create_widgets(self):
         """GUI 위젯 생성"""
@@ -202,6 +236,11 @@ class EnglishVocabApp:
         ttk.Button(game_control_frame, text="다음 문제", 
                   command=self.next_question).grid(row=0, column=1, padx=5)
         
+        # 어려운 오답 (정답과 앞 글자가 같은 단어/뜻을 먼저 고른다)
+        self.hard_mode = tk.BooleanVar(value=False)
+        ttk.Checkbutton(game_control_frame, text="어려운 오답", 
+                       variable=self.hard_mode).grid(row=0, column=2, padx=5)
+        
         # 결과 표시
         self.result_label = ttk.Label(game_frame, text="", font=("Arial", 12))
         self.result_label.grid(row=8, column=0, columnspan=2, pady=10)
@@ -234,7 +273,15 @@ class EnglishVocabApp:
         list_frame = ttk.LabelFrame(manage_frame, text="단어 목록", padding="10")
         list_frame.grid(row=1, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S), pady=10)
         
-        # 트리뷰 (단어 목록 표시)
+        # 앞 글자 검색 (입력할 때마다 알파벳순 인덱스에서 범위만 찾는다)
+        search_frame = ttk.Frame(list_frame)
+        search_frame.grid(row=0, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=(0, 5))
+        ttk.Label(search_frame, text="검색:").grid(row=0, column=0, padx=(0, 5))
+        self.word_search = tk.StringVar()
+        ttk.Entry(search_frame, textvariable=self.word_search, width=30).grid(row=0, column=1)
+        self.word_search.trace_add("write", lambda *args: self.update_word_list())
+        
+        # 트리뷰 (단어 목록 표시, 한 페이지씩)
         columns = ("단어", "뜻", "발음")
         self.word_tree = ttk.Treeview(list_frame, columns=columns, show="headings", height=10)
         
@@ -242,16 +289,27 @@ class EnglishVocabApp:
             self.word_tree.heading(col, text=col)
             self.word_tree.column(col, width=150)
         
-        self.word_tree.grid(row=0, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S))
+        self.word_tree.grid(row=1, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S))
         
         # 스크롤바
         scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self.word_tree.yview)
-        scrollbar.grid(row=0, column=2, sticky=(tk.N, tk.S))
+        scrollbar.grid(row=1, column=2, sticky=(tk.N, tk.S))
         self.word_tree.configure(yscrollcommand=scrollbar.set)
         
-        # 삭제 버튼
+        self.word_pager = PagedList(
+            TreeviewRows(self.word_tree, lambda e: (e["word"], e["meaning"], e["pronunciation"])),
+            PrefixView(self.word_index))
+        self.word_pager.controls(list_frame).grid(row=2, column=0, columnspan=3, pady=(5, 0))
+        
+        # 삭제 / 가져오기 / 내보내기 버튼
         ttk.Button(list_frame, text="선택한 단어 삭제", 
-                  command=self.delete_word).grid(row=1, column=0, pady=10)
+                  command=self.delete_word).grid(row=3, column=0, pady=10)
+        io_frame = ttk.Frame(list_frame)
+        io_frame.grid(row=3, column=1, pady=10, sticky=tk.E)
+        ttk.Button(io_frame, text="JSON 가져오기", 
+                  command=self.import_vocabulary).grid(row=0, column=0, padx=5)
+        ttk.Button(io_frame, text="JSON 내보내기", 
+                  command=self.export_vocabulary).grid(row=0, column=1, padx=5)
         
         # 단어 목록 업데이트
         self.update_word_list()
@@ -260,7 +318,7 @@ class EnglishVocabApp:
         manage_frame.columnconfigure(0, weight=1)
         manage_frame.rowconfigure(1, weight=1)
         list_frame.columnconfigure(0, weight=1)
-        list_frame.rowconfigure(0, weight=1)
+        list_frame.rowconfigure(1, weight=1)
     
     def create_progress_tab(self):
         """진도 탭 생성"""
@@ -286,11 +344,15 @@ class EnglishVocabApp:
         learned_scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
         self.learned_listbox.configure(yscrollcommand=learned_scrollbar.set)
         
+        self.learned_pager = PagedList(ListboxRows(self.learned_listbox), self.progress["learned_words"])
+        self.learned_pager.controls(learned_frame).grid(row=1, column=0, columnspan=2, pady=(5, 0))
+        
         # 진도 초기화 버튼
         ttk.Button(progress_frame, text="진도 초기화", 
                   command=self.reset_progress).grid(row=2, column=0, pady=10)
         
         # 진도 업데이트
+        self.learned_pager.refresh()
         self.update_progress_display()
         
         # 그리드 가중치
@@ -326,9 +388,9 @@ class EnglishVocabApp:
         
         # 학습한 단어로 기록
         word = current["word"]
-        if word not in self.progress["learned_words"]:
-            self.progress["learned_words"].append(word)
-            self.save_progress()
+        if not self.progress_store.is_learned(word):
+            self.progress_store.add_learned(word)
+            self.learned_pager.inserted(len(self.progress["learned_words"]) - 1)
             self.update_progress_display()
     
     def speak_word(self):
@@ -471,37 +533,23 @@ class EnglishVocabApp:
         if len(self.vocabulary) < 4:
             return
         
-        # 랜덤 단어 선택
-        self.current_question = random.choice(self.vocabulary)
-        
         # 문제 유형 랜덤 선택 (영어->한국어 또는 한국어->영어)
         self.question_type = random.choice(["en_to_kr", "kr_to_en"])
         
+        # 복습할 때가 된 단어 (간격 반복). 없으면 아무 단어로 연습
+        due_word = self.scheduler.next_due()
+        
+        # 선택지 (오답은 미리 만든 배열에서 뽑는다)
+        self.current_question, options, self.correct_answer_index = self.quiz.question(
+            self.question_type, hard=self.hard_mode.get(), word=due_word)
+        self.reviewing = due_word is not None
+        
         if self.question_type == "en_to_kr":
             # 영어 단어 보고 한국어 뜻 맞히기
             self.question_label.config(text=f"다음 영어 단어의 뜻은?\n'{self.current_question['word']}'")
-            correct_answer = self.current_question["meaning"]
-            
-            # 오답 선택지 생성
-            wrong_answers = [word["meaning"] for word in self.vocabulary 
-                           if word["meaning"] != correct_answer]
-            wrong_answers = random.sample(wrong_answers, min(3, len(wrong_answers)))
-            
         else:
             # 한국어 뜻 보고 영어 단어 맞히기
             self.question_label.config(text=f"다음 뜻의 영어 단어는?\n'{self.current_question['meaning']}'")
-            correct_answer = self.current_question["word"]
-            
-            # 오답 선택지 생성
-            wrong_answers = [word["word"] for word in self.vocabulary 
-                           if word["word"] != correct_answer]
-            wrong_answers = random.sample(wrong_answers, min(3, len(wrong_answers)))
-        
-        # 선택지 섞기
-        options = wrong_answers + [correct_answer]
-        random.shuffle(options)
-        
-        self.correct_answer_index = options.index(correct_answer)
         
         # 버튼에 선택지 설정
         for i, option in enumerate(options):
@@ -525,6 +573,14 @@ class EnglishVocabApp:
             result_text = f"오답! 정답: {self.option_buttons[self.correct_answer_index]['text']}"
             result_color = "red"
         
+        # 복습 일정 갱신 (연습 문제는 일정에 반영하지 않는다)
+        if self.reviewing:
+            card = self.scheduler.review(self.current_question["word"], selected_index == self.correct_answer_index)
+            if card is not None and card.reps:  # None: 그 사이 단어가 삭제됨
+                result_text += f"\n다음 복습: {card.interval:g}일 후"
+        else:
+            result_text += "\n(복습할 단어가 없어 연습 문제로 냈습니다)"
+        
         self.result_label.config(text=result_text, foreground=result_color)
         self.score_label.config(text=f"점수: {self.game_score}/{self.game_total}")
         
@@ -535,8 +591,7 @@ class EnglishVocabApp:
             "total": self.game_total,
             "percentage": round((self.game_score / self.game_total) * 100, 1)
         }
-        self.progress["scores"].append(score_data)
-        self.save_progress()
+        self.progress_store.add_score(score_data)
         
         # 버튼 비활성화
         for btn in self.option_buttons:
@@ -552,22 +607,24 @@ class EnglishVocabApp:
             messagebox.showwarning("알림", "영어 단어와 뜻을 입력해주세요.")
             return
         
-        # 중복 확인
-        for existing in self.vocabulary:
-            if existing["word"].lower() == word.lower():
-                messagebox.showwarning("알림", "이미 존재하는 단어입니다.")
-                return
-        
-        # 새 단어 추가
+        # 새 단어 추가 (중복 확인은 대소문자 무시 UNIQUE 인덱스가 한다)
         new_word = {
             "word": word,
             "meaning": meaning,
             "pronunciation": pronunciation or word  # 발음이 없으면 단어로 대체
         }
         
-        self.vocabulary.append(new_word)
-        self.save_vocabulary()
-        self.update_word_list()
+        if not self.vocab_store.add(new_word["word"], new_word["meaning"], new_word["pronunciation"]):
+            messagebox.showwarning("알림", "이미 존재하는 단어입니다.")
+            return
+        
+        self.quiz.add(new_word)  # self.vocabulary 에도 들어간다
+        self.scheduler.add(word)
+        
+        # 목록에는 그 줄만 추가 (검색 중이면 검색 결과에 들어갈 때만)
+        pos = self.word_pager.source.position(self.word_index.add(new_word), word)
+        if pos >= 0:
+            self.word_pager.inserted(pos)
         
         # 입력 필드 클리어
         self.new_word_entry.delete(0, tk.END)
@@ -583,18 +640,35 @@ class EnglishVocabApp:
             messagebox.showwarning("알림", "삭제할 단어를 선택해주세요.")
             return
         
-        # 선택한 항목의 인덱스 찾기
+        # 선택한 항목의 단어 (목록은 알파벳순)
         item = selected[0]
-        item_values = self.word_tree.item(item, 'values')
-        word_to_delete = item_values[0]
+        word_to_delete = self.word_tree.item(item, 'values')[0]
+        index_pos = self.word_index.find(word_to_delete)
         
         # 확인 대화상자
         if messagebox.askyesno("확인", f"'{word_to_delete}' 단어를 삭제하시겠습니까?"):
-            # 단어 삭제
-            self.vocabulary = [word for word in self.vocabulary 
-                             if word["word"] != word_to_delete]
-            self.save_vocabulary()
-            self.update_word_list()
+            # 단어 삭제 (목록에서는 그 줄만 뺀다)
+            pos = self.word_pager.source.position(index_pos, word_to_delete)
+            self.word_index.remove(word_to_delete)
+            if pos >= 0:
+                self.word_pager.deleted(pos)
+            
+            self.vocab_store.delete(word_to_delete)
+            self.quiz.remove(word_to_delete)  # self.vocabulary 에서도 빠진다 (word_key 로 찾아 O(1))
+            self.scheduler.remove(word_to_delete)
+            
+            # 지금 퀴즈 문제의 단어를 지웠으면 다음 문제로
+            if self.current_question is not None and \
+                    word_key(self.current_question["word"]) == word_key(word_to_delete):
+                self.current_question = None
+                self.reviewing = False
+                if len(self.vocabulary) >= 4:
+                    self.next_question()
+                else:
+                    self.question_label.config(text="게임을 하려면 최소 4개의 단어가 필요합니다.")
+                    self.result_label.config(text="")
+                    for btn in self.option_buttons:
+                        btn.config(text="", state='disabled')
             
             # 현재 단어 인덱스 조정
             if self.current_word_index >= len(self.vocabulary):
@@ -606,18 +680,8 @@ class EnglishVocabApp:
             messagebox.showinfo("알림", "단어가 삭제되었습니다.")
     
     def update_word_list(self):
-        """단어 목록 업데이트"""
-        # 기존 항목 삭제
-        for item in self.word_tree.get_children():
-            self.word_tree.delete(item)
-        
-        # 새 항목 추가
-        for word_data in self.vocabulary:
-            self.word_tree.insert("", tk.END, values=(
-                word_data["word"],
-                word_data["meaning"],
-                word_data["pronunciation"]
-            ))
+        """단어 목록을 검색어 기준으로 첫 페이지부터 다시 표시"""
+        self.word_pager.set_source(PrefixView(self.word_index, self.word_search.get()))
     
     def update_progress_display(self):
         """진도 표시 업데이트"""
@@ -636,23 +700,19 @@ class EnglishVocabApp:
             stats_text += f"\n최근 퀴즈 평균: {round(avg_score, 1)}%"
         
         self.stats_label.config(text=stats_text)
-        
-        # 학습한 단어 목록 업데이트
-        self.learned_listbox.delete(0, tk.END)
-        for word in self.progress["learned_words"]:
-            self.learned_listbox.insert(tk.END, word)
     
     def reset_progress(self):
         """진도 초기화"""
         if messagebox.askyesno("확인", "학습 진도를 초기화하시겠습니까?\n이 작업은 되돌릴 수 없습니다."):
-            self.progress = {"learned_words": [], "scores": []}
-            self.save_progress()
+            self.progress_store.reset()
+            self.learned_pager.refresh()
             self.update_progress_display()
             messagebox.showinfo("알림", "학습 진도가 초기화되었습니다.")
 
 def main():
     root = tk.Tk()
     app = EnglishVocabApp(root)
+    root.protocol("WM_DELETE_WINDOW", app.close)
     root.mainloop()
 
 if __name__ == "__main__":
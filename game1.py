@@ -33,9 +33,12 @@ if not (RUN_WEB or RUN_TK):
 # Flask 웹서버 (single-file)
 # ------------------------
 if RUN_WEB:
-    from flask import Flask, render_template_string
+    from flask import Flask
+
+    import assets
 
     app = Flask(__name__)
+    manifest = assets.init_app(app, vendor=False)  # Bootstrap/jQuery 안 씀
 
     INDEX_HTML = r"""
     <!doctype html>
@@ -44,28 +47,7 @@ if RUN_WEB:
       <meta charset="utf-8">
       <meta name="viewport" content="width=device-width,initial-scale=1">
       <title>승진 강화 게임 (웹)</title>
-      <style>
-        :root{--bg:#0f172a;--card:#0b1220;--accent:#60a5fa;--success:#34d399;--danger:#fb7185}
-        html,body{height:100%;margin:0;font-family:Inter, Roboto, Arial;background:linear-gradient(180deg,#071024 0%, #081227 100%);color:#e6eef8}
-        .wrap{max-width:900px;margin:24px auto;padding:20px;border-radius:14px;background:rgba(255,255,255,0.03);box-shadow:0 8px 30px rgba(2,6,23,0.6)}
-        h1{margin:0 0 8px;font-size:22px}
-        .top-row{display:flex;gap:12px;align-items:center;}
-        .stat{background:rgba(255,255,255,0.02);padding:12px;border-radius:10px;min-width:140px;text-align:center}
-        .big{font-size:20px;font-weight:700}
-        #info{margin-top:12px;height:44px;display:flex;align-items:center;justify-content:center;font-weight:600}
-        .buttons{display:flex;gap:8px;margin-top:16px}
-        button{padding:10px 16px;border-radius:10px;border:0;background:var(--accent);color:#04203a;font-weight:700;cursor:pointer;box-shadow:0 6px 18px rgba(96,165,250,0.12)}
-        button.muted{background:rgba(255,255,255,0.06);color:#cfe6ff}
-        .items{display:flex;gap:8px;margin-top:12px}
-        .item-card{background:rgba(255,255,255,0.02);padding:10px;border-radius:8px;min-width:160px}
-        .flash{animation:flash 0.5s linear}
-        @keyframes flash{0%{transform:scale(1)}50%{transform:scale(1.04)}100%{transform:scale(1)}}
-        .shake{animation:shake 0.4s}
-        @keyframes shake{0%{transform:translateX(0)}25%{transform:translateX(-8px)}50%{transform:translateX(8px)}75%{transform:translateX(-6px)}100%{transform:translateX(0)}}
-        .confetti-piece{position:absolute;width:8px;height:12px;border-radius:2px;opacity:0.95}
-        .center{display:flex;align-items:center;justify-content:center}
-        footer{margin-top:18px;color:#9fb6d9;font-size:13px;text-align:center}
-      </style>
+      <link href="{{ asset_url('css/game1.css') }}" rel="stylesheet">
     </head>
     <body>
     <div class="wrap">
@@ -118,169 +100,18 @@ if RUN_WEB:
       <footer>웹버전: 브라우저에서 플레이하세요 — 필요하면 서버-사이드 저장(선택) 추가 가능</footer>
     </div>
 
-    <script>
-    // 게임 데이터
-    const ranks = ["인턴","사원","대리","과장","부장","전무","사장","회장","명예회장","재벌총수","세계재벌왕"]
-    const probs = [0.7,0.6,0.5,0.4,0.3,0.2,0.1,0.08,0.05,0.03]
-    const baseCost = 100
-    const baseIncome = 10
-
-    let level = 0
-    let money = 0
-    let income = baseIncome
-    let boostOwned = 0
-    let protectOwned = 0
-    let autoOn = false
-
-    // item costs scale with level: base * (2^level) * factor
-    function calcPromotionCost(l){ return Math.floor(baseCost * Math.pow(2,l)) }
-    function calcBoostCost(l){ return Math.floor(500 * Math.pow(1.9, l)) }
-    function calcProtectCost(l){ return Math.floor(1000 * Math.pow(1.9, l)) }
-
-    // DOM
-    const moneyEl = document.getElementById('money')
-    const incomeEl = document.getElementById('income')
-    const rankEl = document.getElementById('rank')
-    const levelEl = document.getElementById('level')
-    const probEl = document.getElementById('prob')
-    const costEl = document.getElementById('cost')
-    const msg = document.getElementById('message')
-    const promoteBtn = document.getElementById('promote')
-    const buyBoostBtn = document.getElementById('buyBoost')
-    const buyProtectBtn = document.getElementById('buyProtect')
-    const itemsOwnedEl = document.getElementById('itemsOwned')
-    const boostCostEl = document.getElementById('boostCost')
-    const protectCostEl = document.getElementById('protectCost')
-    const autoBtn = document.getElementById('auto')
-
-    function updateUI(){
-      moneyEl.textContent = money
-      incomeEl.textContent = income
-      rankEl.textContent = ranks[level]
-      levelEl.textContent = level
-      if(level < ranks.length - 1){
-        probEl.textContent = Math.round(probs[level]*100) + '%'
-        costEl.textContent = calcPromotionCost(level)
-      } else {
-        probEl.textContent = '---'
-        costEl.textContent = '최고'
-      }
-      boostCostEl.textContent = calcBoostCost(level)
-      protectCostEl.textContent = calcProtectCost(level)
-      itemsOwnedEl.textContent = (boostOwned? '확률+' + boostOwned*10 + '% ':'') + (protectOwned? '강등방지 x'+protectOwned : '없음')
-    }
-
-    // income tick
-    setInterval(()=>{
-      money += income
-      updateUI()
-      if(autoOn) tryAutoPromote()
-    },1000)
-
-    function showMessage(text, cls){
-      msg.textContent = text
-      msg.classList.remove('flash','shake')
-      void msg.offsetWidth
-      if(cls === 'success') msg.classList.add('flash')
-      if(cls === 'fail') msg.classList.add('shake')
-    }
-
-    function promote(){
-      if(level >= ranks.length -1){ showMessage('최고 직급입니다!', 'success'); return }
-      const cost = calcPromotionCost(level)
-      if(money < cost){ showMessage('돈이 부족합니다!', 'fail'); return }
-      money -= cost
-      let chance = probs[level]
-      if(boostOwned>0){ chance += 0.10; boostOwned--; }
-
-      const succ = Math.random() < chance
-      if(succ){
-        level++
-        income = baseIncome * Math.pow(2, level)
-        showMessage('✅ 승진 성공! ' + ranks[level], 'success')
-        burstConfetti()
-      } else {
-        if(protectOwned>0){ protectOwned--; showMessage('❌ 승진 실패! (아이템으로 강등 방지)', 'fail') }
-        else {
-          if(level>0) { level--; income = baseIncome * Math.pow(2, level); showMessage('❌ 승진 실패! 한 단계 강등', 'fail') }
-          else showMessage('❌ 승진 실패! (강등 없음)', 'fail')
-        }
-        shakeScreen()
-      }
-      updateUI()
-    }
-
-    // auto try if money enough
-    function tryAutoPromote(){
-      if(level >= ranks.length -1) return
-      const cost = calcPromotionCost(level)
-      if(money >= cost) promote()
-    }
-
-    promoteBtn.addEventListener('click', promote)
-
-    buyBoostBtn.addEventListener('click', ()=>{
-      const c = calcBoostCost(level)
-      if(money >= c){ money -= c; boostOwned++; showMessage('확률+10% 아이템 구매', 'success'); updateUI() }
-      else showMessage('돈이 부족합니다', 'fail')
-    })
-
-    buyProtectBtn.addEventListener('click', ()=>{
-      const c = calcProtectCost(level)
-      if(money >= c){ money -= c; protectOwned++; showMessage('강등방지 아이템 구매', 'success'); updateUI() }
-      else showMessage('돈이 부족합니다', 'fail')
-    })
-
-    autoBtn.addEventListener('click', ()=>{
-      autoOn = !autoOn
-      autoBtn.textContent = autoOn? '자동(ON)': '자동(OFF)'
-      autoBtn.classList.toggle('muted')
-    })
-
-    // visual effects: confetti + shake
-    const canvas = document.getElementById('confettiCanvas')
-    const ctx = canvas.getContext('2d')
-    let W, H, confettiPieces = []
-    function resize(){ W = canvas.width = canvas.clientWidth; H = canvas.height = canvas.clientHeight }
-    window.addEventListener('resize', resize)
-    resize()
-
-    function rand(min,max){ return Math.random()*(max-min)+min }
-    function spawnConfetti(n=40){
-      for(let i=0;i<n;i++){
-        confettiPieces.push({x:rand(0,W), y:rand(-H,0), vx:rand(-0.5,0.5), vy:rand(1,4), rot:rand(0,360), vr:rand(-6,6), color:`hsl(${Math.floor(rand(0,360))},80%,60%)`, size:rand(6,12)})
-      }
-    }
-    function burstConfetti(){ spawnConfetti(80) }
-
-    function draw(){
-      ctx.clearRect(0,0,W,H)
-      for(let p of confettiPieces){
-        p.x += p.vx; p.y += p.vy; p.rot += p.vr * 0.02
-        ctx.save(); ctx.translate(p.x,p.y); ctx.rotate(p.rot);
-        ctx.fillStyle = p.color; ctx.fillRect(-p.size/2, -p.size/2, p.size, p.size*0.6);
-        ctx.restore();
-      }
-      confettiPieces = confettiPieces.filter(p => p.y < H + 50)
-      requestAnimationFrame(draw)
-    }
-    draw()
-
-    function shakeScreen(){
-      const el = document.querySelector('.wrap')
-      el.classList.remove('shake'); void el.offsetWidth; el.classList.add('shake')
-    }
-
-    // 시작 UI 세팅
-    updateUI()
-    </script>
+    <script src="{{ asset_url('js/game1.js') }}"></script>
     </body>
     </html>
     """
 
+    # 페이지가 정적이므로 시작할 때 한 번만 렌더링/압축해 둔다
+    INDEX = assets.make_asset('index.html', app.jinja_env.from_string(INDEX_HTML).render().encode('utf-8'))
+
     @app.route('/')
     def index():
-        return render_template_string(INDEX_HTML)
+        # 주소가 그대로이므로 immutable 대신 짧게 캐시하고 ETag 로 확인
+        return manifest.respond(INDEX, 'public, max-age=300, must-revalidate')
 
     if __name__ == '__main__':
         print('Flask 서버 실행 중: http://127.0.0.1:5000')
@@ -1,124 +1,168 @@
-from flask import Flask, request, redirect, session, jsonify, render_template_string
-import sqlite3
+from flask import Flask, request, redirect, session, jsonify
 import os
 import random
 import time
 import json
+from contextlib import contextmanager
+
+import assets
+import db
+import metrics
+import migrations
+import player as player_model
+import profiler
+import ratelimit
+import rules
+from battle_store import create_battle_store
+from leaderboard import Leaderboard
+from monsters import MonsterCatalog
+from player import Player
+from player_cache import PlayerCache
 
 app = Flask(__name__)
 app.secret_key = os.environ.get("SECRET_KEY", "your-super-secret-key-change-in-production")
 
-DB_PATH = "rpg_game.db"
+DB_PATH = os.environ.get("DB_PATH", "rpg_game.db")
+app.config["DATABASE"] = DB_PATH
+db.init_app(app)
+assets.init_app(app)
+if os.environ.get("METRICS", "1") == "1":
+    metrics.init_app(app)
+profiler.init_app(app)
 
-# DB 초기화
+# DB 초기화 (스키마는 migrations.py 에서 버전별로 관리)
 def init_db():
-    if not os.path.exists(DB_PATH):
-        conn = sqlite3.connect(DB_PATH)
-        c = conn.cursor()
-        
-        # 유저 테이블
-        c.execute("""CREATE TABLE users (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        username TEXT UNIQUE,
-                        level INTEGER DEFAULT 1,
-                        exp INTEGER DEFAULT 0,
-                        hp INTEGER DEFAULT 100,
-                        max_hp INTEGER DEFAULT 100,
-                        attack INTEGER DEFAULT 10,
-                        defense INTEGER DEFAULT 5,
-                        money INTEGER DEFAULT 1000,
-                        weapon_level INTEGER DEFAULT 0,
-                        armor_level INTEGER DEFAULT 0,
-                        potions INTEGER DEFAULT 3,
-                        stage INTEGER DEFAULT 1,
-                        last_battle TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )""")
-        
-        # 몬스터 테이블
-        c.execute("""CREATE TABLE monsters (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        name TEXT,
-                        stage INTEGER,
-                        hp INTEGER,
-                        attack INTEGER,
-                        defense INTEGER,
-                        exp_reward INTEGER,
-                        money_reward INTEGER
-                    )""")
-        
-        # 기본 몬스터 데이터 삽입
-        monsters_data = [
-            ("슬라임", 1, 30, 8, 2, 15, 50),
-            ("고블린", 1, 50, 12, 3, 25, 80),
-            ("오크", 2, 80, 18, 5, 40, 120),
-            ("트롤", 2, 120, 25, 8, 60, 200),
-            ("드래곤", 3, 200, 40, 15, 100, 500),
-            ("데몬로드", 3, 300, 60, 20, 150, 800)
-        ]
-        
-        c.executemany("INSERT INTO monsters (name, stage, hp, attack, defense, exp_reward, money_reward) VALUES (?, ?, ?, ?, ?, ?, ?)", monsters_data)
-        
-        conn.commit()
-        conn.close()
+    migrations.migrate(DB_PATH)
 
 init_db()
 
-# 유저 정보 가져오기
-def get_user(username):
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute("SELECT * FROM users WHERE username=?", (username,))
-    user = c.fetchone()
-    conn.close()
-    return user
-
-# 유저 정보 업데이트
-def update_user(username, **kwargs):
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    
-    set_clauses = []
-    values = []
-    
-    for key, value in kwargs.items():
-        if value is not None:
-            set_clauses.append(f"{key}=?")
-            values.append(value)
-    
-    if set_clauses:
-        values.append(username)
-        query = f"UPDATE users SET {', '.join(set_clauses)} WHERE username=?"
-        c.execute(query, values)
-    
-    conn.commit()
-    conn.close()
-
-# 몬스터 정보 가져오기
-def get_monsters_by_stage(stage):
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute("SELECT * FROM monsters WHERE stage=?", (stage,))
-    monsters = c.fetchall()
-    conn.close()
-    return monsters
-
-# 레벨업 체크
-def check_levelup(user_data):
-    level, exp = user_data[2], user_data[3]
-    exp_needed = level * 100
-    
-    if exp >= exp_needed:
-        new_level = level + 1
-        new_exp = exp - exp_needed
-        new_max_hp = user_data[5] + 20
-        new_hp = new_max_hp  # 레벨업 시 체력 회복
-        new_attack = user_data[6] + 5
-        new_defense = user_data[7] + 3
-        
-        update_user(user_data[1], level=new_level, exp=new_exp, hp=new_hp, 
-                   max_hp=new_max_hp, attack=new_attack, defense=new_defense)
-        return True, new_level
-    return False, level
+# 몬스터 도감은 시작할 때 메모리에 올려 둔다
+monster_catalog = MonsterCatalog(DB_PATH)
+monster_catalog.load()
+
+# 진행 중인 전투 상태 저장소 (쿠키에는 battle_id 만).
+# 워커가 여러 개면 gunicorn.conf.py 가 BATTLE_STORE=sqlite 로 바꾼다
+battle_store = create_battle_store(os.environ.get("BATTLE_STORE", "memory"), DB_PATH)
+
+# 리더보드는 스냅샷 테이블에서 메모리로 다시 만들고, 이후에는 바뀔 때마다 갱신
+leaderboard = Leaderboard(DB_PATH, sync_interval=float(os.environ.get("LEADERBOARD_SYNC_INTERVAL", 5.0)))
+leaderboard.load()
+RANKED_FIELDS = frozenset(("stage", "level", "exp"))
+LEADERBOARD_MAX = 100
+ENHANCE_BULK_MAX = 100  # /enhance/bulk 한 번에 시도하는 최대 횟수
+
+# 전투/강화/상점 연타 방지: 플레이어별 토큰 버킷 + 처리 중인 같은 요청 합치기
+rate_limiter = ratelimit.create_rate_limiter(
+    os.environ.get("RATE_LIMIT_BACKEND", "memory"), DB_PATH,
+    rate=float(os.environ.get("RATE_LIMIT_RATE", 10)),
+    burst=float(os.environ.get("RATE_LIMIT_BURST", 20)),
+)
+# /enhance/bulk 의 preview=1 은 아무것도 바꾸지 않으므로 토큰을 쓰지 않는다
+action_guard = ratelimit.protect(rate_limiter, ratelimit.Coalescer(),
+                                 exempt=lambda: request.form.get("preview") == "1")
+
+# 요청마다 읽는 컬럼 (username, version 은 항상 포함)
+PUBLIC_COLUMNS = player_model.columns_for(*player_model.PUBLIC_FIELDS)
+LOGIN_COLUMNS = player_model.columns_for("id")
+START_BATTLE_COLUMNS = player_model.columns_for("hp", "stage")
+BATTLE_COLUMNS = player_model.columns_for("level", "exp", "hp", "max_hp", "attack", "defense",
+                                          "money", "weapon_level", "armor_level", "stage")
+HEAL_COLUMNS = player_model.columns_for("hp", "max_hp", "potions")
+WEAPON_ENHANCE_COLUMNS = player_model.columns_for("money", "weapon_level", "attack")
+ARMOR_ENHANCE_COLUMNS = player_model.columns_for("money", "armor_level", "defense", "max_hp")
+SHOP_COLUMNS = player_model.columns_for("money", "potions")
+ENHANCE_COLUMNS = {"weapon": WEAPON_ENHANCE_COLUMNS, "armor": ARMOR_ENHANCE_COLUMNS}
+VERSION_INDEX = player_model.COLUMNS.index("version")
+
+# PLAYER_CACHE=1 이면 플레이어 상태를 메모리에 두고 주기적으로 기록 (워커 1개일 때만)
+player_cache = None
+if os.environ.get("PLAYER_CACHE") == "1":
+    player_cache = PlayerCache(
+        DB_PATH, player_model.COLUMNS,
+        flush_interval=float(os.environ.get("PLAYER_CACHE_FLUSH_INTERVAL", 1.0)),
+        max_dirty=int(os.environ.get("PLAYER_CACHE_MAX_DIRTY", 100)),
+    )
+
+# 플레이어 읽기 (필요한 컬럼만. 캐시를 쓰면 캐시의 row 전체)
+def get_player(username, columns=player_model.COLUMNS):
+    with metrics.phase("get_player"):
+        if player_cache is not None:
+            row = player_cache.get(username)
+            return None if row is None else Player(player_model.COLUMNS, row)
+        return player_model.load(db.get_db(), username, columns)
+
+# 플레이어에서 바뀐 필드만 기록 (바뀔 때마다 상태 버전 증가)
+def save_player(player):
+    changes = player.changes()
+    if not changes:
+        return
+    
+    if player_cache is not None:
+        with player_cache.lock:
+            changes["version"] = player_cache.get(player.username)[VERSION_INDEX] + 1
+            player_cache.update(player.username, changes)
+        player.mark_saved(changes["version"])
+    else:
+        player_model.save(db.get_db(), player)
+    
+    if not RANKED_FIELDS.isdisjoint(changes):
+        leaderboard.update(player.username, player.stage, player.level, player.exp)
+
+# 한 턴(읽기-수정-쓰기)을 하나의 트랜잭션으로 묶음
+@contextmanager
+def user_turn():
+    if player_cache is not None:
+        with player_cache.lock:
+            yield
+    else:
+        with db.transaction():
+            yield
+
+# 응답용 플레이어 상태
+# 클라이언트가 보낸 since 가 행동 전 버전과 같으면 바뀐 필드만 보내고,
+# 아니면 전체 필드를 다시 읽어서 보낸다 (요청마다 필요한 컬럼만 읽었으므로)
+def serialize_player(player):
+    since = request.form.get("since", type=int)
+    if since is not None and since == player.loaded_version:
+        data = player.public([name for name in player_model.PUBLIC_FIELDS if name in player.changed_fields()])
+        data["version"] = player.version
+        return data
+    
+    player = get_player(player.username, PUBLIC_COLUMNS)
+    data = player.public()
+    data["version"] = player.version
+    return data
+
+# 전투 데미지 계산
+def player_attack_damage(player, monster):
+    return rules.player_damage(player.attack, player.weapon_level, monster["defense"])
+
+def monster_attack_damage(player, monster):
+    return rules.monster_damage(monster["attack"], player.defense, player.armor_level)
+
+# 몬스터 처치 보상을 player 에 반영: (레벨업 여부, 승리 메시지)
+def apply_kill_rewards(player, monster):
+    exp_gained = monster["exp_reward"]
+    money_gained = monster["money_reward"]
+    level_before = player.level
+    
+    player.exp += exp_gained
+    player.money += money_gained
+    
+    # 레벨업 체크
+    level_up, levelup_changes = rules.check_levelup(
+        player.level, player.exp, player.max_hp, player.attack, player.defense)
+    for name, value in levelup_changes.items():
+        setattr(player, name, value)
+    
+    victory_message = f"{monster['name']}을 물리쳤다! 경험치 +{exp_gained}, 골드 +{money_gained}"
+    
+    # 다음 스테이지 체크 (레벨업 이전 레벨 기준)
+    if rules.should_advance_stage(level_before, player.stage):
+        player.stage += 1
+        victory_message += f" | 다음 스테이지 {player.stage}로 이동!"
+    
+    return level_up, victory_message
 
 # HTML 템플릿들
 login_html = """
@@ -128,25 +172,8 @@ login_html = """
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>RPG 게임 - 로그인</title>
-    <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.3.2/dist/css/bootstrap.min.css" rel="stylesheet">
-    <style>
-        body {
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            font-family: 'Arial', sans-serif;
-        }
-        .login-card {
-            background: rgba(255, 255, 255, 0.95);
-            border-radius: 20px;
-            box-shadow: 0 15px 35px rgba(0, 0, 0, 0.1);
-            backdrop-filter: blur(10px);
-        }
-        .title {
-            background: linear-gradient(45deg, #ff6b6b, #4ecdc4);
-            -webkit-background-clip: text;
-            -webkit-text-fill-color: transparent;
-            font-weight: bold;
-        }
-    </style>
+    <link href="{{ asset_url('vendor/bootstrap-5.3.2.min.css') }}" rel="stylesheet">
+    <link href="{{ asset_url('css/login.css') }}" rel="stylesheet">
 </head>
 <body class="d-flex justify-content-center align-items-center vh-100">
     <div class="login-card p-5" style="width: 400px;">
@@ -176,85 +203,11 @@ game_html = """
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>RPG 게임</title>
-    <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.3.2/dist/css/bootstrap.min.css" rel="stylesheet">
-    <script src="https://code.jquery.com/jquery-3.6.4.min.js"></script>
-    <style>
-        body {
-            background: linear-gradient(135deg, #1e3c72 0%, #2a5298 100%);
-            color: white;
-            font-family: 'Arial', sans-serif;
-            min-height: 100vh;
-        }
-        .game-container {
-            background: rgba(255, 255, 255, 0.1);
-            border-radius: 20px;
-            backdrop-filter: blur(10px);
-            box-shadow: 0 15px 35px rgba(0, 0, 0, 0.2);
-        }
-        .stat-card {
-            background: rgba(255, 255, 255, 0.15);
-            border-radius: 15px;
-            border: 1px solid rgba(255, 255, 255, 0.2);
-        }
-        .hp-bar {
-            height: 25px;
-            border-radius: 12px;
-            overflow: hidden;
-            background: rgba(255, 255, 255, 0.2);
-        }
-        .hp-fill {
-            height: 100%;
-            background: linear-gradient(90deg, #ff6b6b, #ee5a24);
-            transition: width 0.5s ease;
-        }
-        .btn-battle {
-            background: linear-gradient(45deg, #ff6b6b, #ee5a24);
-            border: none;
-            font-weight: bold;
-        }
-        .btn-enhance {
-            background: linear-gradient(45deg, #4ecdc4, #44a08d);
-            border: none;
-            font-weight: bold;
-        }
-        .btn-shop {
-            background: linear-gradient(45deg, #f093fb, #f5576c);
-            border: none;
-            font-weight: bold;
-        }
-        .battle-log {
-            background: rgba(0, 0, 0, 0.3);
-            border-radius: 10px;
-            max-height: 300px;
-            overflow-y: auto;
-        }
-        .monster-card {
-            background: rgba(255, 0, 0, 0.1);
-            border: 2px solid rgba(255, 0, 0, 0.3);
-            border-radius: 15px;
-        }
-        .floating-damage {
-            position: absolute;
-            font-size: 24px;
-            font-weight: bold;
-            color: #ff6b6b;
-            pointer-events: none;
-            animation: floatUp 1s ease-out forwards;
-        }
-        @keyframes floatUp {
-            0% { opacity: 1; transform: translateY(0); }
-            100% { opacity: 0; transform: translateY(-50px); }
-        }
-        .level-up {
-            animation: levelUpGlow 2s ease-in-out;
-        }
-        @keyframes levelUpGlow {
-            0%, 100% { box-shadow: 0 0 5px rgba(255, 215, 0, 0.5); }
-            50% { box-shadow: 0 0 30px rgba(255, 215, 0, 0.8); }
-        }
-    </style>
+    <link href="{{ asset_url('vendor/bootstrap-5.3.2.min.css') }}" rel="stylesheet">
+    <script src="{{ asset_url('vendor/jquery-3.6.4.min.js') }}"></script>
+    <link href="{{ asset_url('css/game2.css') }}" rel="stylesheet">
 </head>
-<body class="p-3">
+<body class="p-3" data-version="{{ version }}">
     <div class="container">
         <div class="game-container p-4 mb-4">
             <div class="d-flex justify-content-between align-items-center mb-4">
@@ -316,6 +269,7 @@ game_html = """
                         </div>
                         <div class="battle-buttons">
                             <button id="attack-btn" class="btn btn-danger me-2">⚔️ 공격</button>
+                            <button id="auto-btn" class="btn btn-info me-2">⚡ 자동 전투</button>
                             <button id="escape-btn" class="btn btn-warning">🏃 도망</button>
                         </div>
                     </div>
@@ -353,197 +307,52 @@ game_html = """
                             </button>
                         </div>
                     </div>
+                    <hr>
+                    <div class="input-group mb-2">
+                        <span class="input-group-text">목표 단계 +</span>
+                        <input id="enhance-target" type="number" min="1" class="form-control">
+                    </div>
+                    <div class="row">
+                        <div class="col-6">
+                            <button id="enhance-weapon-bulk" class="btn btn-outline-primary w-100 mb-1">무기 연속 강화</button>
+                            <small id="weapon-preview" class="text-muted"></small>
+                        </div>
+                        <div class="col-6">
+                            <button id="enhance-armor-bulk" class="btn btn-outline-info w-100 mb-1">방어구 연속 강화</button>
+                            <small id="armor-preview" class="text-muted"></small>
+                        </div>
+                    </div>
                 </div>
             </div>
         </div>
     </div>
 
-    <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.3.2/dist/js/bootstrap.bundle.min.js"></script>
-    <script>
-        let currentMonster = null;
-        let battleInProgress = false;
-
-        // 로그 추가 함수
-        function addLog(message, type = 'info') {
-            const logContent = $("#log-content");
-            const timestamp = new Date().toLocaleTimeString();
-            const colorClass = type === 'damage' ? 'text-danger' : type === 'heal' ? 'text-success' : 'text-info';
-            logContent.append(`<div class="${colorClass}">[${timestamp}] ${message}</div>`);
-            logContent.scrollTop(logContent[0].scrollHeight);
-        }
-
-        // 플레이어 상태 업데이트
-        function updatePlayerStats(data) {
-            $("#level").text(data.level);
-            $("#exp").text(data.exp);
-            $("#exp_needed").text(data.level * 100);
-            $("#hp").text(data.hp);
-            $("#max_hp").text(data.max_hp);
-            $("#attack").text(data.attack);
-            $("#defense").text(data.defense);
-            $("#money").text(data.money);
-            $("#weapon_level").text(data.weapon_level);
-            $("#armor_level").text(data.armor_level);
-            $("#potions").text(data.potions);
-            $("#stage").text(data.stage);
-            
-            const hpPercent = (data.hp / data.max_hp) * 100;
-            $("#hp-fill").css("width", hpPercent + "%");
-        }
-
-        // 전투 시작
-        $("#battle-btn").click(function() {
-            if (battleInProgress) return;
-            
-            $.post("/start_battle", {}, function(data) {
-                if (data.status === "ok") {
-                    currentMonster = data.monster;
-                    battleInProgress = true;
-                    
-                    $("#monster-name").text(data.monster.name);
-                    $("#monster-hp").text(data.monster.hp);
-                    $("#monster-max-hp").text(data.monster.hp);
-                    $("#monster-hp-fill").css("width", "100%");
-                    
-                    $("#battle-area").fadeIn();
-                    addLog(`${data.monster.name}이(가) 나타났다!`, 'info');
-                } else {
-                    addLog(data.message, 'damage');
-                }
-            });
-        });
-
-        // 공격
-        $("#attack-btn").click(function() {
-            if (!battleInProgress) return;
-            
-            $.post("/attack", {}, function(data) {
-                if (data.status === "ok") {
-                    // 몬스터 체력 업데이트
-                    const hpPercent = (data.monster_hp / currentMonster.hp) * 100;
-                    $("#monster-hp").text(data.monster_hp);
-                    $("#monster-hp-fill").css("width", hpPercent + "%");
-                    
-                    addLog(data.message, 'damage');
-                    
-                    // 몬스터 죽음 체크
-                    if (data.monster_dead) {
-                        battleInProgress = false;
-                        $("#battle-area").fadeOut();
-                        addLog(data.victory_message, 'heal');
-                        updatePlayerStats(data.player);
-                        
-                        // 레벨업 체크
-                        if (data.level_up) {
-                            $(".stat-card").first().addClass("level-up");
-                            setTimeout(() => $(".stat-card").first().removeClass("level-up"), 2000);
-                            addLog(`레벨업! 레벨 ${data.player.level}이 되었습니다!`, 'heal');
-                        }
-                    } else if (data.player_hp <= 0) {
-                        // 플레이어 죽음
-                        battleInProgress = false;
-                        $("#battle-area").fadeOut();
-                        addLog(data.defeat_message, 'damage');
-                        updatePlayerStats(data.player);
-                    } else {
-                        // 플레이어 상태 업데이트
-                        updatePlayerStats(data.player);
-                    }
-                }
-            });
-        });
-
-        // 도망
-        $("#escape-btn").click(function() {
-            battleInProgress = false;
-            $("#battle-area").fadeOut();
-            addLog("전투에서 도망쳤습니다.", 'info');
-        });
-
-        // 체력 회복
-        $("#heal-btn").click(function() {
-            $.post("/heal", {}, function(data) {
-                addLog(data.message, data.status === 'ok' ? 'heal' : 'damage');
-                if (data.status === 'ok') {
-                    updatePlayerStats(data.player);
-                }
-            });
-        });
-
-        // 강화 모달
-        $("#enhance-btn").click(function() {
-            const weaponCost = ({{ weapon_level }} + 1) * 200;
-            const armorCost = ({{ armor_level }} + 1) * 150;
-            $("#weapon-cost").text(weaponCost);
-            $("#armor-cost").text(armorCost);
-            $("#enhanceModal").modal('show');
-        });
-
-        // 무기 강화
-        $("#enhance-weapon").click(function() {
-            $.post("/enhance", { type: "weapon" }, function(data) {
-                addLog(data.message, data.status === 'ok' ? 'heal' : 'damage');
-                if (data.status === 'ok') {
-                    updatePlayerStats(data.player);
-                    $("#enhanceModal").modal('hide');
-                }
-            });
-        });
-
-        // 방어구 강화
-        $("#enhance-armor").click(function() {
-            $.post("/enhance", { type: "armor" }, function(data) {
-                addLog(data.message, data.status === 'ok' ? 'heal' : 'damage');
-                if (data.status === 'ok') {
-                    updatePlayerStats(data.player);
-                    $("#enhanceModal").modal('hide');
-                }
-            });
-        });
-
-        // 상점 (물약 구매)
-        $("#shop-btn").click(function() {
-            $.post("/shop", { item: "potion" }, function(data) {
-                addLog(data.message, data.status === 'ok' ? 'heal' : 'damage');
-                if (data.status === 'ok') {
-                    updatePlayerStats(data.player);
-                }
-            });
-        });
-    </script>
+    <script src="{{ asset_url('vendor/bootstrap-5.3.2.bundle.min.js') }}"></script>
+    <script src="{{ asset_url('js/game2.js') }}"></script>
 </body>
 </html>
 """
 
+# 템플릿은 import 시 한 번만 컴파일
+LOGIN_TEMPLATE = app.jinja_env.from_string(login_html)
+GAME_TEMPLATE = app.jinja_env.from_string(game_html)
+
 @app.route("/")
 def index():
     if "username" not in session:
         return redirect("/login")
     
-    user = get_user(session["username"])
-    if not user:
+    player = get_player(session["username"], PUBLIC_COLUMNS)
+    if not player:
         return redirect("/login")
     
-    # 사용자 데이터 파싱
-    user_data = {
-        'username': user[1],
-        'level': user[2],
-        'exp': user[3],
-        'hp': user[4],
-        'max_hp': user[5],
-        'attack': user[6],
-        'defense': user[7],
-        'money': user[8],
-        'weapon_level': user[9],
-        'armor_level': user[10],
-        'potions': user[11],
-        'stage': user[12]
-    }
-    
-    user_data['exp_needed'] = user_data['level'] * 100
-    user_data['hp_percent'] = (user_data['hp'] / user_data['max_hp']) * 100
-    
-    return render_template_string(game_html, **user_data)
+    return GAME_TEMPLATE.render(
+        username=player.username,
+        version=player.version,
+        exp_needed=rules.exp_needed(player.level),
+        hp_percent=(player.hp / player.max_hp) * 100,
+        **player.public(),
+    )
 
 @app.route("/login", methods=["GET", "POST"])
 def login():
@@ -553,17 +362,13 @@ def login():
         if not username:
             error_msg = "이름을 입력해주세요."
         else:
-            user = get_user(username)
-            if not user:
-                conn = sqlite3.connect(DB_PATH)
-                c = conn.cursor()
-                c.execute("""INSERT INTO users (username) VALUES (?)""", (username,))
-                conn.commit()
-                conn.close()
+            if not get_player(username, LOGIN_COLUMNS):
+                db.get_db().execute("""INSERT INTO users (username) VALUES (?)""", (username,))
+                leaderboard.update(username, 1, 1, 0)
             session["username"] = username
             return redirect("/")
     
-    return render_template_string(login_html, error=error_msg)
+    return LOGIN_TEMPLATE.render(error=error_msg)
 
 @app.route("/logout")
 def logout():
@@ -575,101 +380,82 @@ def start_battle():
     if "username" not in session:
         return jsonify({"status": "fail", "message": "로그인 필요"})
     
-    user = get_user(session["username"])
-    if user[4] <= 0:  # hp 체크
+    player = get_player(session["username"], START_BATTLE_COLUMNS)
+    if player.hp <= 0:
         return jsonify({"status": "fail", "message": "체력이 부족합니다. 치료를 받으세요!"})
     
-    # 현재 스테이지의 몬스터 가져오기
-    monsters = get_monsters_by_stage(user[12])  # stage
-    if not monsters:
+    # 현재 스테이지의 몬스터 가져오기 (메모리 도감에서)
+    monster = monster_catalog.spawn(player.stage)
+    if monster is None:
         return jsonify({"status": "fail", "message": "이 스테이지에는 몬스터가 없습니다."})
     
-    monster = random.choice(monsters)
-    monster_data = {
-        "id": monster[0],
-        "name": monster[1],
-        "hp": monster[3],
-        "max_hp": monster[3],
-        "attack": monster[4],
-        "defense": monster[5],
-        "exp_reward": monster[6],
-        "money_reward": monster[7]
-    }
-    
-    # 세션에 현재 몬스터 정보 저장
-    session["current_monster"] = monster_data
+    monster_data = monster.to_battle()
+    
+    # 전투 상태는 서버에 저장하고 세션에는 battle_id 만 저장
+    if "battle_id" in session:
+        battle_store.delete(session["battle_id"])
+    session["battle_id"] = battle_store.create(session["username"], monster_data)
     
     return jsonify({"status": "ok", "monster": monster_data})
 
 @app.route("/attack", methods=["POST"])
+@action_guard
 def attack():
-    if "username" not in session or "current_monster" not in session:
+    if "username" not in session or "battle_id" not in session:
         return jsonify({"status": "fail", "message": "전투 중이 아닙니다."})
     
-    user = get_user(session["username"])
-    monster = session["current_monster"]
-    
-    # 플레이어 공격
-    player_damage = max(1, (user[6] + user[9] * 10) - monster["defense"])  # attack + weapon_level * 10
-    monster["hp"] -= player_damage
-    
-    message = f"플레이어가 {monster['name']}에게 {player_damage} 데미지!"
+    username = session["username"]
+    battle_id = session["battle_id"]
     
-    monster_dead = False
-    level_up = False
-    
-    if monster["hp"] <= 0:
-        # 몬스터 죽음
-        monster_dead = True
-        exp_gained = monster["exp_reward"]
-        money_gained = monster["money_reward"]
-        
-        new_exp = user[3] + exp_gained
-        new_money = user[8] + money_gained
+    # 전투 읽기부터 기록까지 한 턴 안에서 (동시에 온 공격이 같은 몬스터 체력을 읽지 않도록)
+    with user_turn():
+        monster = battle_store.get(battle_id, username)
+        if monster is None:
+            session.pop("battle_id", None)
+            return jsonify({"status": "fail", "message": "전투 중이 아닙니다."})
         
-        update_user(session["username"], exp=new_exp, money=new_money)
+        player = get_player(username, BATTLE_COLUMNS)
         
-        # 레벨업 체크
-        user = get_user(session["username"])
-        level_up, new_level = check_levelup(user)
+        # 플레이어 공격
+        player_damage = player_attack_damage(player, monster)
+        monster["hp"] -= player_damage
         
-        victory_message = f"{monster['name']}을 물리쳤다! 경험치 +{exp_gained}, 골드 +{money_gained}"
+        message = f"플레이어가 {monster['name']}에게 {player_damage} 데미지!"
         
-        # 다음 스테이지 체크
-        if user[2] >= user[12] * 2:  # level >= stage * 2
-            new_stage = user[12] + 1
-            update_user(session["username"], stage=new_stage)
-            victory_message += f" | 다음 스테이지 {new_stage}로 이동!"
+        if monster["hp"] <= 0:
+            # 전투를 실제로 지운 요청만 보상을 받는다
+            session.pop("battle_id", None)
+            if not battle_store.delete(battle_id):
+                return jsonify({"status": "fail", "message": "전투 중이 아닙니다."})
+            
+            # 몬스터 죽음: 보상, 레벨업, 스테이지 이동을 메모리에서 계산 후 한 번에 기록
+            level_up, victory_message = apply_kill_rewards(player, monster)
+            save_player(player)
+            
+            return jsonify({
+                "status": "ok",
+                "message": message,
+                "monster_dead": True,
+                "victory_message": victory_message,
+                "level_up": level_up,
+                "monster_hp": 0,
+                "player": serialize_player(player)
+            })
         
-        session.pop("current_monster", None)
-        user = get_user(session["username"])
+        # 몬스터 반격
+        monster_damage = monster_attack_damage(player, monster)
+        player.hp = max(0, player.hp - monster_damage)
+        save_player(player)
         
-        return jsonify({
-            "status": "ok",
-            "message": message,
-            "monster_dead": True,
-            "victory_message": victory_message,
-            "level_up": level_up,
-            "monster_hp": 0,
-            "player": {
-                "level": user[2], "exp": user[3], "hp": user[4], "max_hp": user[5],
-                "attack": user[6], "defense": user[7], "money": user[8],
-                "weapon_level": user[9], "armor_level": user[10], "potions": user[11], "stage": user[12]
-            }
-        })
-    
-    # 몬스터 반격
-    monster_damage = max(1, monster["attack"] - (user[7] + user[10] * 5))  # defense + armor_level * 5
-    new_hp = max(0, user[4] - monster_damage)
-    update_user(session["username"], hp=new_hp)
+        if player.hp <= 0:
+            battle_store.delete(battle_id)
+            session.pop("battle_id", None)
+        else:
+            battle_store.save(battle_id, username, monster)
     
     message += f" | {monster['name']}이 {monster_damage} 데미지로 반격!"
     
-    session["current_monster"] = monster
-    user = get_user(session["username"])
-    
-    if user[4] <= 0:
-        session.pop("current_monster", None)
+    if player.hp <= 0:
         return jsonify({
             "status": "ok",
             "message": message,
@@ -677,11 +463,7 @@ def attack():
             "defeat_message": "당신은 쓰러졌습니다... 체력을 회복하세요!",
             "monster_hp": monster["hp"],
             "player_hp": 0,
-            "player": {
-                "level": user[2], "exp": user[3], "hp": user[4], "max_hp": user[5],
-                "attack": user[6], "defense": user[7], "money": user[8],
-                "weapon_level": user[9], "armor_level": user[10], "potions": user[11], "stage": user[12]
-            }
+            "player": serialize_player(player)
         })
     
     return jsonify({
@@ -689,144 +471,270 @@ def attack():
         "message": message,
         "monster_dead": False,
         "monster_hp": monster["hp"],
-        "player": {
-            "level": user[2], "exp": user[3], "hp": user[4], "max_hp": user[5],
-            "attack": user[6], "defense": user[7], "money": user[8],
-            "weapon_level": user[9], "armor_level": user[10], "potions": user[11], "stage": user[12]
-        }
+        "player": serialize_player(player)
     })
 
+# 자동 전투: 현재 몬스터와의 전투를 서버에서 끝까지 진행하고 한 번만 기록
+AUTO_BATTLE_MAX_TURNS = 500
+
+@app.route("/battle/auto", methods=["POST"])
+@action_guard
+def auto_battle():
+    if "username" not in session or "battle_id" not in session:
+        return jsonify({"status": "fail", "message": "전투 중이 아닙니다."})
+    
+    username = session["username"]
+    battle_id = session["battle_id"]
+    
+    # 전투 읽기, 진행, 정산을 한 턴 안에서 (/attack 이나 다른 자동 전투와 겹치지 않도록)
+    with user_turn():
+        monster = battle_store.get(battle_id, username)
+        if monster is None:
+            session.pop("battle_id", None)
+            return jsonify({"status": "fail", "message": "전투 중이 아닙니다."})
+        
+        player = get_player(username, BATTLE_COLUMNS)
+        
+        # 턴 기록: [플레이어가 준 데미지, 몬스터가 준 데미지]
+        hp = player.hp
+        turns = []
+        result = "ongoing"
+        while len(turns) < AUTO_BATTLE_MAX_TURNS:
+            dealt = player_attack_damage(player, monster)
+            monster["hp"] -= dealt
+            if monster["hp"] <= 0:
+                turns.append([dealt, 0])
+                result = "victory"
+                break
+            
+            taken = monster_attack_damage(player, monster)
+            hp = max(0, hp - taken)
+            turns.append([dealt, taken])
+            if hp <= 0:
+                result = "defeat"
+                break
+        
+        response = {"status": "ok", "result": result, "turns": turns, "level_up": False}
+        
+        if result == "ongoing":
+            battle_store.save(battle_id, username, monster)
+        else:
+            # 전투를 실제로 지운 요청만 결과를 정산한다
+            session.pop("battle_id", None)
+            if not battle_store.delete(battle_id):
+                return jsonify({"status": "fail", "message": "전투 중이 아닙니다."})
+        
+        player.hp = hp
+        if result == "victory":
+            level_up, victory_message = apply_kill_rewards(player, monster)
+            response.update(level_up=level_up, victory_message=victory_message)
+        elif result == "defeat":
+            response["defeat_message"] = "당신은 쓰러졌습니다... 체력을 회복하세요!"
+        
+        save_player(player)
+    
+    response["monster_hp"] = max(0, monster["hp"])
+    response["player"] = serialize_player(player)
+    return jsonify(response)
+
 @app.route("/heal", methods=["POST"])
 def heal():
     if "username" not in session:
         return jsonify({"status": "fail", "message": "로그인 필요"})
     
-    user = get_user(session["username"])
-    
-    if user[11] <= 0:  # potions
-        return jsonify({"status": "fail", "message": "체력 물약이 없습니다!"})
-    
-    if user[4] >= user[5]:  # hp >= max_hp
-        return jsonify({"status": "fail", "message": "체력이 이미 가득합니다!"})
-    
-    heal_amount = min(50, user[5] - user[4])  # 최대 50 회복, max_hp 초과 불가
-    new_hp = user[4] + heal_amount
-    new_potions = user[11] - 1
-    
-    update_user(session["username"], hp=new_hp, potions=new_potions)
-    user = get_user(session["username"])
+    with user_turn():
+        player = get_player(session["username"], HEAL_COLUMNS)
+        
+        if player.potions <= 0:
+            return jsonify({"status": "fail", "message": "체력 물약이 없습니다!"})
+        
+        if player.hp >= player.max_hp:
+            return jsonify({"status": "fail", "message": "체력이 이미 가득합니다!"})
+        
+        heal_amount = rules.heal_amount(player.hp, player.max_hp)  # 최대 50 회복, max_hp 초과 불가
+        player.hp += heal_amount
+        player.potions -= 1
+        save_player(player)
     
     return jsonify({
         "status": "ok",
         "message": f"체력 물약을 사용했습니다! 체력 +{heal_amount}",
-        "player": {
-            "level": user[2], "exp": user[3], "hp": user[4], "max_hp": user[5],
-            "attack": user[6], "defense": user[7], "money": user[8],
-            "weapon_level": user[9], "armor_level": user[10], "potions": user[11], "stage": user[12]
-        }
+        "player": serialize_player(player)
     })
 
+# 강화 1회: 비용을 내고, 성공하면 단계와 능력치가 오른다 (골드 확인은 호출하는 쪽에서)
+def enhance_level(player, kind):
+    return player.weapon_level if kind == "weapon" else player.armor_level
+
+def try_enhance(player, kind):
+    level = enhance_level(player, kind)
+    player.money -= rules.enhance_cost(kind, level)
+    if random.random() >= rules.enhance_success_rate(level):  # 강화 단계가 높을수록 성공률 감소
+        return False
+    
+    if kind == "weapon":
+        player.weapon_level += 1
+        player.attack += rules.WEAPON_ENHANCE_ATTACK  # 공격력 증가
+    else:
+        player.armor_level += 1
+        player.defense += rules.ARMOR_ENHANCE_DEFENSE  # 방어력 증가
+        player.max_hp += rules.ARMOR_ENHANCE_MAX_HP  # 최대 체력 증가
+    return True
+
 @app.route("/enhance", methods=["POST"])
+@action_guard
 def enhance():
     if "username" not in session:
         return jsonify({"status": "fail", "message": "로그인 필요"})
     
     enhance_type = request.form.get("type")
-    user = get_user(session["username"])
+    if enhance_type not in ENHANCE_COLUMNS:
+        return jsonify({"status": "fail", "message": "잘못된 강화 타입입니다."})
     
-    if enhance_type == "weapon":
-        current_level = user[9]  # weapon_level
-        cost = (current_level + 1) * 200
-        success_rate = max(0.3, 0.9 - (current_level * 0.1))  # 강화 단계가 높을수록 성공률 감소
+    with user_turn():
+        player = get_player(session["username"], ENHANCE_COLUMNS[enhance_type])
+        cost = rules.enhance_cost(enhance_type, enhance_level(player, enhance_type))
         
-        if user[8] < cost:  # money
+        if player.money < cost:
             return jsonify({"status": "fail", "message": f"골드가 부족합니다! ({cost}G 필요)"})
         
-        new_money = user[8] - cost
-        
-        if random.random() < success_rate:
-            # 성공
-            new_weapon_level = current_level + 1
-            new_attack = user[6] + 10  # 공격력 증가
-            update_user(session["username"], money=new_money, weapon_level=new_weapon_level, attack=new_attack)
-            message = f"무기 강화 성공! +{new_weapon_level} 강화 완료! 공격력이 증가했습니다!"
+        success = try_enhance(player, enhance_type)
+        save_player(player)
+    
+    if enhance_type == "weapon":
+        if success:
+            message = f"무기 강화 성공! +{player.weapon_level} 강화 완료! 공격력이 증가했습니다!"
         else:
-            # 실패
-            update_user(session["username"], money=new_money)
             message = f"무기 강화 실패... 골드 {cost}G를 잃었습니다."
-    
-    elif enhance_type == "armor":
-        current_level = user[10]  # armor_level
-        cost = (current_level + 1) * 150
-        success_rate = max(0.3, 0.9 - (current_level * 0.1))
-        
-        if user[8] < cost:  # money
-            return jsonify({"status": "fail", "message": f"골드가 부족합니다! ({cost}G 필요)"})
-        
-        new_money = user[8] - cost
-        
-        if random.random() < success_rate:
-            # 성공
-            new_armor_level = current_level + 1
-            new_defense = user[7] + 5  # 방어력 증가
-            new_max_hp = user[5] + 10  # 최대 체력 증가
-            update_user(session["username"], money=new_money, armor_level=new_armor_level, 
-                       defense=new_defense, max_hp=new_max_hp)
-            message = f"방어구 강화 성공! +{new_armor_level} 강화 완료! 방어력과 체력이 증가했습니다!"
+    else:
+        if success:
+            message = f"방어구 강화 성공! +{player.armor_level} 강화 완료! 방어력과 체력이 증가했습니다!"
         else:
-            # 실패
-            update_user(session["username"], money=new_money)
             message = f"방어구 강화 실패... 골드 {cost}G를 잃었습니다."
     
-    else:
+    return jsonify({
+        "status": "ok",
+        "message": message,
+        "player": serialize_player(player)
+    })
+
+# 연속 강화: count 번까지, target_level 에 도달하거나 골드(또는 gold_limit)가 부족할 때까지
+# 한 트랜잭션에서 시도한다. preview=1 이면 강화하지 않고 목표까지의 기대 시도/골드만 돌려준다
+@app.route("/enhance/bulk", methods=["POST"])
+@action_guard
+def enhance_bulk():
+    if "username" not in session:
+        return jsonify({"status": "fail", "message": "로그인 필요"})
+    
+    enhance_type = request.form.get("type")
+    if enhance_type not in ENHANCE_COLUMNS:
         return jsonify({"status": "fail", "message": "잘못된 강화 타입입니다."})
     
-    user = get_user(session["username"])
+    count = max(1, min(ENHANCE_BULK_MAX, request.form.get("count", ENHANCE_BULK_MAX, type=int)))
+    target_level = request.form.get("target_level", type=int)
+    gold_limit = request.form.get("gold_limit", type=int)
+    name = "무기" if enhance_type == "weapon" else "방어구"
+    
+    if request.form.get("preview") == "1":
+        player = get_player(session["username"], ENHANCE_COLUMNS[enhance_type])
+        level = enhance_level(player, enhance_type)
+        if target_level is None:
+            target_level = level + 1
+        if not level <= target_level <= rules.ENHANCE_MAX_LEVEL:
+            return jsonify({"status": "fail", "message": "잘못된 목표 단계입니다."})
+        
+        attempts, gold = rules.enhance_expected(enhance_type, level, target_level)
+        return jsonify({
+            "status": "ok",
+            "message": f"{name} +{level} → +{target_level}: 평균 {attempts:.1f}회, {gold:,.0f}G 예상",
+            "type": enhance_type,
+            "level": level,
+            "target_level": target_level,
+            "expected_attempts": round(attempts, 2),
+            "expected_gold": round(gold),
+            "money": player.money,
+        })
+    
+    with user_turn():
+        player = get_player(session["username"], ENHANCE_COLUMNS[enhance_type])
+        start_level = enhance_level(player, enhance_type)
+        attempts = successes = spent = 0
+        stopped = "count"
+        
+        while attempts < count:
+            level = enhance_level(player, enhance_type)
+            if target_level is not None and level >= target_level:
+                stopped = "target"
+                break
+            cost = rules.enhance_cost(enhance_type, level)
+            if player.money < cost:
+                stopped = "gold"
+                break
+            if gold_limit is not None and spent + cost > gold_limit:
+                stopped = "gold_limit"
+                break
+            
+            successes += try_enhance(player, enhance_type)
+            attempts += 1
+            spent += cost
+        
+        save_player(player)
     
+    if attempts == 0:
+        if stopped == "target":
+            message = f"이미 {name} +{start_level} 입니다."
+        else:
+            message = f"골드가 부족합니다! ({rules.enhance_cost(enhance_type, start_level)}G 필요)"
+        return jsonify({"status": "fail", "message": message, "stopped": stopped})
+    
+    end_level = enhance_level(player, enhance_type)
     return jsonify({
         "status": "ok",
-        "message": message,
-        "player": {
-            "level": user[2], "exp": user[3], "hp": user[4], "max_hp": user[5],
-            "attack": user[6], "defense": user[7], "money": user[8],
-            "weapon_level": user[9], "armor_level": user[10], "potions": user[11], "stage": user[12]
-        }
+        "message": f"{name} 강화 {attempts}회 (성공 {successes}회): +{start_level} → +{end_level}, 골드 {spent}G 사용",
+        "attempts": attempts,
+        "successes": successes,
+        "spent": spent,
+        "stopped": stopped,
+        "player": serialize_player(player)
     })
 
 @app.route("/shop", methods=["POST"])
+@action_guard
 def shop():
     if "username" not in session:
         return jsonify({"status": "fail", "message": "로그인 필요"})
     
     item = request.form.get("item")
-    user = get_user(session["username"])
     
     if item == "potion":
-        cost = 100
-        if user[8] < cost:  # money
-            return jsonify({"status": "fail", "message": f"골드가 부족합니다! ({cost}G 필요)"})
-        
-        new_money = user[8] - cost
-        new_potions = user[11] + 1
-        
-        update_user(session["username"], money=new_money, potions=new_potions)
+        with user_turn():
+            player = get_player(session["username"], SHOP_COLUMNS)
+            cost = rules.POTION_COST
+            if player.money < cost:
+                return jsonify({"status": "fail", "message": f"골드가 부족합니다! ({cost}G 필요)"})
+            
+            player.money -= cost
+            player.potions += 1
+            save_player(player)
         message = f"체력 물약을 구매했습니다! (-{cost}G)"
     
     else:
         return jsonify({"status": "fail", "message": "해당 아이템을 찾을 수 없습니다."})
     
-    user = get_user(session["username"])
-    
     return jsonify({
         "status": "ok",
         "message": message,
-        "player": {
-            "level": user[2], "exp": user[3], "hp": user[4], "max_hp": user[5],
-            "attack": user[6], "defense": user[7], "money": user[8],
-            "weapon_level": user[9], "armor_level": user[10], "potions": user[11], "stage": user[12]
-        }
+        "player": serialize_player(player)
     })
 
+@app.route("/leaderboard")
+def leaderboard_view():
+    limit = max(1, min(LEADERBOARD_MAX, request.args.get("limit", 10, type=int)))
+    response = {"status": "ok", "total": len(leaderboard), "top": leaderboard.top(limit)}
+    if "username" in session:
+        response["me"] = leaderboard.rank(session["username"])
+    return jsonify(response)
+
 # Gunicorn용 WSGI 설정
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 5000))
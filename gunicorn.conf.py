@@ -1,7 +1,81 @@
 import os
+import sys
+import tempfile
 
 bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
 workers = int(os.environ.get('WEB_CONCURRENCY', 1))
 threads = int(os.environ.get('PYTHON_MAX_THREADS', 1))
-worker_class = "sync"
 timeout = 30
+
+# GUNICORN_AUTOTUNE=1: CPU 수와 SQLite 비율 측정값으로 워커/스레드 수 결정 (tuning.py)
+# WEB_CONCURRENCY / PYTHON_MAX_THREADS 를 직접 주면 그 값이 우선한다
+if os.environ.get('GUNICORN_AUTOTUNE') == '1':
+    import tuning
+
+    share = os.environ.get('AUTOTUNE_SQL_SHARE')  # 측정 생략하고 비율 지정
+    share = float(share) if share is not None else tuning.probe_sql_share()
+    auto_workers, auto_threads = tuning.topology(os.cpu_count(), share or 0.0)
+
+    # PLAYER_CACHE=1 이면 기본 워커 수는 1 (WEB_CONCURRENCY 로 늘리면 아래에서 거부)
+    if os.environ.get('PLAYER_CACHE') == '1':
+        auto_workers = 1
+
+    workers = int(os.environ.get('WEB_CONCURRENCY', auto_workers))
+    threads = int(os.environ.get('PYTHON_MAX_THREADS', auto_threads))
+
+    # init_db() / 템플릿 컴파일 / 정적 파일 압축을 fork 전에 한 번만
+    preload_app = True
+    # 메모리 누수 대비 워커 재시작 (동시에 재시작되지 않도록 jitter)
+    max_requests = int(os.environ.get('MAX_REQUESTS', 5000))
+    max_requests_jitter = int(os.environ.get('MAX_REQUESTS_JITTER', 500))
+    print(f"[autotune] sql_share={share} workers={workers} threads={threads}", file=sys.stderr)
+
+# write-behind 캐시는 워커 하나에서만 안전하다 (player_cache.py).
+# 워커마다 따로 캐시하면 서로의 변경을 덮어써서 잃는다
+if workers > 1 and os.environ.get('PLAYER_CACHE') == '1':
+    sys.exit(f"PLAYER_CACHE=1 은 워커가 하나일 때만 쓸 수 있습니다 (workers={workers})")
+
+# 전투 상태 기본값(BATTLE_STORE=memory)은 워커 메모리라서 워커가 여럿이면
+# 다른 워커로 간 /attack 이 전투를 못 찾는다 -> SQLite 로 공유 (battle_store.py)
+if workers > 1:
+    if os.environ.get('BATTLE_STORE') == 'memory':
+        sys.exit(f"BATTLE_STORE=memory 는 워커가 하나일 때만 쓸 수 있습니다 (workers={workers})")
+    os.environ['BATTLE_STORE'] = 'sqlite'
+
+# SERVER_MODE=asgi 이면 uvicorn 워커로 asgi.py 를 띄운다 (느린 연결이 많을 때)
+if os.environ.get('SERVER_MODE') == 'asgi':
+    worker_class = "uvicorn.workers.UvicornWorker"
+    wsgi_app = "asgi:application"
+else:
+    worker_class = "sync"
+    wsgi_app = "game2:application"
+
+# 워커들이 /metrics 값을 모으는 디렉터리 (metrics.py)
+if 'METRICS_DIR' not in os.environ:
+    os.environ['METRICS_DIR'] = tempfile.mkdtemp(prefix='game2-metrics-')
+
+
+def post_worker_init(worker):
+    # kill -USR2 <워커 pid> 로 샘플링 프로파일러 시작 (profiler.py)
+    import profiler
+    profiler.install_signal_handler()
+
+
+def worker_exit(server, worker):
+    # write-behind 캐시에 남은 플레이어 상태를 종료 전에 기록
+    game2 = sys.modules.get("game2")
+    if game2 is not None and game2.player_cache is not None:
+        game2.player_cache.close()
+    # 리더보드에서 아직 스냅샷에 안 쓴 변경 기록
+    if game2 is not None:
+        game2.leaderboard.close()
+    # 종료 직전까지의 계측 값 기록
+    metrics = sys.modules.get("metrics")
+    if metrics is not None:
+        metrics.flush()
+
+
+def child_exit(server, worker):
+    # (마스터에서) 끝난 워커의 계측 파일을 합계에 더하고 지운다. 강제 종료된 워커도 포함
+    import metrics
+    metrics.retire(worker.pid)
@@ -0,0 +1,271 @@
+"""
+리더보드 (스테이지 > 레벨 > 경험치 순)
+
+순위는 메모리의 인덱스 스킵 리스트로 관리한다. 각 링크가 건너뛰는 원소 수(span)를
+들고 있어서 삽입/삭제/내 순위 조회가 O(log n), 상위 N 명은 O(log n + N) 이다.
+요청마다 users 를 ORDER BY 할 필요가 없다.
+
+플레이어의 stage/level/exp 가 바뀌면 save_player() 가 update() 를 호출한다.
+바뀐 항목은 leaderboard 테이블(스냅샷)에 주기적으로 모아서 기록하고,
+같은 주기에 다른 워커가 기록한 항목도 읽어 온다. 시작할 때는 스냅샷에서 다시 만든다.
+
+어디까지 읽었는지는 시계가 아니라 seq 로 센다. 기록할 때 BEGIN IMMEDIATE 안에서
+max(seq) + 1 을 붙이므로 seq 는 커밋 순서대로 늘어나고, 락을 오래 기다린 워커가
+예전 시각으로 늦게 커밋해서 다른 워커가 그 행을 건너뛰는 일이 없다.
+"""
+
+import atexit
+import os
+import random
+import threading
+import time
+
+import db
+
+MAX_LEVEL = 32
+P = 0.25
+
+
+class _Node:
+    __slots__ = ("key", "next", "span")
+
+    def __init__(self, key, level):
+        self.key = key
+        self.next = [None] * level
+        self.span = [0] * level  # next[i] 까지 건너뛰는 원소 수
+
+
+class IndexableSkipList:
+    """정렬된 고유 키 목록. 위치(0부터)로 접근 가능"""
+
+    def __init__(self, rng=None):
+        self.head = _Node(None, MAX_LEVEL)
+        self.level = 1
+        self.size = 0
+        self.rng = rng or random.Random()
+
+    def __len__(self):
+        return self.size
+
+    def _random_level(self):
+        level = 1
+        while level < MAX_LEVEL and self.rng.random() < P:
+            level += 1
+        return level
+
+    def insert(self, key):
+        update = [None] * MAX_LEVEL
+        rank = [0] * MAX_LEVEL
+        node = self.head
+        for i in range(self.level - 1, -1, -1):
+            rank[i] = rank[i + 1] if i + 1 < self.level else 0
+            while node.next[i] is not None and node.next[i].key < key:
+                rank[i] += node.span[i]
+                node = node.next[i]
+            update[i] = node
+
+        level = self._random_level()
+        if level > self.level:
+            for i in range(self.level, level):
+                rank[i] = 0
+                update[i] = self.head
+                update[i].span[i] = self.size
+            self.level = level
+
+        new = _Node(key, level)
+        for i in range(level):
+            new.next[i] = update[i].next[i]
+            update[i].next[i] = new
+            new.span[i] = update[i].span[i] - (rank[0] - rank[i])
+            update[i].span[i] = rank[0] - rank[i] + 1
+        for i in range(level, self.level):
+            update[i].span[i] += 1
+        self.size += 1
+
+    def remove(self, key):
+        update = [None] * MAX_LEVEL
+        node = self.head
+        for i in range(self.level - 1, -1, -1):
+            while node.next[i] is not None and node.next[i].key < key:
+                node = node.next[i]
+            update[i] = node
+
+        target = node.next[0]
+        if target is None or target.key != key:
+            raise KeyError(key)
+        for i in range(self.level):
+            if update[i].next[i] is target:
+                update[i].span[i] += target.span[i] - 1
+                update[i].next[i] = target.next[i]
+            else:
+                update[i].span[i] -= 1
+        while self.level > 1 and self.head.next[self.level - 1] is None:
+            self.level -= 1
+        self.size -= 1
+
+    def index(self, key):
+        """key 의 위치 (0부터)"""
+        position = 0
+        node = self.head
+        for i in range(self.level - 1, -1, -1):
+            while node.next[i] is not None and node.next[i].key <= key:
+                position += node.span[i]
+                node = node.next[i]
+            if node.key == key:
+                return position - 1
+        raise KeyError(key)
+
+    def slice(self, start, count):
+        """start 위치부터 최대 count 개"""
+        if start >= self.size or count <= 0:
+            return []
+        # start 번째 원소까지 span 으로 건너뛴 뒤 맨 아래 단계를 따라간다
+        traversed = 0
+        node = self.head
+        for i in range(self.level - 1, -1, -1):
+            while node.next[i] is not None and traversed + node.span[i] <= start + 1:
+                traversed += node.span[i]
+                node = node.next[i]
+        keys = []
+        while node is not None and len(keys) < count:
+            keys.append(node.key)
+            node = node.next[0]
+        return keys
+
+
+def _sort_key(username, stage, level, exp):
+    # 오름차순 정렬이 곧 순위 (동점이면 이름순)
+    return (-stage, -level, -exp, username)
+
+
+def _entry(rank, key):
+    return {"rank": rank, "username": key[3], "stage": -key[0], "level": -key[1], "exp": -key[2]}
+
+
+class Leaderboard:
+    def __init__(self, path, sync_interval=5.0):
+        self.path = path
+        self.sync_interval = sync_interval
+        self.lock = threading.Lock()
+        self._list = IndexableSkipList()
+        self._keys = {}        # username -> 정렬 키
+        self._dirty = set()
+        self._last_seq = 0     # 마지막으로 읽어 온 스냅샷의 seq
+
+        self._stopped = threading.Event()
+        self._thread = None
+        self._pid = None
+
+    def load(self):
+        """스냅샷 테이블에서 전체를 다시 만든다"""
+        # import 시점(preload, post_worker_init 전)에 불리므로 스레드 커넥션을 만들어 두지 않고
+        # 따로 열었다 닫는다 (나중에 바꿔 끼운 db.connection_factory 가 요청 커넥션에 적용되도록)
+        conn = db.connect(self.path)
+        try:
+            rows = conn.execute("SELECT username, stage, level, exp, seq FROM leaderboard").fetchall()
+        finally:
+            conn.close()
+        with self.lock:
+            self._list = IndexableSkipList()
+            self._keys = {}
+            for username, stage, level, exp, seq in rows:
+                self._set(username, stage, level, exp)
+                self._last_seq = max(self._last_seq, seq)
+
+    def _set(self, username, stage, level, exp):
+        key = _sort_key(username, stage, level, exp)
+        old = self._keys.get(username)
+        if old == key:
+            return False
+        if old is not None:
+            self._list.remove(old)
+        self._list.insert(key)
+        self._keys[username] = key
+        return True
+
+    def update(self, username, stage, level, exp):
+        self._ensure_thread()
+        with self.lock:
+            if self._set(username, stage, level, exp):
+                self._dirty.add(username)
+
+    def top(self, n):
+        self._ensure_thread()
+        with self.lock:
+            return [_entry(i + 1, key) for i, key in enumerate(self._list.slice(0, n))]
+
+    def rank(self, username):
+        """내 순위 항목 (없으면 None)"""
+        self._ensure_thread()
+        with self.lock:
+            key = self._keys.get(username)
+            if key is None:
+                return None
+            return _entry(self._list.index(key) + 1, key)
+
+    def __len__(self):
+        return len(self._list)
+
+    def sync(self):
+        """바뀐 항목을 스냅샷에 기록하고, 다른 워커가 기록한 항목을 읽어 온다"""
+        with self.lock:
+            params = [(name, -key[0], -key[1], -key[2]) for name, key in
+                      ((name, self._keys[name]) for name in self._dirty)]
+            self._dirty.clear()
+            since = self._last_seq
+
+        try:
+            if params:
+                with db.transaction(self.path) as conn:
+                    # 쓰기 락을 잡은 뒤에 번호를 정한다 (커밋 순서 = seq 순서)
+                    (seq,), = conn.execute("SELECT coalesce(max(seq), 0) + 1 FROM leaderboard").fetchall()
+                    now = time.time()
+                    conn.executemany(
+                        "INSERT INTO leaderboard (username, stage, level, exp, updated_at, seq) "
+                        "VALUES (?, ?, ?, ?, ?, ?) "
+                        "ON CONFLICT(username) DO UPDATE SET stage=excluded.stage, level=excluded.level, "
+                        "exp=excluded.exp, updated_at=excluded.updated_at, seq=excluded.seq",
+                        [p + (now, seq) for p in params])
+        except Exception:
+            with self.lock:
+                self._dirty.update(p[0] for p in params)
+            raise
+
+        rows = db.get_db(self.path).execute(
+            "SELECT username, stage, level, exp, seq FROM leaderboard WHERE seq > ?",
+            (since,)).fetchall()
+
+        with self.lock:
+            for username, stage, level, exp, seq in rows:
+                if username not in self._dirty:  # 그 사이 이 워커에서 바뀐 항목은 덮어쓰지 않는다
+                    self._set(username, stage, level, exp)
+                self._last_seq = max(self._last_seq, seq)
+        return len(params)
+
+    def close(self):
+        """동기화 스레드를 멈추고 남은 변경을 기록 (worker_exit 에서 불렀으면 atexit 에서는 다시 안 한다)"""
+        atexit.unregister(self.close)
+        self._stopped.set()
+        if self._thread is not None and self._thread.is_alive():
+            self._thread.join(timeout=5)
+        self.sync()
+
+    def _ensure_thread(self):
+        # fork 이후 자식 프로세스에서 처음 쓸 때 동기화 스레드 시작
+        if self._pid == os.getpid():
+            return
+        with self.lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="leaderboard-sync", daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+
+    def _run(self):
+        while not self._stopped.wait(self.sync_interval):
+            try:
+                self.sync()
+            except Exception as e:
+                print(f"리더보드 동기화 오류: {e}")
@@ -0,0 +1,364 @@
+"""
+요청 계측과 /metrics (Prometheus 텍스트 형식)
+
+- 라우트별 응답 시간 히스토그램, 응답 크기, 세션 쿠키 크기
+- SQL 문장 수/시간 (db.connection_factory 를 계측용 커넥션으로 바꿔 끼운다)
+- 요청 안의 구간 시간: 뷰 함수, get_player, JSON 직렬화, 세션 쿠키 서명
+
+값은 프로세스마다 메모리에 모아 두었다가 METRICS_DIR 아래 <pid>.json 으로
+주기적으로(METRICS_FLUSH_INTERVAL 초) 쓴다. /metrics 는 그 디렉터리의 파일을
+모두 합쳐서 보여 주므로 gunicorn 워커가 여럿이어도 전체 값이 나온다.
+(다른 워커의 값은 최대 METRICS_FLUSH_INTERVAL 초 늦게 반영된다)
+METRICS_DIR 이 없으면 현재 프로세스 값만 보여 준다.
+
+워커가 끝나면 gunicorn 마스터(child_exit)가 그 워커의 <pid>.json 을 retired.json 에
+더하고 지운다. 그래서 max_requests 로 워커가 계속 바뀌어도 파일이 쌓이지 않고,
+같은 pid 를 받은 새 워커가 끝난 워커의 값을 덮어쓰지도 않는다.
+/metrics 도 이미 죽은 pid 의 파일(마스터 없이 돌 때 등)을 같은 방식으로 정리한다.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl  # 파일 잠금 (gunicorn 과 마찬가지로 Unix 전용)
+except ImportError:
+    fcntl = None
+
+from flask import Response, request
+from flask.json.provider import DefaultJSONProvider
+from flask.sessions import SecureCookieSessionInterface
+
+import db
+
+FLUSH_INTERVAL = float(os.environ.get("METRICS_FLUSH_INTERVAL", 1.0))
+RETIRED = "retired.json"  # 끝난 워커들의 값을 합쳐 둔 파일
+
+TIME_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+BYTE_BUCKETS = (64, 128, 256, 512, 1024, 2048, 4096, 16384, 65536, 262144)
+
+# 이름 -> (종류, 설명, 버킷)
+METRICS = {
+    "game2_requests_total": ("counter", "처리한 요청 수", None),
+    "game2_request_duration_seconds": ("histogram", "요청 처리 시간", TIME_BUCKETS),
+    "game2_response_bytes": ("histogram", "응답 본문 크기", BYTE_BUCKETS),
+    "game2_session_cookie_bytes": ("histogram", "응답에 실린 세션 쿠키 크기", BYTE_BUCKETS),
+    "game2_phase_duration_seconds": ("histogram", "요청 안의 구간별 시간", TIME_BUCKETS),
+    "game2_sql_statements_total": ("counter", "실행한 SQL 문장 수", None),
+    "game2_sql_duration_seconds": ("histogram", "SQL 문장 실행 시간", TIME_BUCKETS),
+    "game2_db_connects_total": ("counter", "새로 연 SQLite 커넥션 수", None),
+}
+
+_values = {}          # (이름, 라벨 튜플) -> 카운터 값 또는 [버킷별 개수..., 합, 개수]
+_lock = threading.Lock()
+_current = threading.local()  # 요청 처리 중인 라우트
+_flush_pid = None
+
+
+def inc(name, labels=(), amount=1):
+    key = (name, labels)
+    with _lock:
+        _values[key] = _values.get(key, 0) + amount
+
+
+def observe(name, labels, value):
+    buckets = METRICS[name][2]
+    key = (name, labels)
+    with _lock:
+        row = _values.get(key)
+        if row is None:
+            row = _values[key] = [0] * (len(buckets) + 2)
+        for i, bound in enumerate(buckets):
+            if value <= bound:
+                row[i] += 1
+                break
+        row[-2] += value
+        row[-1] += 1
+
+
+def current_route():
+    return getattr(_current, "route", "-")
+
+
+@contextmanager
+def phase(name):
+    """요청 안의 한 구간 시간 재기"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe("game2_phase_duration_seconds", (current_route(), name), time.perf_counter() - start)
+
+
+# SQL 계측
+def _statement_kind(sql):
+    word = sql.lstrip().split(None, 1)
+    return word[0].upper() if word else "-"
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        inc("game2_db_connects_total")
+
+    def _timed(self, kind, call, *args):
+        start = time.perf_counter()
+        try:
+            return call(*args)
+        finally:
+            route = current_route()
+            observe("game2_sql_duration_seconds", (route,), time.perf_counter() - start)
+            inc("game2_sql_statements_total", (route, kind))
+
+    def execute(self, sql, *args):
+        return self._timed(_statement_kind(sql), super().execute, sql, *args)
+
+    def executemany(self, sql, *args):
+        return self._timed(_statement_kind(sql), super().executemany, sql, *args)
+
+    def commit(self):
+        return self._timed("COMMIT", super().commit)
+
+
+# 세션 쿠키 서명, JSON 직렬화 시간
+class TimedSessionInterface(SecureCookieSessionInterface):
+    def save_session(self, app, session, response):
+        with phase("session_save"):
+            return super().save_session(app, session, response)
+
+
+class TimedJSONProvider(DefaultJSONProvider):
+    def response(self, *args, **kwargs):
+        with phase("json"):
+            return super().response(*args, **kwargs)
+
+
+class MetricsMiddleware:
+    """WSGI 앱 전체(세션 저장 포함)의 시간과 응답 크기 기록"""
+
+    def __init__(self, wsgi_app, session_cookie_name):
+        self.wsgi_app = wsgi_app
+        self.cookie_prefix = f"{session_cookie_name}="
+
+    def __call__(self, environ, start_response):
+        _current.route = "-"
+        start = time.perf_counter()
+        captured = {}
+
+        def _start_response(status, headers, exc_info=None):
+            captured["status"] = status.split(" ", 1)[0]
+            captured["headers"] = headers
+            return start_response(status, headers, exc_info)
+
+        try:
+            return self.wsgi_app(environ, _start_response)
+        finally:
+            self.record(environ, captured, time.perf_counter() - start)
+            _current.route = "-"
+
+    def record(self, environ, captured, elapsed):
+        route = current_route()
+        status = captured.get("status", "500")
+        inc("game2_requests_total", (route, environ["REQUEST_METHOD"], status))
+        observe("game2_request_duration_seconds", (route,), elapsed)
+        for name, value in captured.get("headers", ()):
+            lower = name.lower()
+            if lower == "content-length":
+                observe("game2_response_bytes", (route,), int(value))
+            elif lower == "set-cookie" and value.startswith(self.cookie_prefix):
+                observe("game2_session_cookie_bytes", (route,), len(value.split(";", 1)[0]))
+        _ensure_flush_thread()
+
+
+# 프로세스 간 합치기
+def metrics_dir():
+    return os.environ.get("METRICS_DIR")
+
+
+def _write_rows(path, rows):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(rows, f)
+    os.replace(tmp, path)
+
+
+def _read_rows(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return []  # 쓰는 중이거나 깨진 파일은 건너뛴다
+
+
+def _merge(merged, rows):
+    for metric, labels, value in rows:
+        key = (metric, tuple(labels))
+        if isinstance(value, list):
+            total = merged.setdefault(key, [0] * len(value))
+            for i, v in enumerate(value):
+                total[i] += v
+        else:
+            merged[key] = merged.get(key, 0) + value
+    return merged
+
+
+@contextmanager
+def _locked(directory):
+    # retired.json 에 합치는 동안 다른 프로세스가 같은 값을 두 번 세지 않도록
+    with open(os.path.join(directory, ".lock"), "w") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        yield
+
+
+def _fold(directory, pids):
+    """끝난 프로세스들의 <pid>.json 을 retired.json 에 더하고 지운다 (_locked 안에서)"""
+    paths = [p for p in (os.path.join(directory, f"{pid}.json") for pid in pids) if os.path.exists(p)]
+    if not paths:
+        return
+    retired = os.path.join(directory, RETIRED)
+    merged = _merge({}, _read_rows(retired))
+    for path in paths:
+        _merge(merged, _read_rows(path))
+    _write_rows(retired, [[name, list(labels), value] for (name, labels), value in merged.items()])
+    for path in paths:
+        os.remove(path)
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass  # 다른 사용자의 프로세스 (살아 있음)
+    return True
+
+
+def flush():
+    """현재 프로세스 값을 METRICS_DIR/<pid>.json 에 기록"""
+    directory = metrics_dir()
+    if not directory:
+        return
+    with _lock:
+        rows = [[name, list(labels), value] for (name, labels), value in _values.items()]
+    _write_rows(os.path.join(directory, f"{os.getpid()}.json"), rows)
+
+
+def retire(pid):
+    """끝난 워커의 값을 retired.json 에 합친다 (gunicorn child_exit 훅, 마스터에서)"""
+    directory = metrics_dir()
+    if not directory:
+        return
+    with _locked(directory):
+        _fold(directory, [pid])
+
+
+def _ensure_flush_thread():
+    # fork 이후 자식 프로세스에서 처음 요청을 받을 때 flush 스레드 시작
+    global _flush_pid
+    if _flush_pid == os.getpid() or not metrics_dir():
+        return
+    with _lock:
+        if _flush_pid == os.getpid():
+            return
+        _flush_pid = os.getpid()
+    threading.Thread(target=_run_flush, name="metrics-flush", daemon=True).start()
+
+
+def _run_flush():
+    while True:
+        time.sleep(FLUSH_INTERVAL)
+        try:
+            flush()
+        except OSError:
+            pass  # 디렉터리가 사라졌으면 다음 주기에 다시 시도
+
+
+def collect():
+    """모든 프로세스 값을 합친 dict"""
+    directory = metrics_dir()
+    if not directory:
+        with _lock:
+            return {key: (list(v) if isinstance(v, list) else v) for key, v in _values.items()}
+
+    flush()
+    merged = {}
+    with _locked(directory):
+        names = [n for n in os.listdir(directory) if n.endswith(".json")]
+        dead = [int(n[:-5]) for n in names if n[:-5].isdigit() and not _alive(int(n[:-5]))]
+        _fold(directory, dead)
+        for name in os.listdir(directory):
+            if name.endswith(".json"):
+                _merge(merged, _read_rows(os.path.join(directory, name)))
+    return merged
+
+
+LABEL_NAMES = {
+    "game2_requests_total": ("route", "method", "status"),
+    "game2_phase_duration_seconds": ("route", "phase"),
+    "game2_sql_statements_total": ("route", "kind"),
+    "game2_db_connects_total": (),
+}
+
+
+def _format_labels(names, values, extra=""):
+    parts = [f'{n}="{v}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def render(values):
+    """Prometheus 텍스트 형식"""
+    lines = []
+    for name, (kind, help_text, buckets) in METRICS.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        names = LABEL_NAMES.get(name, ("route",))
+        for (metric, labels), value in sorted(values.items()):
+            if metric != name:
+                continue
+            if kind == "counter":
+                lines.append(f"{name}{_format_labels(names, labels)} {value}")
+                continue
+            cumulative = 0
+            for bound, count in zip(buckets, value):
+                cumulative += count
+                le = _format_labels(names, labels, f'le="{bound}"')
+                lines.append(f"{name}_bucket{le} {cumulative}")
+            le = _format_labels(names, labels, 'le="+Inf"')
+            lines.append(f"{name}_bucket{le} {value[-1]}")
+            lines.append(f"{name}_sum{_format_labels(names, labels)} {value[-2]}")
+            lines.append(f"{name}_count{_format_labels(names, labels)} {value[-1]}")
+    return "\n".join(lines) + "\n"
+
+
+def metrics_view():
+    return Response(render(collect()), mimetype="text/plain; version=0.0.4")
+
+
+def init_app(app):
+    db.connection_factory = InstrumentedConnection
+    app.session_interface = TimedSessionInterface()
+    app.json = TimedJSONProvider(app)
+    app.wsgi_app = MetricsMiddleware(app.wsgi_app, app.config["SESSION_COOKIE_NAME"])
+
+    @app.before_request
+    def _start_view():
+        _current.route = request.url_rule.rule if request.url_rule else "-"
+        _current.view_start = time.perf_counter()
+
+    @app.after_request
+    def _end_view(response):
+        start = getattr(_current, "view_start", None)
+        if start is not None:
+            observe("game2_phase_duration_seconds", (current_route(), "view"), time.perf_counter() - start)
+            _current.view_start = None
+        return response
+
+    app.add_url_rule("/metrics", "metrics", metrics_view)
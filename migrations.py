@@ -0,0 +1,194 @@
+"""
+rpg_game.db 스키마 마이그레이션
+
+PRAGMA user_version 에 적용된 마지막 마이그레이션 번호를 기록하고,
+시작할 때 그보다 뒤의 마이그레이션만 순서대로 적용한다.
+전체를 BEGIN IMMEDIATE 하나로 묶으므로 워커 여러 개가 동시에 시작해도
+한 번만 적용되고, 중간에 실패하면 아무것도 바뀌지 않는다.
+
+스키마를 바꿀 때는 MIGRATIONS 끝에 새 함수를 추가한다 (이미 있는 것은 고치지 않는다).
+
+    python migrations.py [DB 경로]     # 현재 버전 확인 및 적용
+"""
+
+import sys
+
+import db
+import rules
+
+
+def _columns(conn, table):
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+
+
+def _create_users(conn):
+    conn.execute("""CREATE TABLE users (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        username TEXT UNIQUE,
+                        level INTEGER DEFAULT 1,
+                        exp INTEGER DEFAULT 0,
+                        hp INTEGER DEFAULT 100,
+                        max_hp INTEGER DEFAULT 100,
+                        attack INTEGER DEFAULT 10,
+                        defense INTEGER DEFAULT 5,
+                        money INTEGER DEFAULT 1000,
+                        weapon_level INTEGER DEFAULT 0,
+                        armor_level INTEGER DEFAULT 0,
+                        potions INTEGER DEFAULT 3,
+                        stage INTEGER DEFAULT 1,
+                        last_battle TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )""")
+
+
+def _convert_legacy_users(conn):
+    """예전 game2.db 형식 users(id TEXT, gold, level, item_potion) -> 현재 형식
+
+    레벨에 맞춰 능력치를 레벨업 규칙대로 다시 계산한다.
+    """
+    conn.execute("ALTER TABLE users RENAME TO users_legacy")
+    _create_users(conn)
+    conn.execute(f"""INSERT INTO users (username, level, hp, max_hp, attack, defense, money, potions)
+                     SELECT id, level,
+                            100 + (level - 1) * {rules.LEVELUP_MAX_HP},
+                            100 + (level - 1) * {rules.LEVELUP_MAX_HP},
+                            10 + (level - 1) * {rules.LEVELUP_ATTACK},
+                            5 + (level - 1) * {rules.LEVELUP_DEFENSE},
+                            gold, item_potion
+                     FROM users_legacy""")
+    conn.execute("DROP TABLE users_legacy")
+
+
+def m001_base_schema(conn):
+    """users / monsters 테이블 (user_version 이전에 만든 DB 는 그대로 둔다)"""
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+
+    if "users" not in tables:
+        _create_users(conn)
+    elif "username" not in _columns(conn, "users"):
+        _convert_legacy_users(conn)
+
+    if "monsters" not in tables:
+        conn.execute("""CREATE TABLE monsters (
+                            id INTEGER PRIMARY KEY AUTOINCREMENT,
+                            name TEXT,
+                            stage INTEGER,
+                            hp INTEGER,
+                            attack INTEGER,
+                            defense INTEGER,
+                            exp_reward INTEGER,
+                            money_reward INTEGER
+                        )""")
+        conn.executemany("INSERT INTO monsters (name, stage, hp, attack, defense, exp_reward, money_reward) "
+                         "VALUES (?, ?, ?, ?, ?, ?, ?)", rules.DEFAULT_MONSTERS)
+
+
+def m002_users_version(conn):
+    """응답 delta 계산용 상태 버전"""
+    if "version" not in _columns(conn, "users"):
+        conn.execute("ALTER TABLE users ADD COLUMN version INTEGER DEFAULT 0")
+
+
+def m003_battles(conn):
+    """BATTLE_STORE=sqlite 용 전투 상태 테이블"""
+    conn.execute("""CREATE TABLE IF NOT EXISTS battles (
+                        id TEXT PRIMARY KEY,
+                        username TEXT NOT NULL,
+                        state TEXT NOT NULL,
+                        expires_at REAL NOT NULL
+                    )""")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_battles_expires_at ON battles(expires_at)")
+
+
+def m004_monsters_stage_index(conn):
+    """스테이지별 몬스터 조회 (MonsterCatalog.load 의 ORDER BY stage, id 도 이 순서로 읽는다)"""
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_monsters_stage ON monsters(stage, id)")
+
+
+def m005_leaderboard(conn):
+    """리더보드 스냅샷 (leaderboard.py). 기존 플레이어로 처음 채운다"""
+    conn.execute("""CREATE TABLE leaderboard (
+                        username TEXT PRIMARY KEY,
+                        stage INTEGER NOT NULL,
+                        level INTEGER NOT NULL,
+                        exp INTEGER NOT NULL,
+                        updated_at REAL NOT NULL
+                    )""")
+    conn.execute("CREATE INDEX idx_leaderboard_updated_at ON leaderboard(updated_at)")
+    conn.execute("""INSERT INTO leaderboard (username, stage, level, exp, updated_at)
+                    SELECT username, stage, level, exp, 0 FROM users WHERE username IS NOT NULL""")
+
+
+def m006_rate_limits(conn):
+    """RATE_LIMIT_BACKEND=sqlite 용 토큰 버킷 (ratelimit.py)"""
+    conn.execute("""CREATE TABLE rate_limits (
+                        key TEXT PRIMARY KEY,
+                        tokens REAL NOT NULL,
+                        updated_at REAL NOT NULL
+                    )""")
+    conn.execute("CREATE INDEX idx_rate_limits_updated_at ON rate_limits(updated_at)")
+
+
+def m007_leaderboard_seq(conn):
+    """리더보드 동기화 커서: 시계(updated_at) 대신 쓰기 트랜잭션마다 1씩 늘어나는 번호"""
+    conn.execute("ALTER TABLE leaderboard ADD COLUMN seq INTEGER NOT NULL DEFAULT 0")
+    conn.execute("CREATE INDEX idx_leaderboard_seq ON leaderboard(seq)")
+
+
+def m008_monsters_version(conn):
+    """monsters 가 바뀔 때만 늘어나는 번호 (MonsterCatalog 가 도감을 다시 읽을지 판단)"""
+    conn.execute("""CREATE TABLE monsters_version (
+                        id INTEGER PRIMARY KEY CHECK (id = 1),
+                        version INTEGER NOT NULL
+                    )""")
+    conn.execute("INSERT INTO monsters_version (id, version) VALUES (1, 0)")
+    for op in ("INSERT", "UPDATE", "DELETE"):
+        conn.execute(f"""CREATE TRIGGER monsters_{op.lower()}_version AFTER {op} ON monsters
+                         BEGIN UPDATE monsters_version SET version = version + 1 WHERE id = 1; END""")
+
+
+MIGRATIONS = [
+    m001_base_schema,
+    m002_users_version,
+    m003_battles,
+    m004_monsters_stage_index,
+    m005_leaderboard,
+    m006_rate_limits,
+    m007_leaderboard_seq,
+    m008_monsters_version,
+]
+
+
+def migrate(path):
+    """적용 안 된 마이그레이션을 적용하고 통계를 갱신. 적용 후 버전 반환"""
+    conn = db.connect(path)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            (current,), = conn.execute("PRAGMA user_version").fetchall()
+            if current > len(MIGRATIONS):
+                raise RuntimeError(f"{path} 는 이 코드보다 새 스키마입니다 (user_version={current})")
+            for number, migration in enumerate(MIGRATIONS, start=1):
+                if number > current:
+                    migration(conn)
+            conn.execute(f"PRAGMA user_version={len(MIGRATIONS)}")
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+
+        # 스키마가 바뀌었으면 통계를 새로 만들고, 아니면 필요한 것만 갱신
+        if current < len(MIGRATIONS):
+            conn.execute("ANALYZE")
+        conn.execute("PRAGMA optimize")
+        return len(MIGRATIONS)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else "rpg_game.db"
+    conn = db.connect(path)
+    (before,), = conn.execute("PRAGMA user_version").fetchall()
+    conn.close()
+    after = migrate(path)
+    print(f"{path}: 버전 {before} -> {after}")
@@ -0,0 +1,133 @@
+"""
+몬스터 도감 (메모리 캐시)
+
+monsters 테이블은 init_db() 때 한 번 채워진 뒤 거의 바뀌지 않으므로
+시작할 때 전부 읽어 스테이지별로 정리해 둔다. 전투를 시작할 때는
+메모리에서 바로 뽑고 DB 는 건드리지 않는다.
+
+테이블이 바뀌었는지는 check_interval 초에 한 번 확인한다.
+- PRAGMA data_version: 다른 커넥션이 무엇이든 커밋하면 바뀐다 (파일을 읽지 않음)
+- 바뀌었으면 monsters_version 한 행을 읽는다. monsters 를 바꿀 때만 트리거가
+  늘리므로 users/leaderboard/battles 쓰기로는 도감을 다시 읽지 않는다
+"""
+
+import bisect
+import os
+import random
+import sqlite3
+import threading
+import time
+
+
+class Monster:
+    __slots__ = ("id", "name", "stage", "hp", "attack", "defense", "exp_reward", "money_reward")
+
+    def __init__(self, id, name, stage, hp, attack, defense, exp_reward, money_reward):
+        self.id = id
+        self.name = name
+        self.stage = stage
+        self.hp = hp
+        self.attack = attack
+        self.defense = defense
+        self.exp_reward = exp_reward
+        self.money_reward = money_reward
+
+    def to_battle(self):
+        """전투용 몬스터 정보 (전투 중 hp 가 줄어드는 사본)"""
+        return {
+            "id": self.id,
+            "name": self.name,
+            "hp": self.hp,
+            "max_hp": self.hp,
+            "attack": self.attack,
+            "defense": self.defense,
+            "exp_reward": self.exp_reward,
+            "money_reward": self.money_reward,
+        }
+
+
+class MonsterCatalog:
+    def __init__(self, path, check_interval=5.0):
+        self.path = path
+        self.check_interval = check_interval
+
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+        self._data_version = None
+        self._monsters_version = None
+        self._next_check = 0.0
+
+        # stage -> (몬스터 튜플, 누적 가중치 튜플). 통째로 교체만 하므로 읽을 때 잠금 불필요
+        self._by_stage = {}
+
+    def load(self):
+        """monsters 테이블 전체를 다시 읽는다"""
+        with self._lock:
+            conn = self._connection()
+            rows = conn.execute(
+                "SELECT id, name, stage, hp, attack, defense, exp_reward, money_reward "
+                "FROM monsters ORDER BY stage, id").fetchall()
+            self._data_version = self._read_data_version(conn)
+            self._monsters_version = self._read_monsters_version(conn)
+            self._next_check = time.monotonic() + self.check_interval
+
+        grouped = {}
+        for row in rows:
+            grouped.setdefault(row[2], []).append(Monster(*row))
+
+        by_stage = {}
+        for stage, monsters in grouped.items():
+            # 현재는 모든 몬스터가 같은 확률로 등장 (가중치 1)
+            cum_weights = []
+            total = 0
+            for _ in monsters:
+                total += 1
+                cum_weights.append(total)
+            by_stage[stage] = (tuple(monsters), tuple(cum_weights))
+        self._by_stage = by_stage
+
+    def spawn(self, stage, rng=random):
+        """해당 스테이지의 몬스터 하나를 무작위로 뽑는다 (없으면 None)"""
+        self._maybe_reload()
+        entry = self._by_stage.get(stage)
+        if entry is None:
+            return None
+        monsters, cum_weights = entry
+        return monsters[bisect.bisect(cum_weights, rng.random() * cum_weights[-1])]
+
+    def _maybe_reload(self):
+        now = time.monotonic()
+        if now < self._next_check:
+            return
+        with self._lock:
+            if now < self._next_check:
+                return
+            self._next_check = now + self.check_interval
+            conn = self._connection()
+            data_version = self._read_data_version(conn)
+            if data_version == self._data_version:
+                return
+            self._data_version = data_version
+            changed = self._read_monsters_version(conn) != self._monsters_version
+        if changed:
+            self.load()
+
+    @staticmethod
+    def _read_data_version(conn):
+        # fetchone() 만 하면 문장이 끝나지 않아 읽기 트랜잭션이 열린 채로 남는다
+        (version,), = conn.execute("PRAGMA data_version").fetchall()
+        return version
+
+    @staticmethod
+    def _read_monsters_version(conn):
+        (version,), = conn.execute("SELECT version FROM monsters_version WHERE id = 1").fetchall()
+        return version
+
+    def _connection(self):
+        # data_version 은 커넥션마다 따로 세므로 전용 커넥션 하나를 쓴다 (fork 후엔 새로)
+        if self._conn is None or self._pid != os.getpid():
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._pid = os.getpid()
+            self._data_version = None
+        return self._conn
@@ -0,0 +1,84 @@
+"""
+플레이어(users row) 모델
+
+- 요청마다 필요한 컬럼만 SELECT 해서 이름으로 접근한다 (player.hp, player.money)
+- 읽지 않은 컬럼에 접근하면 AttributeError (위치 인덱스 실수 대신 바로 드러난다)
+- 값을 바꾸면 바뀐 필드만 기억해 두었다가 그 필드만 UPDATE 한다
+"""
+
+COLUMNS = ("id", "username", "level", "exp", "hp", "max_hp", "attack", "defense",
+           "money", "weapon_level", "armor_level", "potions", "stage", "last_battle", "version")
+
+# 응답/화면에 보내는 필드
+PUBLIC_FIELDS = ("level", "exp", "hp", "max_hp", "attack", "defense",
+                 "money", "weapon_level", "armor_level", "potions", "stage")
+
+# 항상 함께 읽는 컬럼 (키, 응답 delta 계산용 버전)
+KEY_COLUMNS = ("username", "version")
+
+_select_sql = {}  # 컬럼 튜플 -> SELECT 문 (문장 캐시가 재사용하도록 같은 문자열을 쓴다)
+
+
+class Player:
+    __slots__ = COLUMNS + ("_dirty", "_changed", "_loaded_version")
+
+    def __init__(self, columns, row):
+        for name, value in zip(columns, row):
+            object.__setattr__(self, name, value)
+        object.__setattr__(self, "_dirty", set())     # 아직 기록 안 한 필드
+        object.__setattr__(self, "_changed", set())   # 읽은 뒤 바뀐 필드 (기록해도 유지)
+        object.__setattr__(self, "_loaded_version", getattr(self, "version", None))
+
+    def __setattr__(self, name, value):
+        if getattr(self, name, None) != value:
+            self._dirty.add(name)
+            self._changed.add(name)
+        object.__setattr__(self, name, value)
+
+    def changes(self):
+        """아직 기록 안 한 필드 -> 새 값"""
+        return {name: getattr(self, name) for name in self._dirty}
+
+    def changed_fields(self):
+        return self._changed
+
+    def mark_saved(self, version):
+        object.__setattr__(self, "version", version)
+        self._dirty.clear()
+
+    @property
+    def loaded_version(self):
+        return self._loaded_version
+
+    def public(self, fields=PUBLIC_FIELDS):
+        return {name: getattr(self, name) for name in fields}
+
+
+def columns_for(*names):
+    """필요한 컬럼 + 키 컬럼 (순서 고정)"""
+    wanted = set(names) | set(KEY_COLUMNS)
+    return tuple(c for c in COLUMNS if c in wanted)
+
+
+def select_sql(columns):
+    sql = _select_sql.get(columns)
+    if sql is None:
+        sql = _select_sql[columns] = f"SELECT {', '.join(columns)} FROM users WHERE username=?"
+    return sql
+
+
+def load(conn, username, columns=COLUMNS):
+    row = conn.execute(select_sql(columns), (username,)).fetchone()
+    return None if row is None else Player(columns, row)
+
+
+def save(conn, player):
+    """바뀐 필드만 UPDATE (version 은 1 증가). 바뀐 게 없으면 아무것도 안 한다"""
+    changes = player.changes()
+    if not changes:
+        return
+    assignments = ", ".join(f"{name}=?" for name in changes)
+    (version,), = conn.execute(
+        f"UPDATE users SET {assignments}, version=version+1 WHERE username=? RETURNING version",
+        (*changes.values(), player.username)).fetchall()
+    player.mark_saved(version)
@@ -0,0 +1,144 @@
+"""
+플레이어 상태 write-behind 캐시
+
+자주 바뀌는 users row 를 메모리에 들고 있다가 주기적으로 모아서
+한 트랜잭션(executemany)으로 SQLite 에 기록한다.
+
+기록 시점:
+- flush_interval 초마다 (백그라운드 스레드)
+- 더러운(dirty) row 가 max_dirty 개 이상 쌓였을 때
+- 워커 종료 시 (gunicorn worker_exit 훅 / atexit)
+
+주의: 캐시는 프로세스 메모리에 있으므로 워커가 여러 개면 서로의 변경을
+보지 못한다. 워커 1개(WEB_CONCURRENCY=1)로 돌릴 때만 켤 것.
+"""
+
+import atexit
+import os
+import threading
+from collections import OrderedDict
+
+import db
+
+
+class PlayerCache:
+    def __init__(self, path, columns, flush_interval=1.0, max_dirty=100, max_rows=10000):
+        self.path = path
+        self.columns = tuple(columns)
+        self.index = {name: i for i, name in enumerate(self.columns)}
+        self.flush_interval = flush_interval
+        self.max_dirty = max_dirty
+        self.max_rows = max_rows
+
+        # 요청 스레드와 flush 스레드가 함께 쓰므로 모든 접근은 lock 안에서
+        self.lock = threading.RLock()
+        self._rows = OrderedDict()   # username -> list (row)
+        self._dirty = set()
+        self._inflight = set()       # flush 가 기록 중인 row (커밋 전까지 버리면 안 된다)
+
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._pid = None
+
+        # username 은 키이므로 기록 대상에서 제외
+        self._write_columns = [c for c in self.columns if c not in ("id", "username")]
+        self._update_sql = "UPDATE users SET {} WHERE username=?".format(
+            ", ".join(f"{c}=?" for c in self._write_columns))
+        self._select_sql = f"SELECT {', '.join(self.columns)} FROM users WHERE username=?"
+
+    def get(self, username):
+        """캐시에서 row 반환 (없으면 DB에서 읽어 채운다)"""
+        with self.lock:
+            row = self._rows.get(username)
+            if row is None:
+                loaded = db.get_db(self.path).execute(self._select_sql, (username,)).fetchone()
+                if loaded is None:
+                    return None
+                row = self._rows[username] = list(loaded)
+                self._evict()
+            else:
+                self._rows.move_to_end(username)
+            return tuple(row)
+
+    def update(self, username, changes):
+        """메모리의 row 를 바꾸고 dirty 로 표시. 바뀐 row 반환"""
+        self._ensure_thread()
+        with self.lock:
+            if username not in self._rows and self.get(username) is None:
+                return None
+            row = self._rows[username]
+            for key, value in changes.items():
+                row[self.index[key]] = value
+            self._dirty.add(username)
+            if len(self._dirty) >= self.max_dirty:
+                self._wakeup.set()
+            return tuple(row)
+
+    def flush(self):
+        """dirty row 를 한 트랜잭션으로 기록"""
+        with self.lock:
+            if not self._dirty:
+                return 0
+            params = []
+            for username in self._dirty:
+                row = self._rows[username]
+                params.append([row[self.index[c]] for c in self._write_columns] + [username])
+            flushing = set(self._dirty)
+            self._inflight |= flushing
+            self._dirty.clear()
+
+        try:
+            with db.transaction(self.path) as conn:
+                conn.executemany(self._update_sql, params)
+        except Exception:
+            # 기록에 실패하면 다음 flush 때 다시 시도
+            with self.lock:
+                self._dirty |= flushing
+                self._inflight -= flushing
+            raise
+        with self.lock:
+            self._inflight -= flushing
+            self._evict()
+        return len(params)
+
+    def close(self):
+        """flush 스레드를 멈추고 남은 변경을 기록 (worker_exit 에서 불렀으면 atexit 에서는 다시 안 한다)"""
+        atexit.unregister(self.close)
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None and self._thread.is_alive():
+            self._thread.join(timeout=5)
+        self.flush()
+
+    def _evict(self):
+        # 오래 안 쓴 깨끗한 row 부터 버린다 (dirty / 기록 중인 row 는 커밋될 때까지 유지)
+        if len(self._rows) <= self.max_rows:
+            return
+        for username in list(self._rows)[:-1]:
+            if len(self._rows) <= self.max_rows:
+                break
+            if username not in self._dirty and username not in self._inflight:
+                del self._rows[username]
+
+    def _ensure_thread(self):
+        # fork 이후 자식 프로세스에서 처음 쓸 때 flush 스레드 시작
+        if self._pid == os.getpid():
+            return
+        with self.lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="player-cache-flush", daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"플레이어 캐시 flush 오류: {e}")
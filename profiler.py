@@ -0,0 +1,173 @@
+"""
+실행 중인 워커의 스택 샘플링 프로파일러
+
+별도 스레드가 일정 간격(기본 5ms)으로 sys._current_frames() 를 읽어
+다른 스레드들의 호출 스택을 센다. 요청 처리 코드는 건드리지 않으므로
+켜 둔 동안의 부하는 샘플링 스레드 하나 정도다.
+
+켜는 방법 (결과는 PROFILE_DIR 에 저장된다)
+1) HTTP: PROFILER_TOKEN 을 설정해 두고
+       curl -X POST -H "X-Profiler-Token: $TOKEN" "host/admin/profile?seconds=10&format=speedscope"
+       curl -H "X-Profiler-Token: $TOKEN" host/admin/profile/<파일명>
+   요청을 받은 워커를 샘플링한다 (응답은 바로 오고 샘플링은 뒤에서 진행).
+2) 시그널: kill -USR2 <워커 pid>  (PROFILER_SECONDS 동안, collapsed 형식)
+
+collapsed 형식은 flamegraph.pl / speedscope 에, speedscope 형식은
+https://www.speedscope.app 에 그대로 넣으면 된다.
+"""
+
+import hmac
+import json
+import os
+import signal
+import sys
+import tempfile
+import threading
+import time
+
+from flask import abort, jsonify, request, send_from_directory
+
+TOKEN = os.environ.get("PROFILER_TOKEN")
+PROFILE_DIR = os.environ.get("PROFILE_DIR", os.path.join(tempfile.gettempdir(), "game2-profiles"))
+DEFAULT_SECONDS = float(os.environ.get("PROFILER_SECONDS", 10))
+DEFAULT_INTERVAL = 0.005
+MAX_SECONDS = 120
+FORMATS = {"collapsed": "txt", "speedscope": "json"}
+
+_running = threading.Lock()  # 프로세스당 샘플러 하나만
+
+
+class Sampler:
+    def __init__(self, interval=DEFAULT_INTERVAL):
+        self.interval = interval
+        self.stacks = {}  # (프레임, ...) 루트 -> 말단 -> 샘플 수
+        self.samples = 0
+        self.started = None
+        self.elapsed = 0.0
+
+    def run(self, seconds):
+        me = threading.get_ident()
+        self.started = time.time()
+        start = time.perf_counter()
+        deadline = start + seconds
+        while time.perf_counter() < deadline:
+            for ident, frame in sys._current_frames().items():
+                if ident != me:
+                    stack = self._stack(frame)
+                    self.stacks[stack] = self.stacks.get(stack, 0) + 1
+            self.samples += 1
+            time.sleep(self.interval)
+        self.elapsed = time.perf_counter() - start
+
+    @staticmethod
+    def _stack(frame):
+        frames = []
+        while frame is not None:
+            code = frame.f_code
+            frames.append((code.co_name, code.co_filename, code.co_firstlineno))
+            frame = frame.f_back
+        frames.reverse()
+        return tuple(frames)
+
+    def collapsed(self):
+        """한 줄에 스택 하나: 'a (file:line);b (file:line) 횟수'"""
+        lines = []
+        for stack, count in sorted(self.stacks.items(), key=lambda item: -item[1]):
+            names = ";".join(f"{name} ({os.path.basename(path)}:{line})" for name, path, line in stack)
+            lines.append(f"{names} {count}")
+        return "\n".join(lines) + "\n"
+
+    def speedscope(self, name):
+        frame_index = {}
+        frames = []
+        samples = []
+        weights = []
+        for stack, count in self.stacks.items():
+            indexes = []
+            for frame in stack:
+                if frame not in frame_index:
+                    frame_index[frame] = len(frames)
+                    frames.append({"name": frame[0], "file": frame[1], "line": frame[2]})
+                indexes.append(frame_index[frame])
+            samples.append(indexes)
+            weights.append(count * self.interval)
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": frames},
+            "profiles": [{
+                "type": "sampled",
+                "name": name,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": sum(weights),
+                "samples": samples,
+                "weights": weights,
+            }],
+            "name": name,
+            "exporter": "game2-profiler",
+        }
+
+
+def start(seconds=DEFAULT_SECONDS, fmt="collapsed", interval=DEFAULT_INTERVAL):
+    """백그라운드에서 샘플링 시작, 결과 파일 이름 반환 (이미 실행 중이면 None)"""
+    if not _running.acquire(blocking=False):
+        return None
+    name = f"profile-{os.getpid()}-{time.strftime('%Y%m%d-%H%M%S')}.{FORMATS[fmt]}"
+    thread = threading.Thread(target=_run, args=(seconds, fmt, interval, name), name="profiler", daemon=True)
+    thread.start()
+    return name
+
+
+def _run(seconds, fmt, interval, name):
+    try:
+        sampler = Sampler(interval)
+        sampler.run(seconds)
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        path = os.path.join(PROFILE_DIR, name)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            if fmt == "speedscope":
+                json.dump(sampler.speedscope(f"game2 pid {os.getpid()}"), f)
+            else:
+                f.write(sampler.collapsed())
+        os.replace(tmp, path)  # 다 쓴 뒤에만 보이도록
+        print(f"[profiler] {sampler.samples} samples -> {path}", file=sys.stderr)
+    finally:
+        _running.release()
+
+
+def install_signal_handler(signum=signal.SIGUSR2):
+    """워커 메인 스레드에서 호출 (gunicorn post_worker_init 훅)"""
+    signal.signal(signum, lambda *_: start(DEFAULT_SECONDS))
+
+
+# HTTP 엔드포인트 (PROFILER_TOKEN 이 없으면 등록하지 않는다)
+def _check_token():
+    given = request.headers.get("X-Profiler-Token", "")
+    if not hmac.compare_digest(given.encode(), TOKEN.encode()):
+        abort(403)
+
+
+def start_view():
+    _check_token()
+    fmt = request.args.get("format", "collapsed")
+    if fmt not in FORMATS:
+        abort(400)
+    seconds = min(MAX_SECONDS, request.args.get("seconds", DEFAULT_SECONDS, type=float))
+    interval = max(0.001, request.args.get("interval_ms", DEFAULT_INTERVAL * 1000, type=float) / 1000)
+    name = start(seconds, fmt, interval)
+    if name is None:
+        return jsonify({"status": "fail", "message": "이미 프로파일링 중입니다."}), 409
+    return jsonify({"status": "ok", "pid": os.getpid(), "seconds": seconds, "file": name}), 202
+
+
+def result_view(name):
+    _check_token()
+    return send_from_directory(PROFILE_DIR, name, max_age=0)
+
+
+def init_app(app):
+    if not TOKEN:
+        return
+    app.add_url_rule("/admin/profile", "profile_start", start_view, methods=["POST"])
+    app.add_url_rule("/admin/profile/<name>", "profile_result", result_view)
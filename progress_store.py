@@ -0,0 +1,235 @@
+"""
+영어단어 학습 진도 저장 (english.py)
+
+답을 고를 때마다 progress.json 전체를 다시 쓰면 기록이 쌓일수록 느려지므로,
+바뀐 내용(이벤트)만 progress.jsonl 에 한 줄씩 덧붙인다.
+
+- fsync 는 FSYNC_BATCH 개마다, 또는 FSYNC_INTERVAL 초마다 모아서 한다
+- 이벤트가 COMPACT_EVERY 개 쌓이면 백그라운드에서 progress.json(스냅샷)으로 합친다
+  (임시 파일에 쓰고 rename 하므로 중간에 죽어도 스냅샷이 깨지지 않는다)
+- 이벤트마다 순번(seq)을 붙이고 스냅샷에 마지막 순번을 기록해서,
+  합치는 도중 죽어도 같은 이벤트를 두 번 반영하지 않는다
+- 마지막 줄이 덜 쓰인 채로 죽었으면 다시 열 때 그 줄을 잘라내고 이어 쓴다
+
+progress.json 형식은 그대로라서 예전 파일도 그대로 읽는다.
+"""
+
+import json
+import os
+import threading
+import time
+
+FSYNC_BATCH = 20        # 이벤트 몇 개마다 바로 fsync 할지
+FSYNC_INTERVAL = 1.0    # 그 전이라도 이 시간(초)이 지나면 fsync
+COMPACT_EVERY = 1000    # 저널 이벤트가 이만큼 쌓이면 스냅샷으로 합친다
+TAIL_BLOCK = 4096       # 끊긴 마지막 줄을 찾을 때 거꾸로 읽는 단위 (바이트)
+
+
+def empty_progress():
+    return {"learned_words": [], "scores": []}
+
+
+def _apply(state, learned, event):
+    # learned: learned_words 와 같은 내용의 set (포함 여부 확인용)
+    op = event["op"]
+    if op == "score":
+        state["scores"].append(event["data"])
+    elif op == "learned":
+        if event["word"] not in learned:
+            learned.add(event["word"])
+            state["learned_words"].append(event["word"])
+    elif op == "reset":
+        learned.clear()
+        state["learned_words"].clear()
+        state["scores"].clear()
+
+
+def _read_events(path):
+    if not os.path.exists(path):
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue  # 쓰다가 끊긴 줄
+
+
+def _repair_tail(path):
+    """쓰다가 끊긴 마지막 줄을 잘라낸다 (그 뒤에 덧붙인 줄까지 깨지지 않도록)
+
+    끝에서부터 TAIL_BLOCK 씩 거꾸로 읽어 마지막 줄바꿈만 찾는다 (저널 크기와 무관).
+    """
+    if not os.path.exists(path):
+        return
+    with open(path, "rb+") as f:
+        end = f.seek(0, os.SEEK_END)
+        if end == 0:
+            return
+        f.seek(end - 1)
+        if f.read(1) == b"\n":
+            return
+        cut = 0  # 줄바꿈이 하나도 없으면 전부 끊긴 줄
+        pos = end
+        while pos > 0:
+            start = max(0, pos - TAIL_BLOCK)
+            f.seek(start)
+            i = f.read(pos - start).rfind(b"\n")
+            if i >= 0:
+                cut = start + i + 1
+                break
+            pos = start
+        f.truncate(cut)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _fsync_dir(path):
+    # rename 이 디스크에 남도록 디렉터리도 fsync (Windows 는 지원 안 함)
+    if os.name == "nt":
+        return
+    fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def write_json_atomic(path, data, indent=None):
+    """임시 파일에 쓰고 fsync 후 rename (기존 파일은 완전히 바뀌거나 그대로)"""
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=indent)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    _fsync_dir(path)
+
+
+class ProgressStore:
+    def __init__(self, snapshot_path):
+        self.snapshot_path = snapshot_path
+        self.journal_path = os.path.splitext(snapshot_path)[0] + ".jsonl"
+        self.rotated_path = self.journal_path + ".1"  # 합치는 중인 저널
+        self.state = empty_progress()
+        self.learned = set()
+        self.lock = threading.Lock()
+        self._seq = 0
+        self._journal = None
+        self._journal_events = 0
+        self._unsynced = 0
+        self._last_fsync = time.monotonic()
+        self._compacting = False
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def load(self):
+        """스냅샷 + 저널을 읽어 state 를 만들고 저널 쓰기/백그라운드 스레드를 시작"""
+        snapshot_seq = 0
+        if os.path.exists(self.snapshot_path):
+            try:
+                with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                self.state = {"learned_words": data.get("learned_words", []), "scores": data.get("scores", [])}
+                snapshot_seq = data.get("seq", 0)
+            except (OSError, ValueError):
+                pass
+
+        self.learned = set(self.state["learned_words"])
+        self._seq = snapshot_seq
+        for path in (self.rotated_path, self.journal_path):
+            _repair_tail(path)
+            for event in _read_events(path):
+                if event.get("seq", 0) > snapshot_seq:
+                    _apply(self.state, self.learned, event)
+                    self._seq = max(self._seq, event["seq"])
+                    self._journal_events += 1
+
+        self._journal = open(self.journal_path, "a", encoding="utf-8")
+        self._thread = threading.Thread(target=self._run, name="progress-store", daemon=True)
+        self._thread.start()
+        return self.state
+
+    def is_learned(self, word):
+        return word in self.learned
+
+    # 이벤트 기록 (state 변경 + 저널 한 줄)
+    def add_score(self, score_data):
+        self._record({"op": "score", "data": score_data})
+
+    def add_learned(self, word):
+        self._record({"op": "learned", "word": word})
+
+    def reset(self):
+        self._record({"op": "reset"})
+
+    def _record(self, event):
+        with self.lock:
+            self._seq += 1
+            event["seq"] = self._seq
+            _apply(self.state, self.learned, event)
+            self._journal.write(json.dumps(event, ensure_ascii=False) + "\n")
+            self._journal.flush()
+            self._journal_events += 1
+            self._unsynced += 1
+            if self._unsynced >= FSYNC_BATCH:
+                self._fsync()
+
+    def _fsync(self):
+        if self._unsynced:
+            os.fsync(self._journal.fileno())
+            self._unsynced = 0
+        self._last_fsync = time.monotonic()
+
+    def compact(self):
+        """지금까지의 state 를 스냅샷으로 쓰고 저널을 비운다"""
+        with self.lock:
+            if self._compacting or (self._journal_events == 0 and not os.path.exists(self.rotated_path)):
+                return
+            self._compacting = True
+            self._fsync()
+            self._journal.close()
+            if os.path.exists(self.rotated_path):
+                # 지난번 합치기가 끝나지 못했으면 이어 붙인다 (순번으로 중복은 걸러진다)
+                with open(self.rotated_path, "a", encoding="utf-8") as rotated, \
+                        open(self.journal_path, "r", encoding="utf-8") as journal:
+                    rotated.write(journal.read())
+                    rotated.flush()
+                    os.fsync(rotated.fileno())
+                os.remove(self.journal_path)
+            else:
+                os.replace(self.journal_path, self.rotated_path)
+            self._journal = open(self.journal_path, "a", encoding="utf-8")
+            self._journal_events = 0
+            snapshot = {"learned_words": list(self.state["learned_words"]),
+                        "scores": list(self.state["scores"]),
+                        "seq": self._seq}
+
+        try:
+            write_json_atomic(self.snapshot_path, snapshot)
+            os.remove(self.rotated_path)
+        finally:
+            with self.lock:
+                self._compacting = False
+
+    def close(self):
+        self._stopped.set()
+        if self._thread is not None and self._thread.is_alive():
+            self._thread.join(timeout=5)
+        if self._journal is None or self._journal.closed:
+            return
+        self.compact()
+        with self.lock:
+            self._journal.close()
+
+    def _run(self):
+        while not self._stopped.wait(FSYNC_INTERVAL):
+            try:
+                with self.lock:
+                    if self._unsynced and time.monotonic() - self._last_fsync >= FSYNC_INTERVAL:
+                        self._fsync()
+                    should_compact = self._journal_events >= COMPACT_EVERY
+                if should_compact:
+                    self.compact()
+            except Exception as e:
+                print(f"학습 진도 저장 오류: {e}")
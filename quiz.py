@@ -0,0 +1,140 @@
+"""
+영어단어 퀴즈 문제 생성 (english.py)
+
+단어/뜻 배열을 미리 만들어 두고 단어를 추가/삭제할 때만 고친다.
+오답은 배열에서 임의 위치를 뽑고, 정답과 같거나 이미 뽑은 값이면 다시 뽑는다
+(rejection sampling). 단어장이 커져도 문제 하나 만드는 비용은 거의 그대로다.
+
+hard=True 이면 정답과 앞 글자(PREFIX_LEN)가 같은 단어/뜻을 먼저 오답으로 고른다.
+앞 글자별 묶음에는 배열 위치를 넣고, 위치마다 묶음 안의 자리를 따로 적어 두어서
+삭제도 자리를 찾아 마지막 원소와 바꾼 뒤 빼는 O(1) 이다.
+"""
+
+import random
+from collections import defaultdict
+
+from vocab_store import word_key
+
+PREFIX_LEN = 2
+MAX_TRIES = 8  # 오답 하나당 다시 뽑는 최대 횟수 (같은 뜻이 아주 많을 때 대비)
+
+
+def _prefix(text):
+    return word_key(text[:PREFIX_LEN])
+
+
+def _discard(buckets, key, where, slot):
+    # where[slot]: slot 이 묶음 안 몇 번째인지. 마지막 원소를 그 자리로 옮기고 뺀다
+    bucket = buckets[key]
+    last = bucket.pop()
+    if last != slot:
+        bucket[where[slot]] = last
+        where[last] = where[slot]
+    if not bucket:
+        del buckets[key]
+
+
+def _relocate(buckets, key, where, old, new):
+    # 배열에서 old 위치의 항목이 new 로 옮겨졌을 때 묶음 안의 값도 바꾼다
+    buckets[key][where[old]] = new
+    where[new] = where[old]
+
+
+class QuizEngine:
+    def __init__(self, vocabulary=(), rng=None):
+        self.rng = rng or random.Random()
+        self.entries = []    # 단어장 항목 (순서는 단어장과 다를 수 있다)
+        self.words = []
+        self.meanings = []
+        self._slot = {}      # word_key(단어) -> 배열 위치
+        self._word_prefix = defaultdict(list)     # 앞 글자 -> 배열 위치들 (단어 기준)
+        self._meaning_prefix = defaultdict(list)  # 앞 글자 -> 배열 위치들 (뜻 기준)
+        self._word_where = []     # 배열 위치 -> _word_prefix 묶음 안의 자리
+        self._meaning_where = []  # 배열 위치 -> _meaning_prefix 묶음 안의 자리
+        for entry in vocabulary:
+            self.add(entry)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def add(self, entry):
+        slot = len(self.entries)
+        self._slot[word_key(entry["word"])] = slot
+        self.entries.append(entry)
+        self.words.append(entry["word"])
+        self.meanings.append(entry["meaning"])
+        for buckets, where, text in ((self._word_prefix, self._word_where, entry["word"]),
+                                     (self._meaning_prefix, self._meaning_where, entry["meaning"])):
+            bucket = buckets[_prefix(text)]
+            where.append(len(bucket))
+            bucket.append(slot)
+
+    def remove(self, word):
+        """단어 삭제 (마지막 항목을 빈 자리로 옮겨서 O(1))"""
+        slot = self._slot.pop(word_key(word), None)
+        if slot is None:
+            return False
+        _discard(self._word_prefix, _prefix(self.words[slot]), self._word_where, slot)
+        _discard(self._meaning_prefix, _prefix(self.meanings[slot]), self._meaning_where, slot)
+
+        last = len(self.entries) - 1
+        if slot != last:
+            moved = self.entries[last]
+            self.entries[slot] = moved
+            self.words[slot] = self.words[last]
+            self.meanings[slot] = self.meanings[last]
+            self._slot[word_key(moved["word"])] = slot
+            _relocate(self._word_prefix, _prefix(self.words[slot]), self._word_where, last, slot)
+            _relocate(self._meaning_prefix, _prefix(self.meanings[slot]), self._meaning_where, last, slot)
+        self.entries.pop()
+        self.words.pop()
+        self.meanings.pop()
+        self._word_where.pop()
+        self._meaning_where.pop()
+        return True
+
+    def _sample(self, pool, answer, chosen, count, values=None):
+        # pool 에서 answer/chosen 과 겹치지 않는 값을 count 개까지 뽑아 chosen 에 추가
+        # (values 를 주면 pool 은 values 의 위치 목록)
+        tries = count * MAX_TRIES
+        while count > 0 and tries > 0 and pool:
+            tries -= 1
+            value = pool[self.rng.randrange(len(pool))]
+            if values is not None:
+                value = values[value]
+            if value != answer and value not in chosen:
+                chosen.append(value)
+                count -= 1
+        return count
+
+    def distractors(self, answer, kind, k=3, hard=False):
+        """answer 와 다른 오답 최대 k 개. kind 는 "word" 또는 "meaning" """
+        pool, buckets = (self.words, self._word_prefix) if kind == "word" else (self.meanings, self._meaning_prefix)
+        chosen = []
+        left = k
+        if hard:
+            left = self._sample(buckets.get(_prefix(answer), ()), answer, chosen, left, values=pool)
+        left = self._sample(pool, answer, chosen, left)
+        if left > 0:
+            # 서로 다른 값이 거의 없을 때만 (단어장이 아주 작거나 같은 뜻이 대부분)
+            rest = sorted(set(pool) - set(chosen) - {answer})
+            chosen.extend(self.rng.sample(rest, min(left, len(rest))))
+        return chosen
+
+    def question(self, question_type, k=3, hard=False, word=None):
+        """(문제 항목, 선택지, 정답 위치). question_type 은 "en_to_kr" 또는 "kr_to_en"
+
+        word 를 주면 그 단어로, 아니면 임의의 단어로 낸다.
+        """
+        if word is not None:
+            entry = self.entries[self._slot[word_key(word)]]
+        else:
+            entry = self.entries[self.rng.randrange(len(self.entries))]
+        if question_type == "en_to_kr":
+            answer, kind = entry["meaning"], "meaning"
+        else:
+            answer, kind = entry["word"], "word"
+
+        options = self.distractors(answer, kind, k, hard) + [answer]
+        self.rng.shuffle(options)
+        return entry, options, options.index(answer)
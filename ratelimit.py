@@ -0,0 +1,181 @@
+"""
+전투/강화/상점 요청 속도 제한과 중복 요청 합치기
+
+1) 합치기: 같은 플레이어가 같은 요청(같은 폼 값)을 보냈는데 앞의 요청이 아직
+   처리 중이면, 새로 처리하지 않고 앞 요청의 응답을 그대로 돌려준다.
+   (스레드 워커/ASGI 에서 연타가 한꺼번에 들어오는 경우)
+2) 속도 제한: 플레이어별·엔드포인트별 토큰 버킷. 초당 RATE_LIMIT_RATE 개씩 채워지고
+   최대 RATE_LIMIT_BURST 개까지 모인다. 토큰이 없으면 429.
+
+RATE_LIMIT_BACKEND
+- memory (기본): 프로세스 메모리. 워커마다 따로 센다
+- sqlite: rate_limits 테이블. 워커끼리 공유하지만 요청마다 쓰기가 한 번 늘어난다
+- off: 끔
+"""
+
+import functools
+import threading
+import time
+from collections import OrderedDict
+
+from flask import Response, current_app, jsonify, request, session
+
+import db
+
+PURGE_EVERY = 1000   # sqlite: take() 몇 번마다 오래된 버킷을 지울지
+IDLE_TTL = 3600      # 이 시간 동안 안 쓴 버킷은 지운다
+
+
+class MemoryRateLimiter:
+    def __init__(self, rate, burst, max_keys=100000):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._buckets = OrderedDict()  # key -> [tokens, updated_at]
+
+    def take(self, key):
+        """토큰 하나 사용. (허용 여부, 다음 토큰까지 남은 초)"""
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [self.burst, now]
+                if len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+                bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                return True, 0.0
+            return False, (1 - bucket[0]) / self.rate
+
+
+class SQLiteRateLimiter:
+    """토큰 계산과 차감을 UPSERT 한 문장으로 (동시에 와도 원자적)"""
+
+    TAKE_SQL = """INSERT INTO rate_limits (key, tokens, updated_at) VALUES (:key, :burst - 1, :now)
+                  ON CONFLICT(key) DO UPDATE SET
+                      tokens = min(:burst, tokens + (:now - updated_at) * :rate) - 1,
+                      updated_at = :now
+                  WHERE min(:burst, tokens + (:now - updated_at) * :rate) >= 1
+                  RETURNING tokens"""
+
+    def __init__(self, path, rate, burst):
+        self.path = path
+        self.rate = rate
+        self.burst = burst
+        self._takes = 0
+
+    def take(self, key):
+        now = time.time()
+        conn = db.get_db(self.path)
+        params = {"key": key, "burst": self.burst, "rate": self.rate, "now": now}
+        allowed = bool(conn.execute(self.TAKE_SQL, params).fetchall())
+
+        self._takes += 1
+        if self._takes % PURGE_EVERY == 0:
+            conn.execute("DELETE FROM rate_limits WHERE updated_at < ?", (now - IDLE_TTL,))
+
+        if allowed:
+            return True, 0.0
+        (tokens, updated_at), = conn.execute(
+            "SELECT tokens, updated_at FROM rate_limits WHERE key=?", (key,)).fetchall()
+        tokens = min(self.burst, tokens + (now - updated_at) * self.rate)
+        return False, max(0.0, (1 - tokens) / self.rate)
+
+
+class Coalescer:
+    """같은 키의 요청이 처리 중이면 끝날 때까지 기다렸다가 그 결과를 공유"""
+
+    def __init__(self, timeout=10.0):
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._inflight = {}  # key -> [Event, 결과]
+
+    def run(self, key, func):
+        with self._lock:
+            call = self._inflight.get(key)
+            leader = call is None
+            if leader:
+                call = self._inflight[key] = [threading.Event(), None]
+
+        if not leader:
+            if call[0].wait(self.timeout) and call[1] is not None:
+                return call[1], True
+            return None, True  # 앞 요청이 실패/시간 초과
+
+        try:
+            call[1] = func()
+            return call[1], False
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            call[0].set()
+
+
+def create_rate_limiter(kind, path, rate, burst):
+    if kind == "memory":
+        return MemoryRateLimiter(rate, burst)
+    if kind == "sqlite":
+        return SQLiteRateLimiter(path, rate, burst)
+    if kind == "off":
+        return None
+    raise ValueError(f"알 수 없는 RATE_LIMIT_BACKEND: {kind}")
+
+
+def _client_key():
+    return session.get("username") or request.remote_addr or "-"
+
+
+def _snapshot(response):
+    # 합쳐진 요청들이 같은 응답 본문을 받도록 (세션 쿠키는 먼저 온 요청에만 붙는다)
+    return response.get_data(), response.status_code, response.mimetype
+
+
+def protect(limiter, coalescer, exempt=None):
+    """라우트 데코레이터: 중복 요청 합치기 + 속도 제한
+
+    exempt() 가 참인 요청(상태를 바꾸지 않는 미리보기 등)은 토큰을 쓰지 않는다.
+    """
+
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            client = _client_key()
+            key = (client, request.endpoint, tuple(sorted(request.form.items())))
+
+            def process():
+                if limiter is not None and not (exempt is not None and exempt()):
+                    allowed, retry_after = limiter.take(f"{client}:{request.endpoint}")
+                    if not allowed:
+                        response = jsonify({"status": "fail", "message": "요청이 너무 빠릅니다. 잠시 후 다시 시도하세요.",
+                                            "retry_after": round(retry_after, 2)})
+                        response.status_code = 429
+                        response.headers["Retry-After"] = str(max(1, round(retry_after)))
+                        return response
+                return view(*args, **kwargs)
+
+            if coalescer is None:
+                return process()
+
+            result = {}
+
+            def lead():
+                result["response"] = response = current_app.make_response(process())
+                return _snapshot(response)
+
+            snapshot, joined = coalescer.run(key, lead)
+            if not joined:
+                return result["response"]
+            if snapshot is None:
+                return jsonify({"status": "fail", "message": "잠시 후 다시 시도하세요."}), 503
+            body, status, mimetype = snapshot
+            return Response(body, status=status, mimetype=mimetype)
+
+        return wrapper
+
+    return decorator
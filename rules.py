@@ -0,0 +1,116 @@
+"""
+RPG 게임 규칙 (전투/보상/레벨업/스테이지/강화)
+
+요청 처리 코드(game2.py)와 오프라인 시뮬레이터(simulate.py)가 같은 숫자를
+쓰도록 규칙을 한 곳에 모았다. DB 나 Flask 에 의존하지 않는 순수 함수만 둔다.
+시뮬레이터는 NumPy 로 같은 계산을 하므로 숫자는 상수로도 내보낸다.
+"""
+
+# 전투
+WEAPON_ATTACK_PER_LEVEL = 10   # 무기 강화 1단계당 데미지 보너스
+ARMOR_DEFENSE_PER_LEVEL = 5    # 방어구 강화 1단계당 방어 보너스
+MIN_DAMAGE = 1
+
+# 레벨업
+EXP_PER_LEVEL = 100            # 필요 경험치 = level * EXP_PER_LEVEL
+LEVELUP_MAX_HP = 20
+LEVELUP_ATTACK = 5
+LEVELUP_DEFENSE = 3
+STAGE_LEVEL_FACTOR = 2         # level >= stage * 2 이면 다음 스테이지
+
+# 회복/상점
+HEAL_AMOUNT = 50
+POTION_COST = 100
+
+# 강화
+ENHANCE_BASE_COST = {"weapon": 200, "armor": 150}
+ENHANCE_MAX_RATE = 0.9
+ENHANCE_RATE_STEP = 0.1
+ENHANCE_MIN_RATE = 0.3
+WEAPON_ENHANCE_ATTACK = 10
+ARMOR_ENHANCE_DEFENSE = 5
+ARMOR_ENHANCE_MAX_HP = 10
+ENHANCE_MAX_LEVEL = 1000       # 기대 비용 표를 이 단계까지만 만든다
+
+# 기본 몬스터: (이름, 스테이지, 체력, 공격력, 방어력, 경험치, 골드)
+DEFAULT_MONSTERS = [
+    ("슬라임", 1, 30, 8, 2, 15, 50),
+    ("고블린", 1, 50, 12, 3, 25, 80),
+    ("오크", 2, 80, 18, 5, 40, 120),
+    ("트롤", 2, 120, 25, 8, 60, 200),
+    ("드래곤", 3, 200, 40, 15, 100, 500),
+    ("데몬로드", 3, 300, 60, 20, 150, 800),
+]
+
+
+def player_damage(attack, weapon_level, monster_defense):
+    return max(MIN_DAMAGE, (attack + weapon_level * WEAPON_ATTACK_PER_LEVEL) - monster_defense)
+
+
+def monster_damage(monster_attack, defense, armor_level):
+    return max(MIN_DAMAGE, monster_attack - (defense + armor_level * ARMOR_DEFENSE_PER_LEVEL))
+
+
+def exp_needed(level):
+    return level * EXP_PER_LEVEL
+
+
+def check_levelup(level, exp, max_hp, attack, defense):
+    """레벨업 여부와 바뀔 필드 (한 번에 한 레벨만 오른다)"""
+    needed = exp_needed(level)
+    if exp < needed:
+        return False, {}
+
+    new_max_hp = max_hp + LEVELUP_MAX_HP
+    return True, {
+        "level": level + 1,
+        "exp": exp - needed,
+        "max_hp": new_max_hp,
+        "hp": new_max_hp,  # 레벨업 시 체력 회복
+        "attack": attack + LEVELUP_ATTACK,
+        "defense": defense + LEVELUP_DEFENSE,
+    }
+
+
+def should_advance_stage(level, stage):
+    return level >= stage * STAGE_LEVEL_FACTOR
+
+
+def heal_amount(hp, max_hp):
+    return min(HEAL_AMOUNT, max_hp - hp)
+
+
+def enhance_cost(kind, level):
+    return (level + 1) * ENHANCE_BASE_COST[kind]
+
+
+def enhance_success_rate(level):
+    # 강화 단계가 높을수록 성공률 감소
+    return max(ENHANCE_MIN_RATE, ENHANCE_MAX_RATE - level * ENHANCE_RATE_STEP)
+
+
+# 강화 기대 비용
+# 실패해도 단계가 떨어지지 않으므로 k -> k+1 은 성공 확률 p_k 의 기하분포:
+# 기대 시도 1/p_k 번, 기대 골드 cost_k/p_k. 목표까지는 단계별 기대값의 합이라
+# 누적합 표를 한 번 만들어 두면 어느 구간이든 뺄셈 한 번으로 나온다.
+_enhance_tables = {}  # kind -> (누적 기대 시도, 누적 기대 골드)
+
+
+def _enhance_table(kind):
+    table = _enhance_tables.get(kind)
+    if table is None:
+        attempts, gold = [0.0], [0.0]
+        for level in range(ENHANCE_MAX_LEVEL):
+            p = enhance_success_rate(level)
+            attempts.append(attempts[-1] + 1 / p)
+            gold.append(gold[-1] + enhance_cost(kind, level) / p)
+        table = _enhance_tables[kind] = (attempts, gold)
+    return table
+
+
+def enhance_expected(kind, from_level, to_level):
+    """from_level 에서 to_level 까지 (기대 시도 횟수, 기대 골드)"""
+    if not 0 <= from_level <= to_level <= ENHANCE_MAX_LEVEL:
+        raise ValueError(f"강화 단계 범위 오류: {from_level} -> {to_level}")
+    attempts, gold = _enhance_table(kind)
+    return attempts[to_level] - attempts[from_level], gold[to_level] - gold[from_level]
@@ -0,0 +1,128 @@
+"""
+영어단어 복습 일정 (SM-2)
+
+단어마다 ease(쉬움 정도), interval(복습 간격), reps(연속 정답 수), due(다음 복습 시각)를 둔다.
+- 맞히면 간격이 1일 -> 6일 -> 이전 간격 * ease 로 늘어나고
+- 틀리면 RELEARN_DELAY 뒤에 다시 나온다
+
+다음 복습할 단어는 due 순서 힙에서 꺼낸다 (O(log n)).
+단어 상태가 바뀌면 힙에서 지우지 않고 새 항목을 넣고, 꺼낼 때 낡은 항목은 버린다.
+처음 보는 단어는 due=0 이라 단어장 순서대로 바로 나온다.
+상태는 복습할 때마다 그 단어 한 행만 저장한다 (VocabularyStore.save_review).
+"""
+
+import heapq
+import time
+
+from vocab_store import word_key
+
+DEFAULT_EASE = 2.5
+MIN_EASE = 1.3
+DAY = 86400
+RELEARN_DELAY = 600  # 틀린 단어를 다시 보여줄 때까지 (초)
+QUALITY_CORRECT = 4
+QUALITY_WRONG = 1
+
+
+class Card:
+    __slots__ = ("word", "ease", "interval", "reps", "lapses", "due")
+
+    def __init__(self, word, ease=DEFAULT_EASE, interval=0.0, reps=0, lapses=0, due=0.0):
+        self.word = word
+        self.ease = ease
+        self.interval = interval  # 일
+        self.reps = reps
+        self.lapses = lapses
+        self.due = due
+
+
+def sm2(card, quality, now):
+    """SM-2 규칙으로 card 갱신. quality 는 0~5 (3 이상이 정답)"""
+    card.ease = max(MIN_EASE, card.ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+    if quality < 3:
+        card.reps = 0
+        card.interval = 0.0
+        card.lapses += 1
+        card.due = now + RELEARN_DELAY
+        return card
+
+    card.reps += 1
+    if card.reps == 1:
+        card.interval = 1.0
+    elif card.reps == 2:
+        card.interval = 6.0
+    else:
+        card.interval = round(card.interval * card.ease, 2)
+    card.due = now + card.interval * DAY
+    return card
+
+
+class Scheduler:
+    def __init__(self, words, store=None):
+        """words: 단어장 순서의 단어들, store: 저장된 복습 상태를 읽고 쓸 VocabularyStore"""
+        self.store = store
+        self.cards = {}  # word_key(단어) -> Card
+        self._heap = []
+        self._order = 0  # 같은 due 면 먼저 넣은 단어부터
+        saved = store.load_reviews() if store is not None else {}
+        for word in words:
+            state = saved.get(word_key(word))
+            card = Card(word, *state) if state else Card(word)
+            self.cards[word_key(word)] = card
+            self._heap.append((card.due, self._next_order(), card.word))
+        heapq.heapify(self._heap)
+
+    def __len__(self):
+        return len(self.cards)
+
+    def _next_order(self):
+        self._order += 1
+        return self._order
+
+    def _push(self, card):
+        heapq.heappush(self._heap, (card.due, self._next_order(), card.word))
+        if len(self._heap) > 2 * len(self.cards) + 64:
+            # 낡은 항목이 너무 많이 쌓이면 현재 카드로 다시 만든다
+            self._heap = [(c.due, self._next_order(), c.word) for c in self.cards.values()]
+            heapq.heapify(self._heap)
+
+    def _top(self):
+        # 지워졌거나 due 가 바뀐 단어의 낡은 항목은 버린다
+        while self._heap:
+            due, _, word = self._heap[0]
+            card = self.cards.get(word_key(word))
+            if card is not None and card.word == word and card.due == due:
+                return card
+            heapq.heappop(self._heap)
+        return None
+
+    def add(self, word):
+        card = self.cards[word_key(word)] = Card(word)
+        self._push(card)
+
+    def remove(self, word):
+        # 힙 항목은 꺼낼 때 버린다
+        self.cards.pop(word_key(word), None)
+
+    def next_due(self, now=None):
+        """지금 복습할 단어 (없으면 None). 꺼내지 않고 보기만 한다"""
+        card = self._top()
+        if card is None or card.due > (time.time() if now is None else now):
+            return None
+        return card.word
+
+    def next_review_at(self):
+        """가장 빠른 다음 복습 시각 (단어가 없으면 None)"""
+        card = self._top()
+        return None if card is None else card.due
+
+    def review(self, word, correct, now=None):
+        card = self.cards.get(word_key(word))
+        if card is None:
+            return None
+        now = time.time() if now is None else now
+        sm2(card, QUALITY_CORRECT if correct else QUALITY_WRONG, now)
+        self._push(card)
+        if self.store is not None:
+            self.store.save_review(card)
+        return card
@@ -0,0 +1,344 @@
+"""
+전투/경제 몬테카를로 시뮬레이터 (오프라인)
+
+rules.py 의 규칙을 NumPy 배열 연산으로 옮겨서 수십만~수백만 명의 가상
+플레이어를 동시에 진행시킨다. 실제 트래픽 없이 밸런스와 서버 용량을
+가늠하기 위한 도구다.
+
+각 플레이어는 자기 속도(초당 요청 수, 로그정규 분포)로 요청을 보낸다.
+한 스텝마다 모든 플레이어가 요청을 하나씩 처리하고, 각자의 시계가
+horizon 을 넘으면 멈춘다.
+
+행동 정책 (우선순위 순):
+  1. 체력이 낮으면 물약 사용 (/heal)
+  2. 물약이 없으면 구매 (/shop)
+  3. 전투 중이 아니고 골드가 넉넉하면 장비 강화 (/enhance, 무기/방어구 번갈아)
+  4. 전투 중이면 공격 (/attack, --auto 면 /battle/auto 로 전투 전체)
+  5. 아니면 전투 시작 (/start_battle)
+
+출력: 스테이지 도달 시간, 골드 흐름, 플레이어당 시간당 요청 수 분포
+
+사용법:
+    pip install -r requirements-tools.txt   # numpy (서버 배포에는 필요 없음)
+    python simulate.py --players 1000000 --hours 2
+    python simulate.py --players 100000 --auto --json
+"""
+
+import argparse
+import json
+import sys
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+import rules
+
+ROUTES = ("heal", "shop", "enhance", "attack", "start_battle")
+IDLE, HEAL, SHOP, ENHANCE, ATTACK, START = range(6)
+AUTO_BATTLE_MAX_TURNS = 500
+
+
+class Simulation:
+    def __init__(self, players, hours, rate_median=0.5, rate_sigma=0.5, auto_battle=False,
+                 heal_threshold=0.35, enhance_reserve=300, seed=None, monsters=rules.DEFAULT_MONSTERS):
+        self.n = players
+        self.horizon = hours * 3600.0
+        self.auto_battle = auto_battle
+        self.heal_threshold = heal_threshold
+        self.enhance_reserve = enhance_reserve
+        self.rng = np.random.default_rng(seed)
+
+        n = players
+        i32 = np.int32
+        self.rate = self.rng.lognormal(np.log(rate_median), rate_sigma, n)  # 초당 요청 수
+        self.clock = np.zeros(n)
+
+        # 플레이어 상태 (users 테이블 기본값과 같게)
+        self.level = np.ones(n, i32)
+        self.exp = np.zeros(n, i32)
+        self.hp = np.full(n, 100, i32)
+        self.max_hp = np.full(n, 100, i32)
+        self.attack = np.full(n, 10, i32)
+        self.defense = np.full(n, 5, i32)
+        self.money = np.full(n, 1000, np.int64)
+        self.weapon_level = np.zeros(n, i32)
+        self.armor_level = np.zeros(n, i32)
+        self.potions = np.full(n, 3, i32)
+        self.stage = np.ones(n, i32)
+
+        # 현재 전투 중인 몬스터
+        self.in_battle = np.zeros(n, bool)
+        self.m_hp = np.zeros(n, i32)
+        self.m_attack = np.zeros(n, i32)
+        self.m_defense = np.zeros(n, i32)
+        self.m_exp = np.zeros(n, i32)
+        self.m_money = np.zeros(n, i32)
+
+        # 몬스터 표: 스테이지 순으로 정렬해 두고 스테이지별 시작 위치/개수로 뽑는다
+        table = np.array(sorted((m[1:] for m in monsters), key=lambda m: m[0]), dtype=np.int64)
+        self.mon_stage, self.mon_hp, self.mon_attack, self.mon_defense, self.mon_exp, self.mon_money = table.T
+        self.max_stage = int(self.mon_stage.max())
+        counts = np.bincount(self.mon_stage, minlength=self.max_stage + 2)
+        self.stage_count = counts
+        self.stage_offset = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+        # 통계
+        self.requests = {route: np.zeros(n, np.int32) for route in ROUTES}
+        self.reached = np.full((self.max_stage + 2, n), np.nan)  # 스테이지 처음 도달 시각(초)
+        self.reached[1] = 0.0
+        self.gold_earned = 0
+        self.gold_potions = 0
+        self.gold_enhance = 0
+        self.enhance_attempts = 0
+        self.enhance_successes = 0
+        self.stuck = np.zeros(n, bool)  # 체력 0, 물약 0, 골드 부족으로 더 진행 불가
+
+    def run(self):
+        steps = 0
+        while True:
+            active = np.flatnonzero(self.clock < self.horizon)
+            if active.size == 0:
+                break
+            self.step(active)
+            steps += 1
+        return steps
+
+    def step(self, idx):
+        action = self.choose_actions(idx)
+
+        # 할 수 있는 게 없는 플레이어는 멈춘다 (막힘 또는 마지막 스테이지 도달)
+        idle = idx[action == IDLE]
+        self.stuck[idle] = self.hp[idle] <= 0
+        self.clock[idle] = self.horizon
+
+        for code, route, apply in ((HEAL, "heal", self.apply_heal), (SHOP, "shop", self.apply_shop),
+                                   (ENHANCE, "enhance", self.apply_enhance), (ATTACK, "attack", self.apply_attack),
+                                   (START, "start_battle", self.apply_start)):
+            sel = idx[action == code]
+            if sel.size:
+                self.requests[route][sel] += 1
+                apply(sel)
+
+        acted = idx[action != IDLE]
+        self.clock[acted] += self.rng.exponential(1.0 / self.rate[acted])
+
+    def choose_actions(self, idx):
+        hp, max_hp = self.hp[idx], self.max_hp[idx]
+        potions, money = self.potions[idx], self.money[idx]
+        in_battle = self.in_battle[idx]
+        alive = hp > 0
+
+        low = hp < max_hp * self.heal_threshold
+        cost = self.next_enhance_cost(idx)
+        has_monsters = self.stage_count[np.minimum(self.stage[idx], self.max_stage + 1)] > 0
+
+        return np.select(
+            [
+                low & (potions > 0),
+                low & (potions == 0) & (money >= rules.POTION_COST),
+                ~in_battle & alive & (money >= cost + self.enhance_reserve),
+                in_battle & alive,
+                ~in_battle & alive & has_monsters,
+            ],
+            [HEAL, SHOP, ENHANCE, ATTACK, START],
+            IDLE,
+        )
+
+    def next_enhance_cost(self, idx):
+        weapon = self.weapon_level[idx] <= self.armor_level[idx]
+        level = np.where(weapon, self.weapon_level[idx], self.armor_level[idx])
+        base = np.where(weapon, rules.ENHANCE_BASE_COST["weapon"], rules.ENHANCE_BASE_COST["armor"])
+        return (level + 1) * base
+
+    def apply_heal(self, idx):
+        amount = np.minimum(rules.HEAL_AMOUNT, self.max_hp[idx] - self.hp[idx])
+        self.hp[idx] += amount
+        self.potions[idx] -= 1
+
+    def apply_shop(self, idx):
+        self.money[idx] -= rules.POTION_COST
+        self.potions[idx] += 1
+        self.gold_potions += rules.POTION_COST * idx.size
+
+    def apply_enhance(self, idx):
+        weapon = self.weapon_level[idx] <= self.armor_level[idx]
+        level = np.where(weapon, self.weapon_level[idx], self.armor_level[idx])
+        cost = self.next_enhance_cost(idx)
+        rate = np.maximum(rules.ENHANCE_MIN_RATE, rules.ENHANCE_MAX_RATE - level * rules.ENHANCE_RATE_STEP)
+        success = self.rng.random(idx.size) < rate
+
+        self.money[idx] -= cost
+        self.gold_enhance += int(cost.sum())
+        self.enhance_attempts += idx.size
+        self.enhance_successes += int(success.sum())
+
+        w = idx[success & weapon]
+        self.weapon_level[w] += 1
+        self.attack[w] += rules.WEAPON_ENHANCE_ATTACK
+        a = idx[success & ~weapon]
+        self.armor_level[a] += 1
+        self.defense[a] += rules.ARMOR_ENHANCE_DEFENSE
+        self.max_hp[a] += rules.ARMOR_ENHANCE_MAX_HP
+
+    def apply_start(self, idx):
+        stage = self.stage[idx]
+        pick = self.stage_offset[stage] + (self.rng.random(idx.size) * self.stage_count[stage]).astype(np.int64)
+        self.m_hp[idx] = self.mon_hp[pick]
+        self.m_attack[idx] = self.mon_attack[pick]
+        self.m_defense[idx] = self.mon_defense[pick]
+        self.m_exp[idx] = self.mon_exp[pick]
+        self.m_money[idx] = self.mon_money[pick]
+        self.in_battle[idx] = True
+
+    def apply_attack(self, idx):
+        if not self.auto_battle:
+            self.battle_turn(idx)
+            return
+        # 자동 전투: 끝날 때까지 턴 반복 (요청은 한 번)
+        turns = 0
+        while idx.size and turns < AUTO_BATTLE_MAX_TURNS:
+            idx = idx[self.battle_turn(idx)]
+            turns += 1
+
+    def battle_turn(self, idx):
+        """한 턴 진행. 전투가 계속되는 플레이어 마스크 반환"""
+        damage = np.maximum(rules.MIN_DAMAGE,
+                            self.attack[idx] + self.weapon_level[idx] * rules.WEAPON_ATTACK_PER_LEVEL
+                            - self.m_defense[idx])
+        self.m_hp[idx] -= damage
+        killed = self.m_hp[idx] <= 0
+
+        self.apply_kill(idx[killed], self.clock[idx[killed]])
+
+        rest = idx[~killed]
+        taken = np.maximum(rules.MIN_DAMAGE,
+                           self.m_attack[rest]
+                           - (self.defense[rest] + self.armor_level[rest] * rules.ARMOR_DEFENSE_PER_LEVEL))
+        self.hp[rest] = np.maximum(0, self.hp[rest] - taken)
+        dead = self.hp[rest] <= 0
+        self.in_battle[rest[dead]] = False
+
+        ongoing = ~killed
+        ongoing[~killed] = ~dead
+        return ongoing
+
+    def apply_kill(self, idx, now):
+        self.in_battle[idx] = False
+        self.exp[idx] += self.m_exp[idx]
+        self.money[idx] += self.m_money[idx]
+        self.gold_earned += int(self.m_money[idx].sum())
+
+        level_before = self.level[idx].copy()
+
+        # 레벨업 (한 번에 한 레벨)
+        up = self.exp[idx] >= self.level[idx] * rules.EXP_PER_LEVEL
+        u = idx[up]
+        self.exp[u] -= self.level[u] * rules.EXP_PER_LEVEL
+        self.level[u] += 1
+        self.max_hp[u] += rules.LEVELUP_MAX_HP
+        self.hp[u] = self.max_hp[u]
+        self.attack[u] += rules.LEVELUP_ATTACK
+        self.defense[u] += rules.LEVELUP_DEFENSE
+
+        # 스테이지 이동 (레벨업 이전 레벨 기준, game2 와 같게)
+        adv = level_before >= self.stage[idx] * rules.STAGE_LEVEL_FACTOR
+        s = idx[adv]
+        self.stage[s] += 1
+        new_stage = np.minimum(self.stage[s], self.max_stage + 1)
+        first = np.isnan(self.reached[new_stage, s])
+        self.reached[new_stage[first], s[first]] = now[adv][first]
+
+    def report(self):
+        played_hours = np.minimum(self.clock, self.horizon) / 3600.0
+        played_hours = np.maximum(played_hours, 1e-9)
+        total = sum(self.requests.values())
+        per_hour = total / played_hours
+        player_hours = float(played_hours.sum())
+
+        stages = {}
+        for s in range(2, self.max_stage + 2):
+            t = self.reached[s]
+            got = ~np.isnan(t)
+            entry = {"reached": float(got.mean())}
+            if got.any():
+                minutes = t[got] / 60.0
+                entry.update({f"p{q}_minutes": float(np.percentile(minutes, q)) for q in (10, 50, 90)})
+            stages[str(s)] = entry
+
+        total_requests = int(total.sum())
+        return {
+            "players": self.n,
+            "hours": self.horizon / 3600.0,
+            "mode": "auto" if self.auto_battle else "attack",
+            "time_to_stage": stages,
+            "gold_per_player_hour": {
+                "earned": self.gold_earned / player_hours,
+                "spent_potions": self.gold_potions / player_hours,
+                "spent_enhance": self.gold_enhance / player_hours,
+            },
+            "enhance_success_rate": self.enhance_successes / max(1, self.enhance_attempts),
+            "requests_per_player_hour": {
+                "mean": float(per_hour.mean()),
+                **{f"p{q}": float(np.percentile(per_hour, q)) for q in (10, 50, 90, 99)},
+            },
+            "route_share": {route: int(c.sum()) / max(1, total_requests) for route, c in self.requests.items()},
+            "requests_per_second_per_1000_players": total_requests / self.horizon * 1000 / self.n,
+            "stuck": float(self.stuck.mean()),
+            "final_level": {f"p{q}": float(np.percentile(self.level, q)) for q in (10, 50, 90)},
+        }
+
+
+def print_report(result, elapsed, steps):
+    print(f"플레이어 {result['players']:,}명, {result['hours']}시간 ({result['mode']} 모드) "
+          f"- {steps} 스텝, {elapsed:.1f}초")
+    print("\n[스테이지 도달 시간 (분)]")
+    for stage, entry in result["time_to_stage"].items():
+        line = f"  스테이지 {stage}: 도달 {entry['reached'] * 100:5.1f}%"
+        if "p50_minutes" in entry:
+            line += f"  p10 {entry['p10_minutes']:7.1f}  p50 {entry['p50_minutes']:7.1f}  p90 {entry['p90_minutes']:7.1f}"
+        print(line)
+    gold = result["gold_per_player_hour"]
+    print("\n[골드 흐름 (플레이어·시간당)]")
+    print(f"  획득 {gold['earned']:.0f}G  물약 {gold['spent_potions']:.0f}G  강화 {gold['spent_enhance']:.0f}G"
+          f"  (강화 성공률 {result['enhance_success_rate'] * 100:.1f}%)")
+    req = result["requests_per_player_hour"]
+    print("\n[플레이어당 시간당 요청 수]")
+    print(f"  평균 {req['mean']:.0f}  p10 {req['p10']:.0f}  p50 {req['p50']:.0f}  p90 {req['p90']:.0f}  p99 {req['p99']:.0f}")
+    print("  경로별 비율: " + ", ".join(f"{r} {s * 100:.1f}%" for r, s in result["route_share"].items()))
+    print(f"  동시 접속 1000명당 평균 {result['requests_per_second_per_1000_players']:.1f} req/s")
+    print(f"\n막힌 플레이어(체력 0, 물약/골드 없음): {result['stuck'] * 100:.1f}%")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="RPG 전투/경제 몬테카를로 시뮬레이터")
+    parser.add_argument("--players", type=int, default=100000)
+    parser.add_argument("--hours", type=float, default=1.0)
+    parser.add_argument("--rate", type=float, default=0.5, help="플레이어 요청 속도 중앙값 (초당)")
+    parser.add_argument("--rate-sigma", type=float, default=0.5, help="요청 속도 로그정규 분산")
+    parser.add_argument("--auto", action="store_true", help="/battle/auto 로 전투 전체를 한 요청에 처리")
+    parser.add_argument("--heal-threshold", type=float, default=0.35)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--json", action="store_true", help="결과를 JSON 으로 출력")
+    args = parser.parse_args(argv)
+
+    if np is None:
+        sys.exit("numpy 가 필요합니다: pip install -r requirements-tools.txt")
+
+    sim = Simulation(args.players, args.hours, rate_median=args.rate, rate_sigma=args.rate_sigma,
+                     auto_battle=args.auto, heal_threshold=args.heal_threshold, seed=args.seed)
+    started = time.perf_counter()
+    steps = sim.run()
+    elapsed = time.perf_counter() - started
+
+    result = sim.report()
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+    else:
+        print_report(result, elapsed, steps)
+
+
+if __name__ == "__main__":
+    main()
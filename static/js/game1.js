@@ -0,0 +1,154 @@
+// 게임 데이터
+const ranks = ["인턴","사원","대리","과장","부장","전무","사장","회장","명예회장","재벌총수","세계재벌왕"]
+const probs = [0.7,0.6,0.5,0.4,0.3,0.2,0.1,0.08,0.05,0.03]
+const baseCost = 100
+const baseIncome = 10
+
+let level = 0
+let money = 0
+let income = baseIncome
+let boostOwned = 0
+let protectOwned = 0
+let autoOn = false
+
+// item costs scale with level: base * (2^level) * factor
+function calcPromotionCost(l){ return Math.floor(baseCost * Math.pow(2,l)) }
+function calcBoostCost(l){ return Math.floor(500 * Math.pow(1.9, l)) }
+function calcProtectCost(l){ return Math.floor(1000 * Math.pow(1.9, l)) }
+
+// DOM
+const moneyEl = document.getElementById('money')
+const incomeEl = document.getElementById('income')
+const rankEl = document.getElementById('rank')
+const levelEl = document.getElementById('level')
+const probEl = document.getElementById('prob')
+const costEl = document.getElementById('cost')
+const msg = document.getElementById('message')
+const promoteBtn = document.getElementById('promote')
+const buyBoostBtn = document.getElementById('buyBoost')
+const buyProtectBtn = document.getElementById('buyProtect')
+const itemsOwnedEl = document.getElementById('itemsOwned')
+const boostCostEl = document.getElementById('boostCost')
+const protectCostEl = document.getElementById('protectCost')
+const autoBtn = document.getElementById('auto')
+
+function updateUI(){
+  moneyEl.textContent = money
+  incomeEl.textContent = income
+  rankEl.textContent = ranks[level]
+  levelEl.textContent = level
+  if(level < ranks.length - 1){
+    probEl.textContent = Math.round(probs[level]*100) + '%'
+    costEl.textContent = calcPromotionCost(level)
+  } else {
+    probEl.textContent = '---'
+    costEl.textContent = '최고'
+  }
+  boostCostEl.textContent = calcBoostCost(level)
+  protectCostEl.textContent = calcProtectCost(level)
+  itemsOwnedEl.textContent = (boostOwned? '확률+' + boostOwned*10 + '% ':'') + (protectOwned? '강등방지 x'+protectOwned : '없음')
+}
+
+// income tick
+setInterval(()=>{
+  money += income
+  updateUI()
+  if(autoOn) tryAutoPromote()
+},1000)
+
+function showMessage(text, cls){
+  msg.textContent = text
+  msg.classList.remove('flash','shake')
+  void msg.offsetWidth
+  if(cls === 'success') msg.classList.add('flash')
+  if(cls === 'fail') msg.classList.add('shake')
+}
+
+function promote(){
+  if(level >= ranks.length -1){ showMessage('최고 직급입니다!', 'success'); return }
+  const cost = calcPromotionCost(level)
+  if(money < cost){ showMessage('돈이 부족합니다!', 'fail'); return }
+  money -= cost
+  let chance = probs[level]
+  if(boostOwned>0){ chance += 0.10; boostOwned--; }
+
+  const succ = Math.random() < chance
+  if(succ){
+    level++
+    income = baseIncome * Math.pow(2, level)
+    showMessage('✅ 승진 성공! ' + ranks[level], 'success')
+    burstConfetti()
+  } else {
+    if(protectOwned>0){ protectOwned--; showMessage('❌ 승진 실패! (아이템으로 강등 방지)', 'fail') }
+    else {
+      if(level>0) { level--; income = baseIncome * Math.pow(2, level); showMessage('❌ 승진 실패! 한 단계 강등', 'fail') }
+      else showMessage('❌ 승진 실패! (강등 없음)', 'fail')
+    }
+    shakeScreen()
+  }
+  updateUI()
+}
+
+// auto try if money enough
+function tryAutoPromote(){
+  if(level >= ranks.length -1) return
+  const cost = calcPromotionCost(level)
+  if(money >= cost) promote()
+}
+
+promoteBtn.addEventListener('click', promote)
+
+buyBoostBtn.addEventListener('click', ()=>{
+  const c = calcBoostCost(level)
+  if(money >= c){ money -= c; boostOwned++; showMessage('확률+10% 아이템 구매', 'success'); updateUI() }
+  else showMessage('돈이 부족합니다', 'fail')
+})
+
+buyProtectBtn.addEventListener('click', ()=>{
+  const c = calcProtectCost(level)
+  if(money >= c){ money -= c; protectOwned++; showMessage('강등방지 아이템 구매', 'success'); updateUI() }
+  else showMessage('돈이 부족합니다', 'fail')
+})
+
+autoBtn.addEventListener('click', ()=>{
+  autoOn = !autoOn
+  autoBtn.textContent = autoOn? '자동(ON)': '자동(OFF)'
+  autoBtn.classList.toggle('muted')
+})
+
+// visual effects: confetti + shake
+const canvas = document.getElementById('confettiCanvas')
+const ctx = canvas.getContext('2d')
+let W, H, confettiPieces = []
+function resize(){ W = canvas.width = canvas.clientWidth; H = canvas.height = canvas.clientHeight }
+window.addEventListener('resize', resize)
+resize()
+
+function rand(min,max){ return Math.random()*(max-min)+min }
+function spawnConfetti(n=40){
+  for(let i=0;i<n;i++){
+    confettiPieces.push({x:rand(0,W), y:rand(-H,0), vx:rand(-0.5,0.5), vy:rand(1,4), rot:rand(0,360), vr:rand(-6,6), color:`hsl(${Math.floor(rand(0,360))},80%,60%)`, size:rand(6,12)})
+  }
+}
+function burstConfetti(){ spawnConfetti(80) }
+
+function draw(){
+  ctx.clearRect(0,0,W,H)
+  for(let p of confettiPieces){
+    p.x += p.vx; p.y += p.vy; p.rot += p.vr * 0.02
+    ctx.save(); ctx.translate(p.x,p.y); ctx.rotate(p.rot);
+    ctx.fillStyle = p.color; ctx.fillRect(-p.size/2, -p.size/2, p.size, p.size*0.6);
+    ctx.restore();
+  }
+  confettiPieces = confettiPieces.filter(p => p.y < H + 50)
+  requestAnimationFrame(draw)
+}
+draw()
+
+function shakeScreen(){
+  const el = document.querySelector('.wrap')
+  el.classList.remove('shake'); void el.offsetWidth; el.classList.add('shake')
+}
+
+// 시작 UI 세팅
+updateUI()
@@ -0,0 +1,235 @@
+let currentMonster = null;
+let battleInProgress = false;
+// 서버가 마지막으로 보내 준 플레이어 상태 버전 (응답은 이 버전 이후 바뀐 필드만 담는다)
+let stateVersion = parseInt(document.body.dataset.version);
+
+// 로그 추가 함수
+function addLog(message, type = 'info') {
+    const logContent = $("#log-content");
+    const timestamp = new Date().toLocaleTimeString();
+    const colorClass = type === 'damage' ? 'text-danger' : type === 'heal' ? 'text-success' : 'text-info';
+    logContent.append(`<div class="${colorClass}">[${timestamp}] ${message}</div>`);
+    logContent.scrollTop(logContent[0].scrollHeight);
+}
+
+// 플레이어 상태 업데이트 (응답에 들어 있는 필드만 반영)
+const PLAYER_FIELDS = ["level", "exp", "hp", "max_hp", "attack", "defense", "money",
+                       "weapon_level", "armor_level", "potions", "stage"];
+
+function updatePlayerStats(data) {
+    for (const field of PLAYER_FIELDS) {
+        if (field in data) {
+            $("#" + field).text(data[field]);
+        }
+    }
+    if ("level" in data) {
+        $("#exp_needed").text(data.level * 100);
+    }
+    if ("hp" in data || "max_hp" in data) {
+        const hpPercent = (parseInt($("#hp").text()) / parseInt($("#max_hp").text())) * 100;
+        $("#hp-fill").css("width", hpPercent + "%");
+    }
+    stateVersion = data.version;
+}
+
+// 같은 버튼을 연타해도 앞 요청이 끝날 때까지는 다시 보내지 않는다
+const pendingActions = new Set();
+
+function postAction(url, params, callback) {
+    if (pendingActions.has(url)) return;
+    pendingActions.add(url);
+    $.post(url, params, callback)
+        .fail(function(xhr) {
+            // 429: 서버 속도 제한
+            const data = xhr.responseJSON;
+            addLog(data && data.message ? data.message : "요청에 실패했습니다.", 'damage');
+        })
+        .always(function() {
+            pendingActions.delete(url);
+        });
+}
+
+// 전투 시작
+$("#battle-btn").click(function() {
+    if (battleInProgress) return;
+
+    $.post("/start_battle", {}, function(data) {
+        if (data.status === "ok") {
+            currentMonster = data.monster;
+            battleInProgress = true;
+
+            $("#monster-name").text(data.monster.name);
+            $("#monster-hp").text(data.monster.hp);
+            $("#monster-max-hp").text(data.monster.hp);
+            $("#monster-hp-fill").css("width", "100%");
+
+            $("#battle-area").fadeIn();
+            addLog(`${data.monster.name}이(가) 나타났다!`, 'info');
+        } else {
+            addLog(data.message, 'damage');
+        }
+    });
+});
+
+// 공격
+$("#attack-btn").click(function() {
+    if (!battleInProgress) return;
+
+    postAction("/attack", { since: stateVersion }, function(data) {
+        if (data.status === "ok") {
+            // 몬스터 체력 업데이트
+            const hpPercent = (data.monster_hp / currentMonster.hp) * 100;
+            $("#monster-hp").text(data.monster_hp);
+            $("#monster-hp-fill").css("width", hpPercent + "%");
+
+            addLog(data.message, 'damage');
+
+            // 몬스터 죽음 체크
+            if (data.monster_dead) {
+                battleInProgress = false;
+                $("#battle-area").fadeOut();
+                addLog(data.victory_message, 'heal');
+                updatePlayerStats(data.player);
+
+                // 레벨업 체크
+                if (data.level_up) {
+                    $(".stat-card").first().addClass("level-up");
+                    setTimeout(() => $(".stat-card").first().removeClass("level-up"), 2000);
+                    addLog(`레벨업! 레벨 ${data.player.level}이 되었습니다!`, 'heal');
+                }
+            } else if (data.player_hp <= 0) {
+                // 플레이어 죽음
+                battleInProgress = false;
+                $("#battle-area").fadeOut();
+                addLog(data.defeat_message, 'damage');
+                updatePlayerStats(data.player);
+            } else {
+                // 플레이어 상태 업데이트
+                updatePlayerStats(data.player);
+            }
+        }
+    });
+});
+
+// 자동 전투 (전투 전체를 서버에서 한 번에 진행)
+$("#auto-btn").click(function() {
+    if (!battleInProgress) return;
+
+    postAction("/battle/auto", { since: stateVersion }, function(data) {
+        if (data.status !== "ok") {
+            addLog(data.message, 'damage');
+            return;
+        }
+
+        const dealt = data.turns.reduce((sum, t) => sum + t[0], 0);
+        const taken = data.turns.reduce((sum, t) => sum + t[1], 0);
+        addLog(`자동 전투 ${data.turns.length}턴: ${currentMonster.name}에게 ${dealt} 데미지, ${taken} 데미지를 받음`, 'damage');
+
+        const hpPercent = (data.monster_hp / currentMonster.hp) * 100;
+        $("#monster-hp").text(data.monster_hp);
+        $("#monster-hp-fill").css("width", hpPercent + "%");
+        updatePlayerStats(data.player);
+
+        if (data.result === "victory") {
+            battleInProgress = false;
+            $("#battle-area").fadeOut();
+            addLog(data.victory_message, 'heal');
+            if (data.level_up) {
+                $(".stat-card").first().addClass("level-up");
+                setTimeout(() => $(".stat-card").first().removeClass("level-up"), 2000);
+                addLog(`레벨업! 레벨 ${data.player.level}이 되었습니다!`, 'heal');
+            }
+        } else if (data.result === "defeat") {
+            battleInProgress = false;
+            $("#battle-area").fadeOut();
+            addLog(data.defeat_message, 'damage');
+        }
+    });
+});
+
+// 도망
+$("#escape-btn").click(function() {
+    battleInProgress = false;
+    $("#battle-area").fadeOut();
+    addLog("전투에서 도망쳤습니다.", 'info');
+});
+
+// 체력 회복
+$("#heal-btn").click(function() {
+    $.post("/heal", { since: stateVersion }, function(data) {
+        addLog(data.message, data.status === 'ok' ? 'heal' : 'damage');
+        if (data.status === 'ok') {
+            updatePlayerStats(data.player);
+        }
+    });
+});
+
+// 강화 모달
+$("#enhance-btn").click(function() {
+    const weaponCost = (parseInt($("#weapon_level").text()) + 1) * 200;
+    const armorCost = (parseInt($("#armor_level").text()) + 1) * 150;
+    $("#weapon-cost").text(weaponCost);
+    $("#armor-cost").text(armorCost);
+    $("#enhance-target").val(Math.max(parseInt($("#weapon_level").text()), parseInt($("#armor_level").text())) + 1);
+    previewEnhance();
+    $("#enhanceModal").modal('show');
+});
+
+// 목표 단계까지의 기대 시도 횟수/골드 (서버에서 계산, 강화하지 않음)
+function previewEnhance() {
+    const target = $("#enhance-target").val();
+    for (const type of ["weapon", "armor"]) {
+        $.post("/enhance/bulk", { type: type, target_level: target, preview: 1 }, function(data) {
+            $("#" + type + "-preview").text(data.status === "ok"
+                ? `평균 ${data.expected_attempts}회, ${data.expected_gold}G` : data.message);
+        });
+    }
+}
+
+$("#enhance-target").change(previewEnhance);
+
+// 무기 강화
+$("#enhance-weapon").click(function() {
+    postAction("/enhance", { type: "weapon", since: stateVersion }, function(data) {
+        addLog(data.message, data.status === 'ok' ? 'heal' : 'damage');
+        if (data.status === 'ok') {
+            updatePlayerStats(data.player);
+            $("#enhanceModal").modal('hide');
+        }
+    });
+});
+
+// 방어구 강화
+$("#enhance-armor").click(function() {
+    postAction("/enhance", { type: "armor", since: stateVersion }, function(data) {
+        addLog(data.message, data.status === 'ok' ? 'heal' : 'damage');
+        if (data.status === 'ok') {
+            updatePlayerStats(data.player);
+            $("#enhanceModal").modal('hide');
+        }
+    });
+});
+
+// 상점 (물약 구매)
+$("#shop-btn").click(function() {
+    postAction("/shop", { item: "potion", since: stateVersion }, function(data) {
+        addLog(data.message, data.status === 'ok' ? 'heal' : 'damage');
+        if (data.status === 'ok') {
+            updatePlayerStats(data.player);
+        }
+    });
+});
+
+// 연속 강화 (목표 단계 또는 골드가 떨어질 때까지 한 번에)
+function enhanceBulk(type) {
+    postAction("/enhance/bulk", { type: type, target_level: $("#enhance-target").val(), since: stateVersion }, function(data) {
+        addLog(data.message, data.status === 'ok' ? 'heal' : 'damage');
+        if (data.status === 'ok') {
+            updatePlayerStats(data.player);
+            previewEnhance();
+        }
+    });
+}
+
+$("#enhance-weapon-bulk").click(() => enhanceBulk("weapon"));
+$("#enhance-armor-bulk").click(() => enhanceBulk("armor"));
@@ -0,0 +1,29 @@
+import db
+import migrations
+from leaderboard import Leaderboard
+
+
+def test_rows_written_by_another_worker_are_read_by_seq(tmp_path):
+    path = str(tmp_path / "game.db")
+    migrations.migrate(path)
+    a = Leaderboard(path, sync_interval=3600)
+    b = Leaderboard(path, sync_interval=3600)
+    a.load()
+    b.load()
+
+    a.update("alice", 3, 10, 50)
+    a.sync()
+    b.sync()
+    assert b.rank("alice")["stage"] == 3
+
+    # 예전 시각으로 늦게 커밋된 행도 seq 가 더 크므로 읽힌다
+    b.update("bob", 5, 1, 0)
+    b.sync()
+    with db.transaction(path) as conn:
+        conn.execute("UPDATE leaderboard SET updated_at=0 WHERE username='bob'")
+    a.sync()
+    assert [e["username"] for e in a.top(10)] == ["bob", "alice"]
+
+    a.close()
+    b.close()
+    db.close_db()
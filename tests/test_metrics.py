@@ -0,0 +1,28 @@
+import json
+import os
+import subprocess
+import sys
+
+import metrics
+
+
+def _dead_pid():
+    proc = subprocess.Popen([sys.executable, "-c", "pass"])
+    proc.wait()
+    return proc.pid
+
+
+def test_finished_workers_are_folded_into_one_file(tmp_path, monkeypatch):
+    monkeypatch.setenv("METRICS_DIR", str(tmp_path))
+    monkeypatch.setattr(metrics, "_values", {("game2_db_connects_total", ()): 1})
+    retired, pruned = _dead_pid(), _dead_pid()
+    for pid in (retired, pruned):
+        (tmp_path / f"{pid}.json").write_text(json.dumps([["game2_db_connects_total", [], 10]]))
+
+    metrics.retire(retired)           # gunicorn child_exit
+    assert not (tmp_path / f"{retired}.json").exists()
+
+    values = metrics.collect()        # 죽은 pid 의 파일도 정리
+    assert values[("game2_db_connects_total", ())] == 21
+    assert sorted(os.listdir(tmp_path)) == sorted([".lock", metrics.RETIRED, f"{os.getpid()}.json"])
+    assert metrics.collect()[("game2_db_connects_total", ())] == 21
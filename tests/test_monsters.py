@@ -0,0 +1,24 @@
+import sqlite3
+
+import migrations
+from monsters import MonsterCatalog
+
+
+def test_reloads_only_when_monsters_change(tmp_path):
+    path = str(tmp_path / "game.db")
+    migrations.migrate(path)
+    catalog = MonsterCatalog(path, check_interval=0)
+    catalog.load()
+    loads = []
+    original = catalog.load
+    catalog.load = lambda: (loads.append(1), original())
+
+    other = sqlite3.connect(path, isolation_level=None)
+    other.execute("INSERT INTO users (username) VALUES ('a')")
+    catalog.spawn(1)
+    assert loads == []  # 다른 테이블 쓰기로는 다시 읽지 않는다
+
+    other.execute("UPDATE monsters SET hp = 999 WHERE stage = 1")
+    assert catalog.spawn(1).hp == 999
+    assert loads == [1]
+    other.close()
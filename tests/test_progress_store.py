@@ -0,0 +1,31 @@
+import json
+
+from progress_store import ProgressStore
+
+
+def test_torn_last_line_is_repaired_before_appending(tmp_path):
+    snapshot = tmp_path / "progress.json"
+
+    store = ProgressStore(str(snapshot))
+    store.load()
+    store.add_learned("apple")
+    store._stopped.set()
+    store._journal.close()
+
+    # 다음 이벤트를 쓰다가 죽은 상태
+    journal = tmp_path / "progress.jsonl"
+    with open(journal, "a", encoding="utf-8") as f:
+        f.write('{"op": "learned", "wo')
+
+    store = ProgressStore(str(snapshot))
+    assert store.load()["learned_words"] == ["apple"]
+    store.add_learned("banana")
+    store._stopped.set()
+    store._journal.close()
+
+    lines = journal.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["word"] for line in lines] == ["apple", "banana"]
+
+    store = ProgressStore(str(snapshot))
+    assert store.load()["learned_words"] == ["apple", "banana"]
+    store.close()
@@ -0,0 +1,49 @@
+import sqlite3
+
+import vocab_store
+from scheduler import Scheduler
+from vocab_store import VocabularyStore
+
+
+def test_non_ascii_words_are_matched_like_casefold(tmp_path):
+    store = VocabularyStore(str(tmp_path / "vocabulary.db"))
+    assert store.add("Élan", "활기")
+    assert not store.add("élan", "활기")   # NOCASE 였다면 다른 단어로 들어갔다
+    assert store.add("STRASSE", "거리")
+    assert not store.add("straße", "거리")
+    assert store.exists("ÉLAN")
+    assert store.get("éLAN")["word"] == "Élan"
+    assert store.delete("élan")
+    assert store.count() == 1
+    store.close()
+
+
+def test_upgrade_from_nocase_schema_keeps_first_duplicate(tmp_path):
+    path = str(tmp_path / "vocabulary.db")
+    conn = sqlite3.connect(path, isolation_level=None)
+    for create in vocab_store.SCHEMA[:2]:
+        create(conn)
+    conn.execute("PRAGMA user_version=2")
+    conn.executemany("INSERT INTO words (word, meaning) VALUES (?, ?)",
+                     [("Élan", "활기"), ("apple", "사과"), ("élan", "열의")])
+    conn.execute("INSERT INTO reviews VALUES ('Élan', 2.6, 1.0, 1, 0, 100.0)")
+    conn.close()
+
+    store = VocabularyStore(path)
+    assert [w["word"] for w in store.all()] == ["Élan", "apple"]
+    assert store.get("ÉLAN")["meaning"] == "활기"
+    assert store.add("banana", "바나나")
+    assert store.load_reviews() == {"élan": (2.6, 1.0, 1, 0, 100.0)}
+    store.close()
+
+
+def test_review_state_follows_the_word_key(tmp_path):
+    store = VocabularyStore(str(tmp_path / "vocabulary.db"))
+    store.add("Élan", "활기")
+    Scheduler(["Élan"], store).review("éLAN", correct=True, now=0)
+
+    card = Scheduler(["Élan"], store).cards["élan"]
+    assert (card.word, card.reps, card.due) == ("Élan", 1, 86400)
+    store.delete("ÉLAN")
+    assert store.load_reviews() == {}
+    store.close()
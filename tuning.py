@@ -0,0 +1,123 @@
+"""
+gunicorn 워커/스레드 수 자동 결정 (GUNICORN_AUTOTUNE=1)
+
+- 워커 수: CPU 코어 수 (파이썬 코드는 GIL 때문에 프로세스로 나눠야 병렬로 돈다)
+- 스레드 수: 요청 시간 중 SQLite 가 차지하는 비율 s 로 1 / (1 - s)
+  (SQLite 를 기다리는 동안은 GIL 을 놓으므로 그만큼 다른 스레드가 돈다)
+
+s 는 임시 DB 로 game2 를 띄워 짧은 게임 시나리오를 돌려 재고,
+결과는 별도 프로세스에서 얻는다 (마스터 프로세스에 game2 가 미리 올라가지 않도록).
+
+측정만 해 보기:
+    python tuning.py
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+MAX_THREADS = 8
+PROBE_PLAYERS = 20
+PROBE_TIMEOUT = 60
+
+
+def topology(cpu_count, sql_share, max_threads=MAX_THREADS):
+    """(workers, threads)"""
+    workers = max(1, cpu_count or 1)
+    sql_share = min(max(sql_share, 0.0), 0.95)
+    threads = round(1 / (1 - sql_share))
+    return workers, max(1, min(max_threads, threads))
+
+
+def measure_sql_share(players=PROBE_PLAYERS):
+    """임시 DB 에서 시나리오를 돌려 요청 시간 중 SQLite 비율 측정 (이 프로세스 안에서)"""
+    import sqlite3
+
+    import db
+
+    sql_time = [0.0]
+
+    class TimedConnection(sqlite3.Connection):
+        def execute(self, *args):
+            start = time.perf_counter()
+            try:
+                return super().execute(*args)
+            finally:
+                sql_time[0] += time.perf_counter() - start
+
+        def executemany(self, *args):
+            start = time.perf_counter()
+            try:
+                return super().executemany(*args)
+            finally:
+                sql_time[0] += time.perf_counter() - start
+
+        def commit(self):
+            start = time.perf_counter()
+            try:
+                return super().commit()
+            finally:
+                sql_time[0] += time.perf_counter() - start
+
+    db.connection_factory = TimedConnection
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DB_PATH"] = os.path.join(tmp, "probe.db")
+        os.environ.pop("PLAYER_CACHE", None)
+        os.environ["METRICS"] = "0"  # 계측 커넥션이 TimedConnection 을 덮어쓰지 않도록
+        os.environ["RATE_LIMIT_BACKEND"] = "off"  # 429 로 빨리 끝난 요청이 비율을 흐리지 않도록
+        import game2
+
+        game2.app.config["TESTING"] = True
+        # 첫 요청의 준비 비용(커넥션/PRAGMA)은 빼고 잰다
+        warmup = game2.app.test_client()
+        warmup.post("/login", data={"username": "probe_warmup"})
+        sql_time[0] = 0.0
+
+        total = 0.0
+        for i in range(players):
+            client = game2.app.test_client()
+            start = time.perf_counter()
+            client.post("/login", data={"username": f"probe_{i}"})
+            client.get("/")
+            for _ in range(5):
+                client.post("/start_battle")
+                for _ in range(3):
+                    client.post("/attack", data={"since": -1})
+                client.post("/heal", data={"since": -1})
+            client.post("/shop", data={"item": "potion", "since": -1})
+            client.post("/enhance", data={"type": "weapon", "since": -1})
+            total += time.perf_counter() - start
+
+        # 임시 디렉터리가 지워지기 전에 닫는다 (atexit 까지 미루면 DB 가 이미 없다)
+        game2.leaderboard.close()
+        db.close_db()
+
+    return sql_time[0] / total if total else 0.0
+
+
+def probe_sql_share(timeout=PROBE_TIMEOUT):
+    """별도 파이썬 프로세스에서 measure_sql_share() 실행 (실패하면 None)"""
+    here = os.path.dirname(os.path.abspath(__file__))
+    try:
+        out = subprocess.run(
+            [sys.executable, os.path.join(here, "tuning.py"), "--json"],
+            cwd=here, capture_output=True, timeout=timeout, check=True,
+        ).stdout
+        return json.loads(out.splitlines()[-1])["sql_share"]
+    except (OSError, subprocess.SubprocessError, ValueError, KeyError, IndexError) as e:
+        print(f"[autotune] 측정 실패: {e}", file=sys.stderr)
+        return None
+
+
+if __name__ == "__main__":
+    share = measure_sql_share()
+    if sys.argv[1:] == ["--json"]:
+        print(json.dumps({"sql_share": share}))
+    else:
+        workers, threads = topology(os.cpu_count(), share)
+        print(f"SQLite 비율: {share:.1%}")
+        print(f"권장: workers={workers} threads={threads}")
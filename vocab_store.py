@@ -0,0 +1,197 @@
+"""
+영어단어 단어장 저장 (english.py)
+
+단어를 SQLite(vocabulary.db) 에 한 행씩 둔다. 추가/삭제는 그 행만 바꾸므로
+단어장이 커져도 파일 전체를 다시 쓰지 않는다.
+
+- 단어는 word_key()(casefold) 한 word_key 열의 UNIQUE 인덱스로 찾는다 (중복 확인이 인덱스 조회 한 번)
+  quiz/scheduler/word_list 도 같은 word_key() 로 단어를 비교한다
+- meaning 에도 인덱스 (뜻으로 찾기)
+- 단어별 복습 상태(reviews, scheduler.py)도 같은 DB 에 한 행씩
+- 예전 vocabulary.json 형식([{"word", "meaning", "pronunciation"}, ...])으로 가져오기/내보내기
+
+    python vocab_store.py import words.json [vocabulary.db]
+    python vocab_store.py export words.json [vocabulary.db]
+"""
+
+import json
+import sqlite3
+import sys
+
+from progress_store import write_json_atomic
+
+IMPORT_BATCH = 5000  # 가져오기 때 executemany 한 번에 넣을 행 수
+
+
+def word_key(word):
+    """단어를 비교할 때 쓰는 키 (대소문자 무시, ASCII 가 아닌 글자도)"""
+    return word.casefold()
+
+
+def _create_words(conn):
+    conn.execute("""CREATE TABLE IF NOT EXISTS words (
+                        id INTEGER PRIMARY KEY,
+                        word TEXT NOT NULL COLLATE NOCASE UNIQUE,
+                        meaning TEXT NOT NULL,
+                        pronunciation TEXT NOT NULL DEFAULT ''
+                    )""")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_words_meaning ON words(meaning)")
+
+
+def _create_reviews(conn):
+    conn.execute("""CREATE TABLE IF NOT EXISTS reviews (
+                        word TEXT PRIMARY KEY COLLATE NOCASE,
+                        ease REAL NOT NULL,
+                        interval REAL NOT NULL,
+                        reps INTEGER NOT NULL,
+                        lapses INTEGER NOT NULL,
+                        due REAL NOT NULL
+                    )""")
+
+
+def _add_word_key(conn):
+    # COLLATE NOCASE 는 ASCII 만 대소문자를 무시하므로 casefold() 한 열로 바꾼다
+    # (casefold 로 같아지는 예전 단어가 있으면 먼저 추가한 것만 남는다)
+    conn.create_function("casefold", 1, word_key, deterministic=True)
+    conn.execute("""CREATE TABLE words_new (
+                        id INTEGER PRIMARY KEY,
+                        word_key TEXT NOT NULL UNIQUE,
+                        word TEXT NOT NULL,
+                        meaning TEXT NOT NULL,
+                        pronunciation TEXT NOT NULL DEFAULT ''
+                    )""")
+    conn.execute("INSERT OR IGNORE INTO words_new (id, word_key, word, meaning, pronunciation) "
+                 "SELECT id, casefold(word), word, meaning, pronunciation FROM words ORDER BY id")
+    conn.execute("DROP TABLE words")
+    conn.execute("ALTER TABLE words_new RENAME TO words")
+    conn.execute("CREATE INDEX idx_words_meaning ON words(meaning)")
+
+
+def _key_reviews(conn):
+    # 복습 상태도 words 와 같은 word_key 로 (NOCASE 대신)
+    conn.create_function("casefold", 1, word_key, deterministic=True)
+    conn.execute("""CREATE TABLE reviews_new (
+                        word_key TEXT PRIMARY KEY,
+                        ease REAL NOT NULL,
+                        interval REAL NOT NULL,
+                        reps INTEGER NOT NULL,
+                        lapses INTEGER NOT NULL,
+                        due REAL NOT NULL
+                    )""")
+    conn.execute("INSERT OR IGNORE INTO reviews_new (word_key, ease, interval, reps, lapses, due) "
+                 "SELECT casefold(word), ease, interval, reps, lapses, due FROM reviews ORDER BY rowid")
+    conn.execute("DROP TABLE reviews")
+    conn.execute("ALTER TABLE reviews_new RENAME TO reviews")
+
+
+# user_version 순서대로 적용 (뒤에만 추가한다)
+SCHEMA = [_create_words, _create_reviews, _add_word_key, _key_reviews]
+
+
+def _row_to_dict(row):
+    return {"word": row[0], "meaning": row[1], "pronunciation": row[2]}
+
+
+class VocabularyStore:
+    def __init__(self, path="vocabulary.db"):
+        self.path = path
+        self.conn = sqlite3.connect(path, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        (version,), = self.conn.execute("PRAGMA user_version").fetchall()
+        if version < len(SCHEMA):
+            with self.conn:
+                self.conn.execute("BEGIN")
+                for create in SCHEMA[version:]:
+                    create(self.conn)
+                self.conn.execute(f"PRAGMA user_version={len(SCHEMA)}")
+
+    def count(self):
+        (n,), = self.conn.execute("SELECT count(*) FROM words").fetchall()
+        return n
+
+    def all(self):
+        """추가한 순서대로 전체 단어"""
+        return [_row_to_dict(row) for row in
+                self.conn.execute("SELECT word, meaning, pronunciation FROM words ORDER BY id")]
+
+    def get(self, word):
+        row = self.conn.execute("SELECT word, meaning, pronunciation FROM words WHERE word_key=?",
+                                (word_key(word),)).fetchone()
+        return None if row is None else _row_to_dict(row)
+
+    def exists(self, word):
+        return self.conn.execute("SELECT 1 FROM words WHERE word_key=?", (word_key(word),)).fetchone() is not None
+
+    def find_by_meaning(self, meaning):
+        return [_row_to_dict(row) for row in
+                self.conn.execute("SELECT word, meaning, pronunciation FROM words WHERE meaning=? ORDER BY id",
+                                  (meaning,))]
+
+    def add(self, word, meaning, pronunciation=""):
+        """단어 추가. 이미 있으면(대소문자 무시) False"""
+        try:
+            self.conn.execute("INSERT INTO words (word_key, word, meaning, pronunciation) VALUES (?, ?, ?, ?)",
+                              (word_key(word), word, meaning, pronunciation))
+        except sqlite3.IntegrityError:
+            return False
+        return True
+
+    def delete(self, word):
+        """단어 삭제 (복습 상태도 함께). 없으면 False"""
+        with self.conn:
+            self.conn.execute("BEGIN")
+            self.conn.execute("DELETE FROM reviews WHERE word_key=?", (word_key(word),))
+            return self.conn.execute("DELETE FROM words WHERE word_key=?", (word_key(word),)).rowcount > 0
+
+    def load_reviews(self):
+        """word_key(단어) -> (ease, interval, reps, lapses, due)"""
+        return {key: tuple(state) for key, *state in
+                self.conn.execute("SELECT word_key, ease, interval, reps, lapses, due FROM reviews")}
+
+    def save_review(self, card):
+        self.conn.execute("INSERT INTO reviews (word_key, ease, interval, reps, lapses, due) VALUES (?, ?, ?, ?, ?, ?) "
+                          "ON CONFLICT(word_key) DO UPDATE SET ease=excluded.ease, interval=excluded.interval, "
+                          "reps=excluded.reps, lapses=excluded.lapses, due=excluded.due",
+                          (word_key(card.word), card.ease, card.interval, card.reps, card.lapses, card.due))
+
+    def add_many(self, entries):
+        """여러 단어를 한 트랜잭션으로 추가 (이미 있는 단어는 건너뜀). 추가된 수 반환"""
+        before = self.count()
+        rows = ((word_key(e["word"]), e["word"], e["meaning"], e.get("pronunciation") or e["word"]) for e in entries)
+        with self.conn:
+            self.conn.execute("BEGIN")
+            batch = []
+            for row in rows:
+                batch.append(row)
+                if len(batch) >= IMPORT_BATCH:
+                    self.conn.executemany(
+                        "INSERT OR IGNORE INTO words (word_key, word, meaning, pronunciation) VALUES (?, ?, ?, ?)", batch)
+                    batch = []
+            if batch:
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO words (word_key, word, meaning, pronunciation) VALUES (?, ?, ?, ?)", batch)
+        return self.count() - before
+
+    def import_json(self, path):
+        with open(path, "r", encoding="utf-8") as f:
+            return self.add_many(json.load(f))
+
+    def export_json(self, path):
+        write_json_atomic(path, self.all(), indent=2)
+
+    def close(self):
+        self.conn.close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3 or sys.argv[1] not in ("import", "export"):
+        print(__doc__)
+        sys.exit(1)
+    store = VocabularyStore(sys.argv[3] if len(sys.argv) > 3 else "vocabulary.db")
+    if sys.argv[1] == "import":
+        print(f"{store.import_json(sys.argv[2])}개 추가 (전체 {store.count()}개)")
+    else:
+        store.export_json(sys.argv[2])
+        print(f"{store.count()}개 내보냄")
+    store.close()
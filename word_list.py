@@ -0,0 +1,193 @@
+"""
+긴 단어 목록 표시 (english.py 의 단어 관리 / 학습한 단어 목록)
+
+Treeview/Listbox 에 전체를 넣지 않고 지금 페이지(PAGE_SIZE 줄)만 넣는다.
+단어를 추가/삭제하면 그 줄만 넣고 빼며, 목록 전체를 다시 그리지 않는다.
+
+단어 관리 목록은 알파벳순 인덱스(WordIndex)를 보여 준다. 앞 글자 검색은
+bisect 로 범위만 찾으므로 단어장 크기와 상관없이 한 페이지 그리는 비용이다.
+"""
+
+import bisect
+import tkinter as tk
+from tkinter import ttk
+
+from vocab_store import word_key
+
+PAGE_SIZE = 200
+
+
+class WordIndex:
+    """단어장 항목을 word_key(단어) 순서로 정렬해 둔 목록"""
+
+    def __init__(self, vocabulary=()):
+        pairs = sorted(((word_key(e["word"]), e) for e in vocabulary), key=lambda p: p[0])
+        self.keys = [k for k, _ in pairs]
+        self.entries = [e for _, e in pairs]
+
+    def __len__(self):
+        return len(self.keys)
+
+    def add(self, entry):
+        """추가한 위치 반환"""
+        key = word_key(entry["word"])
+        pos = bisect.bisect_left(self.keys, key)
+        self.keys.insert(pos, key)
+        self.entries.insert(pos, entry)
+        return pos
+
+    def find(self, word):
+        """위치 (없으면 -1)"""
+        key = word_key(word)
+        pos = bisect.bisect_left(self.keys, key)
+        return pos if pos < len(self.keys) and self.keys[pos] == key else -1
+
+    def remove(self, word):
+        """지운 위치 반환 (없으면 -1)"""
+        pos = self.find(word)
+        if pos >= 0:
+            del self.keys[pos]
+            del self.entries[pos]
+        return pos
+
+    def prefix_range(self, prefix):
+        key = word_key(prefix)
+        return bisect.bisect_left(self.keys, key), bisect.bisect_left(self.keys, key + "\U0010ffff")
+
+
+class PrefixView:
+    """WordIndex 에서 prefix 로 시작하는 부분 (인덱스가 바뀌어도 따라간다)"""
+
+    def __init__(self, index, prefix=""):
+        self.index = index
+        self.prefix = prefix
+
+    def __len__(self):
+        lo, hi = self.index.prefix_range(self.prefix)
+        return hi - lo
+
+    def __getitem__(self, s):
+        lo, hi = self.index.prefix_range(self.prefix)
+        return self.index.entries[lo + s.start:min(hi, lo + s.stop)]
+
+    def position(self, index_pos, word):
+        """WordIndex 위치 -> 이 목록 안의 위치 (범위 밖이면 -1)"""
+        if not word_key(word).startswith(word_key(self.prefix)):
+            return -1
+        return index_pos - self.index.prefix_range(self.prefix)[0]
+
+
+class TreeviewRows:
+    def __init__(self, tree, values):
+        self.tree = tree
+        self.values = values  # 항목 -> 한 줄 값
+
+    def clear(self):
+        self.tree.delete(*self.tree.get_children())
+
+    def insert(self, pos, item):
+        self.tree.insert("", pos, values=self.values(item))
+
+    def delete(self, pos):
+        self.tree.delete(self.tree.get_children()[pos])
+
+
+class ListboxRows:
+    def __init__(self, listbox, text=str):
+        self.listbox = listbox
+        self.text = text
+
+    def clear(self):
+        self.listbox.delete(0, tk.END)
+
+    def insert(self, pos, item):
+        self.listbox.insert(pos, self.text(item))
+
+    def delete(self, pos):
+        self.listbox.delete(pos)
+
+
+class PagedList:
+    """source(len() 과 슬라이스가 되는 목록)의 한 페이지만 rows 에 보여 준다
+
+    source 가 바뀌면 inserted()/deleted() 로 알려 준다 (바뀐 줄만 고친다).
+    """
+
+    def __init__(self, rows, source, page_size=PAGE_SIZE):
+        self.rows = rows
+        self.source = source
+        self.page_size = page_size
+        self.offset = 0
+        self.shown = 0
+        self.label = tk.StringVar()
+
+    def controls(self, parent):
+        """이전/다음 페이지 버튼과 위치 표시"""
+        frame = ttk.Frame(parent)
+        ttk.Button(frame, text="◀", width=3, command=self.prev_page).grid(row=0, column=0)
+        ttk.Label(frame, textvariable=self.label).grid(row=0, column=1, padx=5)
+        ttk.Button(frame, text="▶", width=3, command=self.next_page).grid(row=0, column=2)
+        return frame
+
+    def set_source(self, source):
+        self.source = source
+        self.offset = 0
+        self.refresh()
+
+    def refresh(self):
+        """현재 페이지 전체를 다시 그림 (페이지 크기만큼만)"""
+        total = len(self.source)
+        if self.offset >= total:
+            self.offset = max(0, (total - 1) // self.page_size * self.page_size)
+        self.rows.clear()
+        items = self.source[slice(self.offset, self.offset + self.page_size)]
+        for pos, item in enumerate(items):
+            self.rows.insert(pos, item)
+        self.shown = len(items)
+        self._update_label(total)
+
+    def _update_label(self, total=None):
+        total = len(self.source) if total is None else total
+        if total == 0:
+            self.label.set("0 / 0")
+        else:
+            self.label.set(f"{self.offset + 1}-{self.offset + self.shown} / {total}")
+
+    def prev_page(self):
+        if self.offset > 0:
+            self.offset = max(0, self.offset - self.page_size)
+            self.refresh()
+
+    def next_page(self):
+        if self.offset + self.page_size < len(self.source):
+            self.offset += self.page_size
+            self.refresh()
+
+    def inserted(self, pos):
+        """source 의 pos 위치에 항목이 들어감"""
+        if pos < self.offset:
+            self.offset += 1  # 보이는 줄은 그대로
+        elif pos <= self.offset + self.shown and pos < self.offset + self.page_size:
+            self.rows.insert(pos - self.offset, self.source[slice(pos, pos + 1)][0])
+            if self.shown == self.page_size:
+                self.rows.delete(self.page_size)
+            else:
+                self.shown += 1
+        self._update_label()
+
+    def deleted(self, pos):
+        """source 의 pos 위치 항목이 빠짐"""
+        if pos < self.offset:
+            self.offset -= 1
+        elif pos < self.offset + self.shown:
+            self.rows.delete(pos - self.offset)
+            self.shown -= 1
+            # 다음 페이지의 첫 줄을 끌어와 페이지를 채운다
+            following = self.source[slice(self.offset + self.shown, self.offset + self.shown + 1)]
+            if following:
+                self.rows.insert(self.shown, following[0])
+                self.shown += 1
+            elif self.shown == 0 and self.offset > 0:
+                self.prev_page()
+                return
+        self._update_label()